@@ -1,13 +1,18 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from . import models, schemas
 from .database import get_db
+from .config import settings
+import asyncio
 import os
+import threading
 
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
@@ -15,18 +20,60 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Coût bcrypt configurable : un hash d'un autre coût est recalculé à la connexion
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
+
+
+# Exécuteur dédié au hachage : les rafales de connexions ne saturent pas le
+# threadpool de l'API, et au-delà de la file d'attente on répond 503
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_password_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE
+)
 
 
 security = HTTPBearer()
 
+def submit_password_job(func: Callable, *args) -> Future:
+    """Soumettre un calcul bcrypt à l'exécuteur borné (503 si la file est pleine)"""
+    if not _password_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Serveur occupé, réessayez dans un instant",
+            headers={"Retry-After": "1"}
+        )
+    try:
+        future = password_executor.submit(func, *args)
+    except Exception:
+        _password_slots.release()
+        raise
+    future.add_done_callback(lambda _: _password_slots.release())
+    return future
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Vérifier un mot de passe"""
-    return pwd_context.verify(plain_password, hashed_password)
+    if not hashed_password:
+        return False
+    return submit_password_job(pwd_context.verify, plain_password, hashed_password).result()
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Vérifier un mot de passe sans bloquer la boucle ; renvoie le nouveau hash si le coût a changé"""
+    if not hashed_password:
+        return False, None
+    future = submit_password_job(pwd_context.verify_and_update, plain_password, hashed_password)
+    return await asyncio.wrap_future(future)
 
 def get_password_hash(password: str) -> str:
     """Hasher un mot de passe"""
-    return pwd_context.hash(password)
+    return submit_password_job(pwd_context.hash, password).result()
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Créer un token JWT"""
@@ -80,4 +127,21 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[mod
         return None
     if not verify_password(password, user.password_hash):
         return None
+    return user
+
+async def authenticate_user_async(db: Session, username: str, password: str) -> Optional[models.User]:
+    """Authentifier un utilisateur depuis un endpoint async (rehash transparent du mot de passe)"""
+    user = await run_in_threadpool(
+        lambda: db.query(models.User).filter(models.User.username == username).first()
+    )
+    if not user:
+        return None
+    
+    valid, new_hash = await verify_and_update_password(password, user.password_hash)
+    if not valid:
+        return None
+    
+    if new_hash:
+        user.password_hash = new_hash
+        await run_in_threadpool(db.commit)
     return user
\ No newline at end of file
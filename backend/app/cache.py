@@ -0,0 +1,204 @@
+# cache.py - Cache de réponses par utilisateur avec ETag et clés versionnées
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, List, Optional
+import hashlib
+import threading
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import and_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import engine
+from .models import CacheVersion, Collection, RSSFeed, UserCollection
+from .serialization import dumps
+
+
+class MemoryCacheBackend:
+    """
+    Cache LRU en mémoire, propre à chaque processus. Les compteurs de version
+    sont en base : les invalidations des autres workers de l'API et des
+    workers de récupération (processus séparés) sont vues par tous.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def get_versions(self, keys: List[str]) -> List[int]:
+        with engine.connect() as connection:
+            versions = dict(connection.execute(
+                select(CacheVersion.key, CacheVersion.version).where(CacheVersion.key.in_(keys))
+            ).all())
+        return [versions.get(key, 0) for key in keys]
+    
+    def incr(self, key: str) -> int:
+        with engine.begin() as connection:
+            dialect = connection.dialect.name
+            if dialect in ('postgresql', 'sqlite'):
+                insert = postgresql_insert if dialect == 'postgresql' else sqlite_insert
+                statement = insert(CacheVersion).values(key=key, version=1)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[CacheVersion.key],
+                    set_={'version': CacheVersion.version + 1}
+                ).returning(CacheVersion.version)
+                return connection.execute(statement).scalar_one()
+            
+            version = connection.execute(
+                update(CacheVersion).where(CacheVersion.key == key)
+                .values(version=CacheVersion.version + 1).returning(CacheVersion.version)
+            ).scalar()
+            if version is None:
+                connection.execute(CacheVersion.__table__.insert().values(key=key, version=1))
+                version = 1
+            return version
+
+
+class RedisCacheBackend:
+    """Cache partagé entre workers et machines (nécessite le paquet redis)"""
+    
+    def __init__(self, url: str):
+        import redis
+        
+        self._client = redis.Redis.from_url(url)
+    
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+    
+    def set(self, key: str, value: bytes, ttl: int):
+        self._client.set(key, value, ex=ttl)
+    
+    def get_versions(self, keys: List[str]) -> List[int]:
+        if not keys:
+            return []
+        return [int(value or 0) for value in self._client.mget(keys)]
+    
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+
+def _create_backend():
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_URL)
+    return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+
+
+backend = _create_backend()
+
+
+def _collection_version_key(collection_id: int) -> str:
+    return f"version:collection:{collection_id}"
+
+
+def _user_version_key(user_id: int) -> str:
+    return f"version:user:{user_id}"
+
+
+def bump_collection(collection_id: Optional[int]):
+    """
+    Invalider les réponses dépendant d'une collection (flux, articles, membres, messages)
+    """
+    if settings.CACHE_ENABLED and collection_id is not None:
+        backend.incr(_collection_version_key(collection_id))
+
+
+def bump_user(user_id: Optional[int]):
+    """
+    Invalider les réponses propres à un utilisateur (statuts lus/favoris, collections)
+    """
+    if settings.CACHE_ENABLED and user_id is not None:
+        backend.incr(_user_version_key(user_id))
+
+
+def bump_source(db: Session, source_id: Optional[int]):
+    """
+    Invalider les réponses de toutes les collections abonnées à une source
+    """
+    if not settings.CACHE_ENABLED or source_id is None:
+        return
+    for row in db.query(RSSFeed.collection_id).filter(RSSFeed.source_id == source_id).distinct():
+        bump_collection(row.collection_id)
+
+
+def user_collection_ids(db: Session, user_id: int) -> List[int]:
+    """
+    Identifiants des collections lisibles par un utilisateur (possédées ou partagées)
+    """
+    owned = db.query(Collection.id).filter(Collection.owner_id == user_id)
+    shared = db.query(UserCollection.collection_id).filter(
+        and_(
+            UserCollection.user_id == user_id,
+            UserCollection.can_read == True
+        )
+    )
+    return [row[0] for row in owned.union(shared).all()]
+
+
+def make_key(name: str, user_id: int, collection_ids: Iterable[int] = ()) -> str:
+    """
+    Construire une clé de cache qui change dès qu'une des versions concernées change
+    """
+    collection_ids = sorted(set(collection_ids))
+    versions = backend.get_versions(
+        [_user_version_key(user_id)] + [_collection_version_key(cid) for cid in collection_ids]
+    )
+    stamp = ",".join(f"{cid}.{version}" for cid, version in zip(collection_ids, versions[1:]))
+    return f"response:{name}:{user_id}.{versions[0]}:{stamp}"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Comparaison faible (RFC 9110) : la compression rend l'ETag faible côté client
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+def cached_response(request: Request, key: str, build: Callable[[], Any]) -> Response:
+    """
+    Servir une réponse JSON depuis le cache (ou la construire), avec ETag fort
+    et réponse 304 si le client possède déjà cette version
+    """
+    entry = backend.get(key) if settings.CACHE_ENABLED else None
+    
+    if entry is None:
+        body = dumps(build())
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        entry = etag.encode("ascii") + b"\n" + body
+        if settings.CACHE_ENABLED:
+            backend.set(key, entry, settings.CACHE_TTL_SECONDS)
+    
+    etag, body = entry.split(b"\n", 1)
+    etag = etag.decode("ascii")
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
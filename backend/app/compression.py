@@ -0,0 +1,189 @@
+# compression.py - Compression négociée des réponses (Brotli / gzip)
+from typing import Optional
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Brotli est optionnel, gzip reste disponible
+    brotli = None
+
+
+# Types de contenu déjà compressés : les recompresser ne fait que coûter du CPU
+ALREADY_COMPRESSED_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/octet-stream",
+    "font/woff",
+)
+
+
+def parse_accept_encoding(value: str) -> dict:
+    """
+    Lire l'en-tête Accept-Encoding en {encodage: qualité}
+    """
+    encodings = {}
+    for part in value.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name] = quality
+    return encodings
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Choisir le meilleur encodage accepté par le client (br > gzip)
+    """
+    encodings = parse_accept_encoding(accept_encoding)
+    wildcard = encodings.get("*", 0.0)
+    
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_quality = None, 0.0
+    for name in candidates:
+        quality = encodings.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    
+    def compress(self, data: bytes) -> bytes:
+        # Z_SYNC_FLUSH : chaque morceau d'un flux est décodable dès sa réception
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+    
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compresser les réponses selon Accept-Encoding, au-delà d'une taille minimale.
+    Les réponses en flux (StreamingResponse) sont compressées morceau par morceau.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+    
+    def make_compressor(self, encoding: str):
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.gzip_level)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+    
+    async def send(self, message: Message):
+        message_type = message["type"]
+        
+        if message_type == "http.response.start":
+            # Les en-têtes ne sont envoyés qu'une fois le premier morceau connu
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or content_type.startswith(ALREADY_COMPRESSED_TYPES)
+            )
+            return
+        
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+        
+        if self.passthrough:
+            await self._flush_start()
+            await self._send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                # Réponse trop petite : la compression ne rapporte rien
+                self.passthrough = True
+                await self._flush_start()
+                await self._send(message)
+                return
+            
+            self.compressor = self.middleware.make_compressor(self.encoding)
+            self._set_encoding_headers(streaming=more_body)
+        
+        data = self.compressor.compress(body) if body else b""
+        if not more_body:
+            data += self.compressor.finish()
+            if self.start_message is not None:
+                MutableHeaders(raw=self.start_message["headers"])["Content-Length"] = str(len(data))
+        
+        await self._flush_start()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+    
+    def _set_encoding_headers(self, streaming: bool):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if streaming and "content-length" in headers:
+            del headers["Content-Length"]
+        
+        # Le corps encodé diffère octet par octet : l'ETag devient faible
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+    
+    async def _flush_start(self):
+        if self.start_message is not None:
+            await self._send(self.start_message)
+            self.start_message = None
@@ -28,5 +28,94 @@ class Settings:
         "email",
         "profile"
     ]
+    
+    
+    # Pipeline de récupération des flux (0 processus = parsing dans le processus courant)
+    FEED_PARSER_PROCESSES: int = int(os.getenv("FEED_PARSER_PROCESSES", "2"))
+    FEED_FETCH_WORKERS: int = int(os.getenv("FEED_FETCH_WORKERS", "8"))
+    FEED_PIPELINE_QUEUE_SIZE: int = int(os.getenv("FEED_PIPELINE_QUEUE_SIZE", "16"))
+    # Parseur rapide (lxml) pour les flux RSS 2.0 / Atom bien formés, feedparser sinon
+    FEED_FAST_PARSER: bool = os.getenv("FEED_FAST_PARSER", "true").lower() == "true"
+    
+    # Déduplication : arrêt après N articles connus consécutifs (0 = désactivé ;
+    # appliqué seulement aux flux dont les entrées sont datées du plus récent au plus ancien)
+    FEED_EARLY_STOP_THRESHOLD: int = int(os.getenv("FEED_EARLY_STOP_THRESHOLD", "0"))
+    FEED_GUID_CACHE_FEEDS: int = int(os.getenv("FEED_GUID_CACHE_FEEDS", "1000"))
+    FEED_GUID_CACHE_SIZE: int = int(os.getenv("FEED_GUID_CACHE_SIZE", "500"))
+    
+    
+    # Rétention des articles (0 = pas de limite par défaut)
+    RETENTION_DEFAULT_DAYS: int = int(os.getenv("RETENTION_DEFAULT_DAYS", "0"))
+    RETENTION_DEFAULT_MAX_ARTICLES: int = int(os.getenv("RETENTION_DEFAULT_MAX_ARTICLES", "0"))
+    RETENTION_BATCH_SIZE: int = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+    RETENTION_INTERVAL_MINUTES: int = int(os.getenv("RETENTION_INTERVAL_MINUTES", "60"))
+
+    
+    # Cache des réponses (backend "memory" : entrées par processus, versions en base ; "redis" : tout partagé)
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_URL: str = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "3600"))
+
+    
+    # Compression des réponses (0 pour désactiver)
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    
+    # Tâches de fond : rafraîchissement des flux (0 = désactivé) et élection du leader
+    FEED_REFRESH_INTERVAL_MINUTES: int = int(os.getenv("FEED_REFRESH_INTERVAL_MINUTES", "30"))
+    SCHEDULER_LOCK: str = os.getenv("SCHEDULER_LOCK", "auto")
+    SCHEDULER_LOCK_FILE: str = os.getenv("SCHEDULER_LOCK_FILE", "/tmp/rss_scheduler.lock")
+    SCHEDULER_LEADER_RETRY_SECONDS: int = int(os.getenv("SCHEDULER_LEADER_RETRY_SECONDS", "30"))
+    
+    # Workers de récupération (python -m app.fetch_worker) : baux sur les sources à récupérer
+    FETCH_LEASE_SECONDS: int = int(os.getenv("FETCH_LEASE_SECONDS", "300"))
+    FETCH_WORKER_BATCH_SIZE: int = int(os.getenv("FETCH_WORKER_BATCH_SIZE", "20"))
+    FETCH_WORKER_POLL_SECONDS: int = int(os.getenv("FETCH_WORKER_POLL_SECONDS", "30"))
+    
+    # Politesse par hôte : débit (requêtes/minute, 0 = illimité), rafale, débits propres
+    # à certains hôtes ("hote=requêtes/minute,...") et délais après un 429/503
+    FETCH_HOST_RATE_PER_MINUTE: float = float(os.getenv("FETCH_HOST_RATE_PER_MINUTE", "30"))
+    FETCH_HOST_BURST: int = int(os.getenv("FETCH_HOST_BURST", "5"))
+    FETCH_HOST_RATES: str = os.getenv("FETCH_HOST_RATES", "")
+    FETCH_HOST_MAX_WAIT_SECONDS: int = int(os.getenv("FETCH_HOST_MAX_WAIT_SECONDS", "10"))
+    FETCH_RETRY_AFTER_DEFAULT_SECONDS: int = int(os.getenv("FETCH_RETRY_AFTER_DEFAULT_SECONDS", "600"))
+    FETCH_RETRY_AFTER_MAX_SECONDS: int = int(os.getenv("FETCH_RETRY_AFTER_MAX_SECONDS", "86400"))
+    
+    # Flux morts : désactivation après N échecs définitifs consécutifs (0 = jamais, sauf 410)
+    FEED_DEACTIVATE_AFTER_FAILURES: int = int(os.getenv("FEED_DEACTIVATE_AFTER_FAILURES", "30"))
+    
+    # WebSub : URL publique de l'API pour les callbacks des hubs (vide = désactivé)
+    WEBSUB_CALLBACK_BASE_URL: str = os.getenv("WEBSUB_CALLBACK_BASE_URL", "")
+    WEBSUB_LEASE_SECONDS: int = int(os.getenv("WEBSUB_LEASE_SECONDS", "864000"))
+    WEBSUB_RENEW_MARGIN_SECONDS: int = int(os.getenv("WEBSUB_RENEW_MARGIN_SECONDS", "86400"))
+    WEBSUB_RENEW_INTERVAL_MINUTES: int = int(os.getenv("WEBSUB_RENEW_INTERVAL_MINUTES", "15"))
+    WEBSUB_RETRY_MINUTES: int = int(os.getenv("WEBSUB_RETRY_MINUTES", "60"))
+    WEBSUB_SAFETY_POLL_MINUTES: int = int(os.getenv("WEBSUB_SAFETY_POLL_MINUTES", "1440"))
+    WEBSUB_MAX_CONTENT_BYTES: int = int(os.getenv("WEBSUB_MAX_CONTENT_BYTES", "5242880"))
+    
+    # Serveur de production (0 worker = calculé depuis le nombre de CPU)
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "0"))
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+    
+    # Métriques Prometheus (/metrics) et port d'exposition des workers de récupération (0 = aucun)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    FETCH_WORKER_METRICS_PORT: int = int(os.getenv("FETCH_WORKER_METRICS_PORT", "0"))
+    
+    # Mots de passe : coût bcrypt et exécuteur dédié (file d'attente bornée)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "16"))
+    
+    # Limitation des tentatives de connexion (seaux à jetons par utilisateur et par IP)
+    LOGIN_RATE_LIMIT_USER_ATTEMPTS: int = int(os.getenv("LOGIN_RATE_LIMIT_USER_ATTEMPTS", "5"))
+    LOGIN_RATE_LIMIT_USER_PER_MINUTE: float = float(os.getenv("LOGIN_RATE_LIMIT_USER_PER_MINUTE", "5"))
+    LOGIN_RATE_LIMIT_IP_ATTEMPTS: int = int(os.getenv("LOGIN_RATE_LIMIT_IP_ATTEMPTS", "20"))
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE: float = float(os.getenv("LOGIN_RATE_LIMIT_IP_PER_MINUTE", "20"))
 
 settings = Settings()
\ No newline at end of file
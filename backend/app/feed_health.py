@@ -0,0 +1,168 @@
+# feed_health.py - Santé des sources : redirections permanentes et flux morts
+from typing import Optional
+import logging
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .models import Article, Comment, FeedHealthEvent, FeedSource, RSSFeed, UserArticle
+from .config import settings
+from .politeness import host_of
+from .subscriptions import find_subscription, reschedule_source
+
+logger = logging.getLogger(__name__)
+
+# Erreurs client transitoires : elles ne comptent pas comme des échecs définitifs
+_TRANSIENT_CLIENT_ERRORS = {408, 425, 429}
+
+
+def record_event(db: Session, source_id: int, event: str, detail: Optional[str] = None):
+    """
+    Ajouter un changement d'état à l'historique d'une source
+    """
+    db.add(FeedHealthEvent(source_id=source_id, event=event, detail=detail))
+
+
+def permanent_redirect_target(response) -> Optional[str]:
+    """
+    URL atteinte par la chaîne de redirections permanentes (301, 308) d'une
+    réponse ; la chaîne s'arrête à la première redirection temporaire
+    """
+    target = None
+    hops = list(response.history) + [response]
+    for hop, following in zip(hops, hops[1:]):
+        if hop.status_code not in (301, 308):
+            break
+        target = following.url
+    return target
+
+
+def hard_failure_status(error: Exception) -> Optional[int]:
+    """
+    Code HTTP d'un échec qui ne se corrigera pas seul (404, 410...), sinon None
+    """
+    status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status_code and 400 <= status_code < 500 and status_code not in _TRANSIENT_CLIENT_ERRORS:
+        return status_code
+    return None
+
+
+def apply_permanent_redirect(db: Session, source: FeedSource, new_url: str) -> FeedSource:
+    """
+    Remplacer l'URL d'une source redirigée définitivement.
+    
+    Si une autre source suit déjà la nouvelle URL, la source redirigée y est
+    fusionnée puis supprimée : la source renvoyée est alors cette autre source.
+    """
+    old_url = source.url
+    if not new_url or new_url == old_url or len(new_url) > 500:
+        return source
+    
+    target = db.query(FeedSource).filter(FeedSource.url == new_url).first()
+    if target is None:
+        try:
+            # Point de sauvegarde : une autre source a pu prendre cette URL entre-temps
+            with db.begin_nested():
+                source.url = new_url
+                source.host = host_of(new_url)
+                record_event(db, source.id, 'redirected', f"{old_url} -> {new_url}")
+            logger.info(f"Redirection permanente enregistrée: {old_url} -> {new_url}")
+            return source
+        except IntegrityError:
+            target = db.query(FeedSource).filter(FeedSource.url == new_url).one()
+    
+    _merge_source(db, source, target)
+    return target
+
+
+def _merge_source(db: Session, source: FeedSource, target: FeedSource):
+    """
+    Transférer les abonnements et les articles d'une source vers celle qui suit
+    déjà son URL, puis supprimer la source. Un article déjà présent dans la
+    cible (même GUID) est supprimé avec la source, après report de son état de
+    lecture, de ses favoris et de ses commentaires sur l'article de la cible.
+    """
+    source_id, source_url = source.id, source.url
+    
+    for subscription in db.query(RSSFeed).filter(RSSFeed.source_id == source_id).all():
+        if find_subscription(db, subscription.collection_id, target.id):
+            db.delete(subscription)
+        else:
+            subscription.source_id = target.id
+    db.flush()
+    
+    target_ids = dict(
+        db.query(Article.guid, Article.id).filter(
+            Article.source_id == target.id,
+            Article.guid.isnot(None)
+        ).all()
+    )
+    duplicates = db.query(Article.id, Article.guid).filter(
+        Article.source_id == source_id,
+        Article.guid.in_(list(target_ids))
+    ).all() if target_ids else []
+    for article_id, guid in duplicates:
+        _move_article_state(db, article_id, target_ids[guid])
+    
+    # Articles sans GUID compris (NOT IN ne les retient pas)
+    db.query(Article).filter(
+        Article.source_id == source_id,
+        Article.id.notin_([article_id for article_id, _ in duplicates])
+    ).update({Article.source_id: target.id}, synchronize_session=False)
+    
+    db.query(FeedSource).filter(FeedSource.id == source_id).delete(synchronize_session=False)
+    record_event(db, target.id, 'merged', f"{source_url} -> {target.url}")
+    reschedule_source(db, target)
+    logger.info(f"Source {source_url} fusionnée dans {target.url} (redirection permanente)")
+
+
+def _move_article_state(db: Session, article_id: int, target_article_id: int):
+    """
+    Rattacher les états utilisateur et les commentaires d'un article en double
+    à l'article équivalent ; un état déjà présent des deux côtés est fusionné
+    """
+    target_states = {
+        state.user_id: state
+        for state in db.query(UserArticle).filter(UserArticle.article_id == target_article_id)
+    }
+    for state in db.query(UserArticle).filter(UserArticle.article_id == article_id).all():
+        kept = target_states.get(state.user_id)
+        if kept is None:
+            state.article_id = target_article_id
+            continue
+        
+        if state.is_read and not kept.is_read:
+            kept.is_read, kept.read_at = True, state.read_at
+        if state.is_favorite and not kept.is_favorite:
+            kept.is_favorite, kept.favorited_at = True, state.favorited_at
+        db.delete(state)
+    
+    db.query(Comment).filter(Comment.article_id == article_id).update(
+        {Comment.article_id: target_article_id}, synchronize_session=False
+    )
+    db.flush()
+
+
+def register_failure(db: Session, source: FeedSource, status_code: int) -> bool:
+    """
+    Compter un échec définitif ; les abonnements de la source sont désactivés
+    dès un 410 ou après FEED_DEACTIVATE_AFTER_FAILURES échecs consécutifs
+    """
+    source.consecutive_failures = (source.consecutive_failures or 0) + 1
+    limit = settings.FEED_DEACTIVATE_AFTER_FAILURES
+    if status_code != 410 and not (limit and source.consecutive_failures >= limit):
+        return False
+    
+    deactivated = db.query(RSSFeed).filter(
+        RSSFeed.source_id == source.id,
+        RSSFeed.is_active == True
+    ).update({RSSFeed.is_active: False}, synchronize_session=False)
+    if not deactivated:
+        return False
+    
+    record_event(
+        db, source.id, 'deactivated',
+        f"HTTP {status_code} après {source.consecutive_failures} échec(s) consécutif(s)"
+    )
+    logger.warning(f"Flux désactivé automatiquement: {source.url} (HTTP {status_code})")
+    return True
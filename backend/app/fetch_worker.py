@@ -0,0 +1,69 @@
+# fetch_worker.py - Worker de récupération autonome (python -m app.fetch_worker)
+#
+# Chaque worker réserve par lots les sources arrivées à échéance (baux en base,
+# FOR UPDATE SKIP LOCKED sous PostgreSQL) : autant de workers que nécessaire
+# peuvent tourner sur une ou plusieurs machines sans récupérer deux fois la
+# même source. Le planificateur de l'API peut alors être désactivé
+# (FEED_REFRESH_INTERVAL_MINUTES=0).
+import logging
+import signal
+import threading
+
+from prometheus_client import start_http_server
+
+from .config import settings
+from .leases import worker_identity
+from .rss_parser import RSSParser, shutdown_parser_pool
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def run(stop: threading.Event, batch_size: int, poll_seconds: int):
+    """
+    Réserver et traiter des lots de sources jusqu'à l'arrêt demandé
+    """
+    owner = worker_identity("worker")
+    parser = RSSParser()
+    logger.info(f"Worker de récupération démarré: {owner}")
+    
+    while not stop.is_set():
+        try:
+            results = parser.fetch_all_active_feeds(owner=owner, limit=batch_size)
+        except Exception as e:
+            logger.error(f"Erreur du worker de récupération: {str(e)}")
+            stop.wait(poll_seconds)
+            continue
+        
+        # Rien à faire : attendre avant de réinterroger la base
+        if results['total_feeds'] == 0:
+            stop.wait(poll_seconds)
+    
+    logger.info(f"Worker de récupération arrêté: {owner}")
+
+
+def main():
+    stop = threading.Event()
+    
+    def request_stop(signum, frame):
+        # Le lot en cours se termine, puis les baux restants sont libérés
+        logger.info("Arrêt demandé, fin du lot en cours")
+        stop.set()
+    
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    
+    # Métriques du pipeline (récupérations, parsing, file) exposées sur un port dédié
+    if settings.METRICS_ENABLED and settings.FETCH_WORKER_METRICS_PORT > 0:
+        start_http_server(settings.FETCH_WORKER_METRICS_PORT, registry=metrics.scrape_registry())
+        logger.info(f"Métriques exposées sur le port {settings.FETCH_WORKER_METRICS_PORT}")
+    
+    try:
+        run(stop, settings.FETCH_WORKER_BATCH_SIZE, settings.FETCH_WORKER_POLL_SECONDS)
+    finally:
+        shutdown_parser_pool()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,151 @@
+# leader.py - Élection d'un worker unique pour les tâches de fond
+from typing import Optional
+import logging
+import os
+
+from sqlalchemy import text
+
+from .database import engine
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Clé du verrou consultatif PostgreSQL (arbitraire, propre à l'application)
+SCHEDULER_ADVISORY_LOCK_KEY = 727_173_001
+
+
+class AdvisoryLock:
+    """
+    Verrou consultatif PostgreSQL tenu par une connexion dédiée : il est
+    libéré automatiquement si le worker meurt (fin de session)
+    """
+    
+    def __init__(self, key: int):
+        self.key = key
+        self._connection = None
+    
+    def try_acquire(self) -> bool:
+        if self._connection is not None:
+            return True
+        
+        connection = engine.connect()
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+            ).scalar()
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        
+        if not acquired:
+            connection.close()
+            return False
+        
+        self._connection = connection
+        return True
+    
+    def is_held(self) -> bool:
+        """
+        Vérifier que la session détient toujours le verrou : si la connexion
+        est tombée, PostgreSQL l'a libéré et un autre worker a pu le prendre
+        """
+        if self._connection is None:
+            return False
+        
+        try:
+            # Clé sur 64 bits : 32 bits de poids fort dans classid, faible dans objid
+            held = self._connection.execute(text(
+                "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND granted "
+                "AND pid = pg_backend_pid() AND classid = :high AND objid = :low AND objsubid = 1"
+            ), {"high": self.key >> 32, "low": self.key & 0xFFFFFFFF}).scalar()
+            self._connection.commit()
+        except Exception as e:
+            logger.warning(f"Connexion du verrou du planificateur perdue: {str(e)}")
+            held = 0
+        
+        if not held:
+            self._discard_connection()
+            return False
+        return True
+    
+    def release(self):
+        if self._connection is None:
+            return
+        try:
+            self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self._connection.commit()
+        finally:
+            self._connection.close()
+            self._connection = None
+    
+    def _discard_connection(self):
+        try:
+            self._connection.invalidate()
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+
+class FileLock:
+    """
+    Verrou exclusif sur un fichier local (workers d'une même machine),
+    libéré par le système à la mort du processus
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+    
+    def try_acquire(self) -> bool:
+        import fcntl
+        
+        if self._file is not None:
+            return True
+        
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._file = lock_file
+        return True
+    
+    def is_held(self) -> bool:
+        # Un flock ne se perd pas tant que le processus et le fichier vivent
+        return self._file is not None
+    
+    def release(self):
+        import fcntl
+        
+        if self._file is None:
+            return
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+def create_scheduler_lock() -> Optional[object]:
+    """
+    Verrou garantissant qu'un seul worker exécute le planificateur
+    (SCHEDULER_LOCK = "advisory", "file" ou "none")
+    """
+    mode = settings.SCHEDULER_LOCK
+    if mode == "auto":
+        mode = "advisory" if engine.dialect.name == "postgresql" else "file"
+    
+    if mode == "advisory":
+        return AdvisoryLock(SCHEDULER_ADVISORY_LOCK_KEY)
+    if mode == "file":
+        return FileLock(settings.SCHEDULER_LOCK_FILE)
+    return None
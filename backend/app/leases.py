@@ -0,0 +1,166 @@
+# leases.py - File de travail des récupérations, partagée par baux en base
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+import os
+import socket
+import threading
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from .models import FeedSource
+from .database import SessionLocal
+from .config import settings
+from .subscriptions import has_active_subscription
+
+logger = logging.getLogger(__name__)
+
+
+def worker_identity(role: str) -> str:
+    """
+    Identifiant du détenteur des baux (rôle, machine, processus)
+    """
+    return f"{role}:{socket.gethostname()}:{os.getpid()}"[:100]
+
+
+def claim_due_sources(db: Session, owner: str, limit: Optional[int] = None) -> List[FeedSource]:
+    """
+    Réserver des sources à récupérer : échéance atteinte, au moins un abonnement
+    actif, et aucun bail en cours (ou un bail expiré, repris d'un worker disparu).
+    
+    Sous PostgreSQL, FOR UPDATE SKIP LOCKED laisse chaque worker passer les
+    lignes qu'un autre est en train de réserver : pas d'attente, pas de doublon.
+    La pose du bail est conditionnelle, ce qui reste sûr sur les bases qui
+    ignorent FOR UPDATE (SQLite, où les écritures sont sérialisées).
+    """
+    now = datetime.utcnow()
+    lease_free = or_(FeedSource.lease_expires_at.is_(None), FeedSource.lease_expires_at < now)
+    
+    query = db.query(FeedSource.id, FeedSource.lease_owner).filter(
+        has_active_subscription(),
+        or_(FeedSource.next_fetch_at.is_(None), FeedSource.next_fetch_at <= now),
+        lease_free
+    ).order_by(FeedSource.next_fetch_at.asc().nullsfirst(), FeedSource.id)
+    if limit:
+        query = query.limit(limit)
+    
+    candidates = query.with_for_update(skip_locked=True, of=FeedSource).all()
+    if not candidates:
+        db.commit()
+        return []
+    
+    for candidate in candidates:
+        if candidate.lease_owner and candidate.lease_owner != owner:
+            logger.warning(f"Bail expiré repris à {candidate.lease_owner} (source {candidate.id})")
+    
+    source_ids = [candidate.id for candidate in candidates]
+    db.query(FeedSource).filter(
+        FeedSource.id.in_(source_ids), lease_free
+    ).update({
+        FeedSource.lease_owner: owner,
+        FeedSource.lease_expires_at: now + timedelta(seconds=settings.FETCH_LEASE_SECONDS)
+    }, synchronize_session=False)
+    db.commit()
+    
+    return db.query(FeedSource).filter(
+        FeedSource.id.in_(source_ids), FeedSource.lease_owner == owner
+    ).order_by(FeedSource.id).all()
+
+
+def claim_source(db: Session, owner: str, source_id: int) -> bool:
+    """
+    Réserver une source précise, si aucun autre worker ne la traite
+    """
+    now = datetime.utcnow()
+    claimed = db.query(FeedSource).filter(
+        FeedSource.id == source_id,
+        or_(FeedSource.lease_expires_at.is_(None), FeedSource.lease_expires_at < now)
+    ).update({
+        FeedSource.lease_owner: owner,
+        FeedSource.lease_expires_at: now + timedelta(seconds=settings.FETCH_LEASE_SECONDS)
+    }, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+
+def renew_leases(db: Session, owner: str) -> int:
+    """
+    Prolonger tous les baux encore détenus par un worker
+    """
+    expires_at = datetime.utcnow() + timedelta(seconds=settings.FETCH_LEASE_SECONDS)
+    renewed = db.query(FeedSource).filter(
+        FeedSource.lease_owner == owner
+    ).update({FeedSource.lease_expires_at: expires_at}, synchronize_session=False)
+    db.commit()
+    return renewed
+
+
+def release_leases(db: Session, owner: str, source_ids: Optional[List[int]] = None):
+    """
+    Libérer les baux d'un worker (tous, ou ceux des sources indiquées)
+    """
+    query = db.query(FeedSource).filter(FeedSource.lease_owner == owner)
+    if source_ids is not None:
+        query = query.filter(FeedSource.id.in_(source_ids))
+    query.update(
+        {FeedSource.lease_owner: None, FeedSource.lease_expires_at: None},
+        synchronize_session=False
+    )
+    db.commit()
+
+
+def queue_depth(db: Session) -> Dict[str, int]:
+    """
+    Profondeur de la file : sources à échéance sans bail (en attente d'un
+    worker) et sources sous bail (en cours de récupération)
+    """
+    now = datetime.utcnow()
+    due = db.query(FeedSource.id).filter(
+        has_active_subscription(),
+        or_(FeedSource.next_fetch_at.is_(None), FeedSource.next_fetch_at <= now),
+        or_(FeedSource.lease_expires_at.is_(None), FeedSource.lease_expires_at < now)
+    ).count()
+    leased = db.query(FeedSource.id).filter(FeedSource.lease_expires_at >= now).count()
+    return {"due": due, "leased": leased}
+
+
+class LeaseHeartbeat:
+    """
+    Renouveler périodiquement les baux d'un worker pendant qu'il travaille :
+    un worker arrêté brutalement cesse de renouveler, ses baux expirent et
+    ses sources redeviennent disponibles pour les autres
+    """
+    
+    def __init__(self, owner: str, interval: Optional[float] = None):
+        self.owner = owner
+        self.interval = interval or max(1.0, settings.FETCH_LEASE_SECONDS / 3)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            db = SessionLocal()
+            try:
+                renew_leases(db, self.owner)
+            except Exception as e:
+                logger.error(f"Erreur lors du renouvellement des baux: {str(e)}")
+            finally:
+                db.close()
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,467 @@
+# lxml_parser.py - Parsing rapide (lxml iterparse) des flux RSS 2.0 et Atom 1.0 bien formés
+#
+# Produit, pour les champs qu'utilise RSSParser (titre, lien, résumé, contenu,
+# auteur, date, identifiant, informations et liens du flux), les mêmes valeurs
+# que feedparser. Tout ce qui sort du cas courant fait renvoyer None et le flux
+# repasse par feedparser : document mal formé, DTD, xml:base, encodage autre
+# qu'UTF-8, HTML que l'assainissement de feedparser modifierait, éléments
+# d'extension qui alimentent ces champs...
+from html.entities import name2codepoint
+from io import BytesIO
+from typing import Optional
+import re
+
+from feedparser import FeedParserDict
+
+try:
+    # Mêmes dates et même correction des caractères Windows-1252 que feedparser
+    # (fonctions internes : version de feedparser épinglée dans requirements.txt)
+    from feedparser.datetimes import _parse_date
+    from feedparser.html import _cp1252
+except ImportError:  # Autre version de feedparser : tous les flux passent par lui
+    _parse_date = _cp1252 = None
+
+try:
+    from lxml import etree
+except ImportError:  # lxml est optionnel, feedparser reste utilisé
+    etree = None
+
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_CONTENT = '{http://purl.org/rss/1.0/modules/content/}'
+_DC = '{http://purl.org/dc/elements/1.1/}'
+_MEDIA = '{http://search.yahoo.com/mrss/}'
+_ITUNES = '{http://www.itunes.com/dtds/podcast-1.0.dtd}'
+_XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+# Espaces de noms dont aucun élément n'alimente les champs utilisés
+_NEUTRAL_NAMESPACES = {
+    '{http://wellformedweb.org/CommentAPI/}',
+    '{http://purl.org/rss/1.0/modules/slash/}',
+    '{http://purl.org/rss/1.0/modules/syndication/}',
+    '{http://rssnamespace.org/feedburner/ext/1.0}',
+    '{http://purl.org/syndication/thread/1.0}',
+    '{http://www.georss.org/georss}',
+}
+
+# Éléments reconnus (les autres renvoient vers feedparser)
+_RSS_CHANNEL_TAGS = {
+    'title', 'link', 'description', 'language', 'copyright', 'managingEditor', 'webMaster',
+    'pubDate', 'lastBuildDate', 'category', 'generator', 'docs', 'cloud', 'ttl', 'image',
+    'rating', 'skipHours', 'skipDays', 'item', _ATOM + 'link',
+    _DC + 'date', _DC + 'creator', _DC + 'publisher', _DC + 'rights', _DC + 'subject',
+    _ITUNES + 'author', _ITUNES + 'owner', _ITUNES + 'image', _ITUNES + 'category',
+    _ITUNES + 'explicit', _ITUNES + 'type', _ITUNES + 'keywords', _ITUNES + 'block',
+}
+_RSS_ITEM_TAGS = {
+    'title', 'link', 'description', 'guid', 'pubDate', 'author', 'category', 'comments',
+    'enclosure', 'source', _CONTENT + 'encoded', _ATOM + 'link',
+    _DC + 'creator', _DC + 'date', _DC + 'subject', _DC + 'rights',
+    _MEDIA + 'content', _MEDIA + 'thumbnail',
+    _ITUNES + 'duration', _ITUNES + 'explicit', _ITUNES + 'image', _ITUNES + 'episode',
+    _ITUNES + 'season', _ITUNES + 'episodeType', _ITUNES + 'keywords', _ITUNES + 'block',
+}
+_ATOM_FEED_TAGS = {_ATOM + tag for tag in (
+    'title', 'subtitle', 'link', 'id', 'updated', 'author', 'contributor', 'category',
+    'generator', 'icon', 'logo', 'rights', 'entry'
+)}
+_ATOM_ENTRY_TAGS = {_ATOM + tag for tag in (
+    'title', 'link', 'id', 'updated', 'published', 'summary', 'content', 'author',
+    'contributor', 'category', 'rights'
+)} | {_MEDIA + 'content', _MEDIA + 'thumbnail'}
+
+# Éléments qu'une entrée ou un flux ne doit contenir qu'une fois
+_SINGLE_TAGS = {
+    'title', 'description', 'guid', 'pubDate', 'author', _DC + 'creator', _CONTENT + 'encoded',
+    _ATOM + 'title', _ATOM + 'subtitle', _ATOM + 'id', _ATOM + 'published', _ATOM + 'summary',
+    _ATOM + 'content', _ATOM + 'author',
+}
+
+_ENCODING_RE = re.compile(rb'^\s*<\?xml[^>]*?encoding\s*=\s*["\']([A-Za-z0-9._-]+)')
+_URI_FIXER_RE = re.compile(r'^[A-Za-z][A-Za-z0-9+\-.]*:///')
+_LINK_ENTITY_RE = re.compile(r'&([A-Za-z0-9_]+);')
+# Titres que feedparser considère comme du HTML (balise fermante ou entité)
+_HTMLISH_RE = re.compile(r'</\w+>|&#?\w+;')
+# HTML que l'assainissement de feedparser réécrirait : commentaires, CDATA,
+# instructions, éléments supprimés avec leur contenu, <br> avec attributs,
+# attributs contenant un ">"
+_UNSAFE_HTML_RE = re.compile(
+    r'<(?:[!?]|script|style|applet|svg|math|br\s+[^\s/>])|<[a-zA-Z][^>]*?=\s*["\'][^"\']*>',
+    re.IGNORECASE
+)
+_ENTITY_RE = re.compile(r'&([a-zA-Z][-.a-zA-Z0-9]*)(;?)')
+# Caractères de contrôle C1 que feedparser remplace par leur équivalent Windows-1252
+_C1_RE = re.compile(r'[\x80-\x9f]')
+_HTML_TYPES = {'text/html', 'application/xhtml+xml'}
+
+
+class _Unsupported(Exception):
+    """Le document sort du cas couvert : feedparser prend le relais"""
+
+
+def parse_feed(content: bytes) -> Optional[FeedParserDict]:
+    """
+    Parser un flux RSS 2.0 ou Atom 1.0 bien formé ; renvoie un résultat au
+    format de feedparser.parse(), ou None si feedparser doit être utilisé
+    """
+    if etree is None or _parse_date is None or not _is_supported_document(content):
+        return None
+    try:
+        return _parse(content)
+    except (etree.LxmlError, _Unsupported):
+        return None
+
+
+def _is_supported_document(content: bytes) -> bool:
+    """
+    Écarter d'emblée les documents que feedparser décoderait différemment
+    """
+    if content[:2] in (b'\xff\xfe', b'\xfe\xff') or b'<!DOCTYPE' in content or b'xml:base' in content:
+        return False
+    
+    match = _ENCODING_RE.match(content[3:] if content.startswith(b'\xef\xbb\xbf') else content)
+    return match is None or match.group(1).lower() in (b'utf-8', b'utf8')
+
+
+def _parse(content: bytes) -> FeedParserDict:
+    entries = []
+    context = etree.iterparse(
+        BytesIO(content), events=('end',), tag=('item', _ATOM + 'entry'),
+        resolve_entities=False, no_network=True, load_dtd=False
+    )
+    for _, elem in context:
+        parent = elem.getparent()
+        if elem.tag == 'item':
+            grandparent = parent.getparent() if parent is not None else None
+            if grandparent is None or parent.tag != 'channel' or grandparent.tag != 'rss':
+                raise _Unsupported()
+            entries.append(_rss_entry(elem))
+        else:
+            if parent is None or parent.tag != _ATOM + 'feed' or parent.getparent() is not None:
+                raise _Unsupported()
+            entries.append(_atom_entry(elem))
+        # Libérer la mémoire au fil de l'eau
+        elem.clear(keep_tail=True)
+    
+    root = context.root
+    if root.tag == 'rss':
+        channels = [child for child in root if isinstance(child.tag, str)]
+        if len(channels) != 1 or channels[0].tag != 'channel':
+            raise _Unsupported()
+        feed = _rss_feed(root, channels[0])
+    elif root.tag == _ATOM + 'feed':
+        feed = _atom_feed(root)
+    else:
+        raise _Unsupported()
+    
+    return FeedParserDict(bozo=False, feed=feed, entries=entries)
+
+
+def _children(elem, allowed: set):
+    """
+    Enfants d'un élément (hors commentaires), en refusant les éléments inconnus
+    et les répétitions d'éléments uniques
+    """
+    seen = set()
+    for child in elem:
+        tag = child.tag
+        if not isinstance(tag, str):
+            continue
+        if tag not in allowed and tag[:tag.find('}') + 1] not in _NEUTRAL_NAMESPACES:
+            raise _Unsupported()
+        if tag in _SINGLE_TAGS:
+            if tag in seen:
+                raise _Unsupported()
+            seen.add(tag)
+        yield tag, child
+
+
+def _raw_text(elem) -> str:
+    if len(elem):
+        raise _Unsupported()
+    return elem.text or ''
+
+
+def _text(elem) -> str:
+    """
+    Texte d'un élément, transformé comme feedparser (espaces, UTF-8 décodé
+    deux fois, caractères Windows-1252)
+    """
+    return _fix_text(_raw_text(elem).strip())
+
+
+def _fix_text(value: str) -> str:
+    if not value.isascii():
+        try:
+            value = value.encode('iso-8859-1').decode('utf-8')
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            pass
+        # translate() est coûteux sur une table dict : seulement si nécessaire
+        if _C1_RE.search(value):
+            value = value.translate(_cp1252)
+    return value
+
+
+def _html_text(elem) -> str:
+    """
+    Fragment HTML d'un élément ; l'assainissement de feedparser ne doit pas
+    changer le texte qu'en tire RSSParser._clean_html
+    """
+    value = _raw_text(elem)
+    if '<' in value and _UNSAFE_HTML_RE.search(value):
+        raise _Unsupported()
+    if '&' in value:
+        for name, semicolon in _ENTITY_RE.findall(value):
+            known = name in name2codepoint or name == 'apos'
+            # feedparser retire le ";" des entités inconnues et l'ajoute aux connues
+            if known != bool(semicolon):
+                raise _Unsupported()
+    return _fix_text(value.strip())
+
+
+def _plain_text(elem) -> str:
+    """
+    Texte court (titre, description du flux) que feedparser conserverait tel quel
+    """
+    value = _text(elem)
+    if '<' in value or '>' in value or '&' in value:
+        raise _Unsupported()
+    return value
+
+
+def _content_type(elem, default: str) -> str:
+    if elem.get('mode') is not None or elem.get('src') is not None:
+        raise _Unsupported()
+    content_type = elem.get('type', default).lower()
+    if content_type in ('text', 'plain', 'text/plain'):
+        return 'text/plain'
+    if content_type in ('html', 'text/html'):
+        return 'text/html'
+    raise _Unsupported()
+
+
+def _typed_text(elem, default: str = 'text/plain') -> str:
+    """
+    Texte d'un élément Atom typé (text ou html)
+    """
+    if _content_type(elem, default) == 'text/plain':
+        return _text(elem)
+    return _html_text(elem)
+
+
+def _rss_title(elem) -> str:
+    if elem.attrib:
+        raise _Unsupported()
+    value = _text(elem)
+    if _HTMLISH_RE.search(value):
+        raise _Unsupported()
+    return value
+
+
+def _atom_title(elem) -> str:
+    """
+    Titre ou sous-titre Atom, conservé tel quel par feedparser
+    """
+    if _content_type(elem, 'text/plain') == 'text/plain':
+        return _text(elem)
+    return _plain_text(elem)
+
+
+def _checked_uri(uri: str) -> str:
+    # feedparser retire les "/" en trop après "://"
+    if _URI_FIXER_RE.match(uri):
+        raise _Unsupported()
+    return uri
+
+
+def _entry_link(elem) -> str:
+    if elem.attrib:
+        raise _Unsupported()
+    link = _checked_uri(_text(elem)).replace('&amp;', '&')
+    return _LINK_ENTITY_RE.sub(r'&\g<1>', link)
+
+
+def _guid(elem, entry: FeedParserDict):
+    """
+    <guid> (RSS) ou <id> (Atom) : identifiant, et lien à défaut d'un autre
+    """
+    is_link = True
+    for name, value in elem.attrib.items():
+        if name.lower() == 'ispermalink':
+            is_link = value == 'true'
+    
+    value = _text(elem)
+    if is_link:
+        value = _checked_uri(value)
+    entry['id'] = value
+    if is_link:
+        entry.setdefault('link', value)
+
+
+def _atom_link(elem, context: FeedParserDict) -> Optional[str]:
+    """
+    Ajouter un <atom:link> aux liens du contexte ; renvoie son URL s'il s'agit
+    du lien principal (alternate, HTML)
+    """
+    if len(elem):
+        raise _Unsupported()
+    
+    attrs = {}
+    for name, value in elem.attrib.items():
+        name = name.lower()
+        attrs[name] = value.lower() if name in ('rel', 'type') else value
+    if 'href' not in attrs:
+        raise _Unsupported()
+    
+    attrs.setdefault('rel', 'alternate')
+    attrs.setdefault('type', 'application/atom+xml' if attrs['rel'] == 'self' else 'text/html')
+    attrs['href'] = _checked_uri(attrs['href'])
+    context.setdefault('links', []).append(FeedParserDict(attrs))
+    
+    content_type = {'html': 'text/html', 'xhtml': 'application/xhtml+xml'}.get(attrs['type'], attrs['type'])
+    if attrs['rel'] == 'alternate' and content_type in _HTML_TYPES:
+        return attrs['href']
+    return None
+
+
+def _set_content(entry: FeedParserDict, value: str, content_type: str):
+    entry.setdefault('content', []).append(FeedParserDict(type=content_type, value=value))
+    entry.setdefault('summary', value)
+
+
+def _set_published(entry: FeedParserDict, elem):
+    entry['published'] = _text(elem)
+    entry['published_parsed'] = _parse_date(entry['published'])
+
+
+def _rss_entry(item) -> FeedParserDict:
+    entry = FeedParserDict()
+    for tag, child in _children(item, _RSS_ITEM_TAGS):
+        if tag == 'title':
+            entry['title'] = _rss_title(child)
+        elif tag == 'link':
+            entry['link'] = _entry_link(child)
+        elif tag == _ATOM + 'link':
+            link = _atom_link(child, entry)
+            if link is not None:
+                entry['link'] = link
+        elif tag == 'guid':
+            _guid(child, entry)
+        elif tag == 'description':
+            if child.attrib:
+                raise _Unsupported()
+            entry['summary'] = _html_text(child)
+        elif tag == _CONTENT + 'encoded':
+            if child.attrib:
+                raise _Unsupported()
+            _set_content(entry, _html_text(child), 'text/html')
+        elif tag in ('author', _DC + 'creator'):
+            if 'author' in entry:
+                raise _Unsupported()
+            entry['author'] = _text(child)
+        elif tag == 'pubDate':
+            _set_published(entry, child)
+        elif tag in (_MEDIA + 'content', _MEDIA + 'thumbnail', 'source'):
+            # Ignorés, mais leurs éléments enfants (media:title...) alimenteraient le titre
+            if len(child):
+                raise _Unsupported()
+    return entry
+
+
+def _atom_author(elem) -> str:
+    """
+    Auteur Atom tel que le compose feedparser : "nom (email)", nom ou email
+    """
+    if (elem.text or '').strip():
+        raise _Unsupported()
+    
+    detail = {}
+    for child in elem:
+        if not isinstance(child.tag, str):
+            continue
+        if child.tag not in (_ATOM + 'name', _ATOM + 'email', _ATOM + 'uri') or (child.tail or '').strip():
+            raise _Unsupported()
+        detail[child.tag] = _raw_text(child).strip()
+    
+    name, email = detail.get(_ATOM + 'name'), detail.get(_ATOM + 'email')
+    if name and email:
+        return f"{name} ({email})"
+    return name or email or ''
+
+
+def _atom_entry(elem) -> FeedParserDict:
+    entry = FeedParserDict()
+    for tag, child in _children(elem, _ATOM_ENTRY_TAGS):
+        if tag == _ATOM + 'title':
+            entry['title'] = _atom_title(child)
+        elif tag == _ATOM + 'link':
+            link = _atom_link(child, entry)
+            if link is not None:
+                entry['link'] = link
+        elif tag == _ATOM + 'id':
+            _guid(child, entry)
+        elif tag == _ATOM + 'summary':
+            entry['summary'] = _typed_text(child)
+        elif tag == _ATOM + 'content':
+            content_type = _content_type(child, 'text/plain')
+            _set_content(entry, _typed_text(child), content_type)
+        elif tag == _ATOM + 'author':
+            entry['author'] = _atom_author(child)
+        elif tag == _ATOM + 'published':
+            _set_published(entry, child)
+        elif tag in (_MEDIA + 'content', _MEDIA + 'thumbnail'):
+            if len(child):
+                raise _Unsupported()
+    return entry
+
+
+def _feed_link(elem) -> str:
+    if elem.attrib:
+        raise _Unsupported()
+    return _LINK_ENTITY_RE.sub(r'&\g<1>', _checked_uri(_text(elem)))
+
+
+def _rss_feed(root, channel) -> FeedParserDict:
+    feed = FeedParserDict()
+    if root.get(_XML_LANG):
+        feed['language'] = root.get(_XML_LANG).replace('_', '-')
+    
+    for tag, child in _children(channel, _RSS_CHANNEL_TAGS):
+        if tag == 'title':
+            feed['title'] = _rss_title(child)
+        elif tag == 'description':
+            feed['subtitle'] = _plain_text(child)
+        elif tag == 'link':
+            feed.setdefault('links', []).append(FeedParserDict(rel='alternate', type='text/html'))
+            feed['link'] = feed['links'][-1]['href'] = _feed_link(child)
+        elif tag == _ATOM + 'link':
+            link = _atom_link(child, feed)
+            if link is not None:
+                feed['link'] = link
+        elif tag == 'language':
+            feed['language'] = _text(child)
+        elif tag in ('lastBuildDate', _DC + 'date'):
+            feed['updated'] = _text(child)
+        elif tag == 'pubDate':
+            feed['published'] = _text(child)
+    return feed
+
+
+def _atom_feed(root) -> FeedParserDict:
+    feed = FeedParserDict()
+    if root.get(_XML_LANG):
+        feed['language'] = root.get(_XML_LANG).replace('_', '-')
+    
+    for tag, child in _children(root, _ATOM_FEED_TAGS):
+        if tag == _ATOM + 'title':
+            feed['title'] = _atom_title(child)
+        elif tag == _ATOM + 'subtitle':
+            feed['subtitle'] = _atom_title(child)
+        elif tag == _ATOM + 'link':
+            link = _atom_link(child, feed)
+            if link is not None:
+                feed['link'] = link
+        elif tag == _ATOM + 'id':
+            _guid(child, feed)
+        elif tag == _ATOM + 'updated':
+            feed['updated'] = _text(child)
+    return feed
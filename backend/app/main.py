@@ -1,19 +1,31 @@
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
-from . import models
-from .routers import auth, collections, feeds, articles, export, stats, messages, comments
+from fastapi.responses import ORJSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST
+from sqlalchemy import text
+import logging
+from .routers import auth, collections, feeds, articles, export, stats, messages, comments, websub
+from .config import settings
+from .compression import CompressionMiddleware
+from .scheduler import Scheduler
+from .leader import create_scheduler_lock
+from .retention import prune_all_feeds
+from . import metrics
 
 
+logger = logging.getLogger(__name__)
 
-Base.metadata.create_all(bind=engine)
+
+# Le schéma est géré par les migrations Alembic (alembic upgrade head),
+# aucun DDL n'est exécuté au démarrage des workers.
 
 
 app = FastAPI(
     title="RSS Aggregator API",
     description="API pour gérer des flux RSS et collections partagées avec messagerie instantanée et commentaires",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 
@@ -26,6 +38,20 @@ app.add_middleware(
 )
 
 
+if settings.COMPRESSION_MINIMUM_SIZE > 0:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+    )
+
+
+# Ajouté en dernier : le plus externe, il mesure la requête entière
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+
 app.include_router(auth.router)
 app.include_router(collections.router)
 app.include_router(feeds.router)
@@ -34,6 +60,42 @@ app.include_router(messages.router)
 app.include_router(comments.router)  
 app.include_router(export.router)
 app.include_router(stats.router)
+app.include_router(websub.router)
+
+
+def refresh_all_feeds():
+    # Import différé : feedparser, requests et le pool de parsing ne sont
+    # chargés que dans le worker qui exécute les tâches de fond
+    from .rss_parser import update_all_feeds
+    
+    return update_all_feeds()
+
+
+def renew_websub_subscriptions():
+    from .websub import renew_subscriptions
+    
+    return renew_subscriptions()
+
+
+# Un seul worker exécute les tâches de fond (verrou consultatif ou fichier)
+scheduler = Scheduler(lock=create_scheduler_lock(), retry_seconds=settings.SCHEDULER_LEADER_RETRY_SECONDS)
+if settings.FEED_REFRESH_INTERVAL_MINUTES > 0:
+    scheduler.add_job("feed-refresh", refresh_all_feeds, settings.FEED_REFRESH_INTERVAL_MINUTES * 60)
+if settings.RETENTION_INTERVAL_MINUTES > 0:
+    scheduler.add_job("retention", prune_all_feeds, settings.RETENTION_INTERVAL_MINUTES * 60)
+if settings.WEBSUB_CALLBACK_BASE_URL and settings.WEBSUB_RENEW_INTERVAL_MINUTES > 0:
+    scheduler.add_job("websub-renew", renew_websub_subscriptions, settings.WEBSUB_RENEW_INTERVAL_MINUTES * 60)
+
+
+@app.on_event("startup")
+def start_scheduler():
+    scheduler.start()
+
+
+@app.on_event("shutdown")
+def stop_scheduler():
+    scheduler.shutdown()
+    metrics.mark_process_dead()
 
 
 @app.get("/")
@@ -56,14 +118,31 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {
-        "status": "healthy", 
+    from .database import engine
+    
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        database_status = "connected"
+    except Exception as e:
+        logger.error(f"Base de données injoignable: {str(e)}")
+        database_status = "error"
+    
+    content = {
+        "status": "healthy" if database_status == "connected" else "unhealthy",
         "api": "running", 
-        "database": "connected",
+        "database": database_status,
         "search": "enabled",
         "messaging": "enabled",  
         "comments": "enabled"    
     }
+    return ORJSONResponse(content, status_code=200 if database_status == "connected" else 503)
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return Response(metrics.render(), headers={"Content-Type": CONTENT_TYPE_LATEST})
 
 
 @app.get("/api/db-test")
@@ -0,0 +1,230 @@
+# metrics.py - Métriques au format Prometheus : requêtes HTTP, base de données, pipeline de récupération
+#
+# Chaque processus tient ses propres valeurs. Avec plusieurs workers uvicorn,
+# définir PROMETHEUS_MULTIPROC_DIR (répertoire vidé au lancement par
+# app.server) : les processus y écrivent leurs valeurs et /metrics les agrège.
+from contextvars import ContextVar
+from typing import Optional
+import logging
+import os
+import time
+
+from prometheus_client import (
+    REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+if _MULTIPROCESS:
+    # Les valeurs sont écrites dans ce répertoire dès la création des métriques
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+# Requêtes HTTP, par route (modèle de chemin : les identifiants ne multiplient pas les séries)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Durée des requêtes HTTP", ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requêtes HTTP en cours", multiprocess_mode="livesum"
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "Requêtes SQL exécutées par requête HTTP", ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+)
+HTTP_REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds", "Temps passé en base par requête HTTP", ["route"]
+)
+
+# Base de données
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Durée des requêtes SQL",
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "Connexions du pool (ouvertes, empruntées)", ["state"],
+    multiprocess_mode="livesum"
+)
+
+# Pipeline de récupération des flux
+FEED_FETCH_DURATION = Histogram(
+    "feed_fetch_duration_seconds", "Durée des téléchargements de flux",
+    buckets=(.05, .1, .25, .5, 1, 2.5, 5, 10, 30)
+)
+FEED_FETCH_RESPONSES = Counter(
+    "feed_fetch_responses", "Téléchargements de flux par code HTTP (error = pas de réponse)", ["status"]
+)
+FEED_FETCH_BYTES = Counter("feed_fetch_bytes", "Octets de flux téléchargés")
+FEED_PARSE_DURATION = Histogram(
+    "feed_parse_duration_seconds", "Durée du parsing d'un flux", ["parser"],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5)
+)
+FEED_NEW_ARTICLES = Histogram(
+    "feed_new_articles", "Nouveaux articles par flux parsé", buckets=(0, 1, 2, 5, 10, 20, 50, 100)
+)
+FEED_PIPELINE_QUEUE_DEPTH = Gauge(
+    "feed_pipeline_queue_depth", "Flux en attente entre deux étapes du pipeline", ["queue"],
+    multiprocess_mode="livesum"
+)
+
+# Requêtes SQL de la requête HTTP en cours : [nombre, durée]
+_request_db_usage: ContextVar[Optional[list]] = ContextVar("request_db_usage", default=None)
+
+
+def instrument_engine(engine: Engine):
+    """
+    Mesurer les requêtes SQL et l'occupation du pool d'un moteur SQLAlchemy
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        DB_QUERY_DURATION.observe(elapsed)
+        
+        usage = _request_db_usage.get()
+        if usage is not None:
+            usage[0] += 1
+            usage[1] += elapsed
+    
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        # Requête en échec : after_cursor_execute n'est pas appelé
+        if context.connection is not None and context.connection.info.get("query_start_time"):
+            context.connection.info["query_start_time"].pop()
+    
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS.labels("open").inc()
+    
+    @event.listens_for(engine, "close")
+    def _close(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS.labels("open").dec()
+    
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CONNECTIONS.labels("in_use").inc()
+    
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS.labels("in_use").dec()
+
+
+class MetricsMiddleware:
+    """
+    Durée de chaque requête HTTP, et nombre et durée des requêtes SQL
+    qu'elle a exécutées, par route
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        # Liste partagée : les dépendances et routes synchrones s'exécutent
+        # dans des threads qui héritent d'une copie du contexte
+        usage = [0, 0.0]
+        token = _request_db_usage.set(usage)
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            _request_db_usage.reset(token)
+            
+            # Route résolue par le routeur FastAPI (absente si aucune ne correspond)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, str(status_code)).observe(elapsed)
+            HTTP_REQUEST_DB_QUERIES.labels(route).observe(usage[0])
+            HTTP_REQUEST_DB_DURATION.labels(route).observe(usage[1])
+
+
+def observe_fetch(duration: float, status_code: Optional[int], size: int = 0):
+    """
+    Enregistrer un téléchargement de flux (status_code None : pas de réponse)
+    """
+    FEED_FETCH_DURATION.observe(duration)
+    FEED_FETCH_RESPONSES.labels(str(status_code) if status_code else "error").inc()
+    if size:
+        FEED_FETCH_BYTES.inc(size)
+
+
+class FeedQueueCollector:
+    """
+    Profondeur de la file de récupération, lue en base à chaque collecte :
+    sources arrivées à échéance en attente d'un worker, et sources réservées
+    """
+    
+    def describe(self):
+        # Évite une requête en base à l'enregistrement du collecteur
+        return [GaugeMetricFamily("feed_queue_sources", "Sources dans la file de récupération", labels=["state"])]
+    
+    def collect(self):
+        # Imports différés : la base n'est sollicitée qu'au moment de la collecte
+        from .database import SessionLocal
+        from .leases import queue_depth
+        
+        db = SessionLocal()
+        try:
+            depth = queue_depth(db)
+        except Exception as e:
+            logger.warning(f"Profondeur de la file de récupération indisponible: {str(e)}")
+            return
+        finally:
+            db.close()
+        
+        family = GaugeMetricFamily("feed_queue_sources", "Sources dans la file de récupération", labels=["state"])
+        for state, count in depth.items():
+            family.add_metric([state], count)
+        yield family
+
+
+def scrape_registry() -> CollectorRegistry:
+    """
+    Registre à exposer : celui du processus, ou l'agrégat des processus
+    en mode multiprocessus
+    """
+    if not _MULTIPROCESS:
+        return REGISTRY
+    
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(FeedQueueCollector())
+    return registry
+
+
+def render() -> bytes:
+    """
+    Métriques au format texte de Prometheus
+    """
+    return generate_latest(scrape_registry())
+
+
+def mark_process_dead():
+    """
+    Oublier les jauges d'un processus qui s'arrête (mode multiprocessus)
+    """
+    if _MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+if not _MULTIPROCESS:
+    REGISTRY.register(FeedQueueCollector())
@@ -1,13 +1,13 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Table, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, true
 from .database import Base
 
 # Table d'association pour les catégories de flux
 feed_categories = Table(
     'feed_categories',
     Base.metadata,
-    Column('feed_id', Integer, ForeignKey('rss_feeds.id'), primary_key=True),
+    Column('feed_id', Integer, ForeignKey('rss_feeds.id', ondelete='CASCADE'), primary_key=True),
     Column('category_id', Integer, ForeignKey('categories.id'), primary_key=True)
 )
 
@@ -49,22 +49,28 @@ class Collection(Base):
     is_shared = Column(Boolean, default=False)
     owner_id = Column(Integer, ForeignKey("users.id"))
     
+    # Rétention des articles (None = pas de limite)
+    retention_days = Column(Integer)
+    retention_max_articles = Column(Integer)
+    retention_keep_favorites = Column(Boolean, default=True, server_default=true(), nullable=False)
+    retention_keep_commented = Column(Boolean, default=True, server_default=true(), nullable=False)
+    
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
-    # Relations
+    # Relations (suppressions en cascade faites par la base : ON DELETE CASCADE)
     owner = relationship("User", back_populates="owned_collections")
-    user_collections = relationship("UserCollection", back_populates="collection")
-    rss_feeds = relationship("RSSFeed", back_populates="collection")
-    comments = relationship("Comment", back_populates="collection")
-    messages = relationship("Message", back_populates="collection")
+    user_collections = relationship("UserCollection", back_populates="collection", cascade="all, delete", passive_deletes=True)
+    rss_feeds = relationship("RSSFeed", back_populates="collection", cascade="all, delete", passive_deletes=True)
+    comments = relationship("Comment", back_populates="collection", cascade="all, delete", passive_deletes=True)
+    messages = relationship("Message", back_populates="collection", cascade="all, delete", passive_deletes=True)
 
 class UserCollection(Base):
     __tablename__ = "user_collections"
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    collection_id = Column(Integer, ForeignKey("collections.id"))
+    collection_id = Column(Integer, ForeignKey("collections.id", ondelete="CASCADE"))
     
     # Permissions
     can_read = Column(Boolean, default=True)
@@ -78,6 +84,10 @@ class UserCollection(Base):
     # Relations
     user = relationship("User", back_populates="user_collections")
     collection = relationship("Collection", back_populates="user_collections")
+    
+    __table_args__ = (
+        Index("ix_user_collections_user_collection", user_id, collection_id),
+    )
 
 class Category(Base):
     __tablename__ = "categories"
@@ -90,15 +100,83 @@ class Category(Base):
     # Relations
     feeds = relationship("RSSFeed", secondary=feed_categories, back_populates="categories")
 
+class FeedSource(Base):
+    __tablename__ = "feed_sources"
+    
+    # Flux distant, partagé par tous les abonnements à la même URL :
+    # récupéré une seule fois, ses articles ne sont stockés qu'une fois
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(500), unique=True, nullable=False)
+    # Hôte de l'URL en minuscules, port compris (politeness.host_of) : sources d'un même serveur
+    host = Column(String(500), index=True)
+    
+    # Métadonnées lues dans le flux
+    title = Column(String(200))
+    description = Column(Text)
+    site_url = Column(String(500))
+    
+    # Métadonnées automatiques
+    last_updated = Column(DateTime)
+    last_fetch_status = Column(String(20), default='pending')
+    error_message = Column(Text)
+    
+    # Empreintes SHA-256 du dernier contenu récupéré et de la liste des identifiants d'articles
+    content_hash = Column(String(64))
+    entries_hash = Column(String(64))
+    
+    # Planification et bail de récupération (une source n'est traitée que par un worker à la fois)
+    next_fetch_at = Column(DateTime, index=True)
+    lease_owner = Column(String(100))
+    lease_expires_at = Column(DateTime)
+    
+    # WebSub : hub annoncé par le flux et état de l'abonnement push
+    # (None = à demander, pending, subscribed, denied, error, unsubscribing, unsubscribed)
+    websub_hub = Column(String(500))
+    websub_topic = Column(String(500))
+    websub_secret = Column(String(64))
+    websub_status = Column(String(20))
+    websub_expires_at = Column(DateTime)
+    
+    # Santé : échecs définitifs consécutifs (404, 410...) avant désactivation automatique
+    consecutive_failures = Column(Integer, default=0, nullable=False)
+    
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    # Relations
+    subscriptions = relationship("RSSFeed", back_populates="source", passive_deletes=True)
+    articles = relationship("Article", back_populates="source", cascade="all, delete", passive_deletes=True)
+    health_events = relationship("FeedHealthEvent", back_populates="source", cascade="all, delete", passive_deletes=True)
+
+class FeedHealthEvent(Base):
+    __tablename__ = "feed_health_events"
+    
+    # Changements d'état d'une source : redirection permanente, fusion,
+    # désactivation et réactivation
+    id = Column(Integer, primary_key=True, index=True)
+    source_id = Column(Integer, ForeignKey("feed_sources.id", ondelete="CASCADE"), nullable=False)
+    event = Column(String(20), nullable=False)
+    detail = Column(Text)
+    created_at = Column(DateTime, default=func.now())
+    
+    # Relations
+    source = relationship("FeedSource", back_populates="health_events")
+    
+    __table_args__ = (
+        # Historique d'une source, du plus récent au plus ancien
+        Index("ix_feed_health_events_source_created", source_id, created_at.desc()),
+    )
+
 class RSSFeed(Base):
     __tablename__ = "rss_feeds"
     
+    # Abonnement d'une collection à une source
     id = Column(Integer, primary_key=True, index=True)
-    collection_id = Column(Integer, ForeignKey("collections.id"))
+    collection_id = Column(Integer, ForeignKey("collections.id", ondelete="CASCADE"), index=True)
+    source_id = Column(Integer, ForeignKey("feed_sources.id", ondelete="CASCADE"), nullable=False, index=True)
     
-    # Métadonnées du flux
+    # Métadonnées propres à l'abonnement (le titre peut différer de celui de la source)
     title = Column(String(200), nullable=False)
-    url = Column(String(500), unique=True, nullable=False)
     description = Column(Text)
     site_url = Column(String(500))
     
@@ -106,10 +184,9 @@ class RSSFeed(Base):
     update_frequency = Column(Integer, default=60)  # Minutes
     is_active = Column(Boolean, default=True)
     
-    # Métadonnées automatiques
-    last_updated = Column(DateTime)
-    last_fetch_status = Column(String(20), default='pending')
-    error_message = Column(Text)
+    # Rétention propre au flux (None = politique de la collection)
+    retention_days = Column(Integer)
+    retention_max_articles = Column(Integer)
     
     added_by_user_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=func.now())
@@ -117,21 +194,42 @@ class RSSFeed(Base):
     
     # Relations
     collection = relationship("Collection", back_populates="rss_feeds")
+    source = relationship("FeedSource", back_populates="subscriptions")
     added_by_user = relationship("User")
-    articles = relationship("Article", back_populates="feed")
-    categories = relationship("Category", secondary=feed_categories, back_populates="feeds")
+    categories = relationship("Category", secondary=feed_categories, back_populates="feeds", passive_deletes=True)
+    
+    __table_args__ = (
+        UniqueConstraint("collection_id", "source_id", name="uq_rss_feeds_collection_source"),
+    )
+    
+    # État de récupération, porté par la source
+    @property
+    def url(self):
+        return self.source.url if self.source else None
+    
+    @property
+    def last_updated(self):
+        return self.source.last_updated if self.source else None
+    
+    @property
+    def last_fetch_status(self):
+        return self.source.last_fetch_status if self.source else 'pending'
+    
+    @property
+    def error_message(self):
+        return self.source.error_message if self.source else None
 
 class Article(Base):
     __tablename__ = "articles"
     
     id = Column(Integer, primary_key=True, index=True)
-    feed_id = Column(Integer, ForeignKey("rss_feeds.id"))
+    source_id = Column(Integer, ForeignKey("feed_sources.id", ondelete="CASCADE"))
     
     # Contenu de l'article
     title = Column(String(300), nullable=False)
     link = Column(String(500), nullable=False)
     description = Column(Text)
-    content = Column(Text)
+    body_hash = Column(String(64), ForeignKey("article_bodies.hash"))
     author = Column(String(100))
     
     # Dates
@@ -142,16 +240,37 @@ class Article(Base):
     guid = Column(String(500))
     
     # Relations
-    feed = relationship("RSSFeed", back_populates="articles")
-    user_articles = relationship("UserArticle", back_populates="article")
-    comments = relationship("Comment", back_populates="article")
+    source = relationship("FeedSource", back_populates="articles")
+    body = relationship("ArticleBody")
+    user_articles = relationship("UserArticle", back_populates="article", cascade="all, delete", passive_deletes=True)
+    comments = relationship("Comment", back_populates="article", cascade="all, delete", passive_deletes=True)
+    
+    __table_args__ = (
+        # Listes d'articles d'une source triées par date
+        Index("ix_articles_source_published", source_id, published_date.desc()),
+        # Déduplication à l'import
+        Index("ix_articles_source_guid", source_id, guid),
+    )
+    
+    @property
+    def content(self):
+        """Contenu complet, chargé à la demande depuis article_bodies"""
+        return self.body.content if self.body else None
+
+class ArticleBody(Base):
+    __tablename__ = "article_bodies"
+    
+    # Empreinte SHA-256 du contenu : un même texte n'est stocké qu'une fois
+    hash = Column(String(64), primary_key=True)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=func.now())
 
 class UserArticle(Base):
     __tablename__ = "user_articles"
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    article_id = Column(Integer, ForeignKey("articles.id"))
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"))
     
     is_read = Column(Boolean, default=False)
     is_favorite = Column(Boolean, default=False)
@@ -161,14 +280,21 @@ class UserArticle(Base):
     # Relations
     user = relationship("User", back_populates="user_articles")
     article = relationship("Article", back_populates="user_articles")
+    
+    __table_args__ = (
+        Index(
+            "ix_user_articles_user_article", user_id, article_id,
+            postgresql_include=["is_read", "is_favorite"]
+        ),
+    )
 
 class Comment(Base):
     __tablename__ = "comments"
     
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, ForeignKey("articles.id"))
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"))
     user_id = Column(Integer, ForeignKey("users.id"))
-    collection_id = Column(Integer, ForeignKey("collections.id"))
+    collection_id = Column(Integer, ForeignKey("collections.id", ondelete="CASCADE"))
     
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=func.now())
@@ -178,12 +304,16 @@ class Comment(Base):
     article = relationship("Article", back_populates="comments")
     user = relationship("User", back_populates="comments")
     collection = relationship("Collection", back_populates="comments")
+    
+    __table_args__ = (
+        Index("ix_comments_article_created", article_id, created_at.desc()),
+    )
 
 class Message(Base):
     __tablename__ = "messages"
     
     id = Column(Integer, primary_key=True, index=True)
-    collection_id = Column(Integer, ForeignKey("collections.id"))
+    collection_id = Column(Integer, ForeignKey("collections.id", ondelete="CASCADE"))
     user_id = Column(Integer, ForeignKey("users.id"))
     
     content = Column(Text, nullable=False)
@@ -191,4 +321,16 @@ class Message(Base):
     
     # Relations
     collection = relationship("Collection", back_populates="messages")
-    user = relationship("User", back_populates="messages")
\ No newline at end of file
+    user = relationship("User", back_populates="messages")
+    
+    __table_args__ = (
+        Index("ix_messages_collection_created", collection_id, created_at.desc()),
+    )
+
+class CacheVersion(Base):
+    __tablename__ = "cache_versions"
+    
+    # Compteurs de version du cache de réponses (collection, utilisateur) :
+    # partagés par tous les processus qui écrivent, API comme workers
+    key = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
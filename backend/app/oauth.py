@@ -1,9 +1,5 @@
 
-import httpx
 from fastapi import HTTPException
-from authlib.integrations.starlette_client import OAuth
-from authlib.integrations.starlette_client import OAuthError
-from starlette.config import Config
 from starlette.requests import Request
 from typing import Dict, Optional
 import secrets
@@ -12,20 +8,29 @@ import urllib.parse
 from .config import settings
 
 
-config = Config()
-oauth = OAuth(config)
+# authlib et httpx (~250 ms d'import) ne sont chargés qu'au premier usage OAuth
+_oauth = None
 
 
-if settings.GOOGLE_CLIENT_ID and settings.GOOGLE_CLIENT_SECRET:
-    oauth.register(
-        name='google',
-        client_id=settings.GOOGLE_CLIENT_ID,
-        client_secret=settings.GOOGLE_CLIENT_SECRET,
-        server_metadata_url='https://accounts.google.com/.well-known/openid_configuration',
-        client_kwargs={
-            'scope': ' '.join(settings.GOOGLE_SCOPES)
-        }
-    )
+def get_oauth():
+    """Registre OAuth authlib, construit au premier appel"""
+    global _oauth
+    if _oauth is None:
+        from authlib.integrations.starlette_client import OAuth
+        from starlette.config import Config
+        
+        _oauth = OAuth(Config())
+        if settings.GOOGLE_CLIENT_ID and settings.GOOGLE_CLIENT_SECRET:
+            _oauth.register(
+                name='google',
+                client_id=settings.GOOGLE_CLIENT_ID,
+                client_secret=settings.GOOGLE_CLIENT_SECRET,
+                server_metadata_url='https://accounts.google.com/.well-known/openid_configuration',
+                client_kwargs={
+                    'scope': ' '.join(settings.GOOGLE_SCOPES)
+                }
+            )
+    return _oauth
 
 class OAuth2Service:
     def __init__(self):
@@ -83,6 +88,7 @@ class OAuth2Service:
             'redirect_uri': settings.GOOGLE_REDIRECT_URI,
         }
         
+        import httpx
         
         async with httpx.AsyncClient() as client:
             response = await client.post(
@@ -106,6 +112,8 @@ class OAuth2Service:
             'Accept': 'application/json'
         }
         
+        import httpx
+        
         async with httpx.AsyncClient() as client:
             response = await client.get(
                 settings.GOOGLE_USER_INFO_URL,
@@ -0,0 +1,152 @@
+# politeness.py - Politesse des récupérations : débit limité par hôte et respect de Retry-After
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+import threading
+import time
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from .models import FeedSource
+from .config import settings
+from .ratelimit import TokenBucketLimiter
+
+
+class FetchThrottled(Exception):
+    """Le serveur du flux demande de ralentir (429 ou 503)"""
+    
+    def __init__(self, status_code: int, retry_after: int):
+        super().__init__(f"HTTP {status_code}, nouvel essai dans {retry_after} s")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def host_of(url: str) -> str:
+    """
+    Hôte (avec port éventuel) d'une URL de flux
+    """
+    return urlsplit(url).netloc.lower()
+
+
+def parse_retry_after(value: Optional[str]) -> int:
+    """
+    Délai demandé par l'en-tête Retry-After (secondes ou date HTTP), borné
+    """
+    delay = settings.FETCH_RETRY_AFTER_DEFAULT_SECONDS
+    if value:
+        value = value.strip()
+        if value.isdigit():
+            delay = int(value)
+        else:
+            try:
+                retry_at = parsedate_to_datetime(value)
+                now = datetime.now(retry_at.tzinfo) if retry_at.tzinfo else datetime.utcnow()
+                delay = int((retry_at - now).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    return max(1, min(delay, settings.FETCH_RETRY_AFTER_MAX_SECONDS))
+
+
+def parse_host_rates(value: str) -> Dict[str, float]:
+    """
+    Débits propres à certains hôtes : "hote=requêtes/minute,hote2=..."
+    """
+    rates = {}
+    for item in value.split(','):
+        host, _, rate = item.partition('=')
+        if host.strip() and rate.strip():
+            rates[host.strip().lower()] = float(rate)
+    return rates
+
+
+class HostRateLimiter:
+    """
+    Un seau à jetons par hôte (débit par défaut ou propre à l'hôte), plus les
+    hôtes mis en pause après un Retry-After. Propre à chaque processus : les
+    pauses sont aussi reportées en base sur les sources de l'hôte.
+    """
+    
+    def __init__(self, rate_per_minute: float, burst: int, host_rates: Dict[str, float]):
+        self._default = TokenBucketLimiter(burst, rate_per_minute) if rate_per_minute > 0 else None
+        self._per_host = {
+            host: TokenBucketLimiter(burst, rate) for host, rate in host_rates.items() if rate > 0
+        }
+        self._blocked_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, host: str, max_wait: float) -> int:
+        """
+        Attendre (au plus max_wait secondes) le droit d'interroger l'hôte ;
+        renvoie 0 si accordé, sinon le délai avant le prochain essai
+        """
+        deadline = time.monotonic() + max_wait
+        limiter = self._per_host.get(host, self._default)
+        
+        while True:
+            with self._lock:
+                blocked = self._blocked_until.get(host, 0) - time.monotonic()
+            
+            if blocked > 0:
+                wait = blocked
+            elif limiter is None:
+                return 0
+            else:
+                allowed, wait = limiter.consume(host)
+                if allowed:
+                    return 0
+                # Délai arrondi à la seconde : un jeton arrive au plus tard après 1/débit
+                wait = min(wait, 1 / limiter.refill_per_second)
+            
+            if time.monotonic() + wait > deadline:
+                return max(1, int(wait))
+            time.sleep(wait)
+    
+    def block(self, host: str, seconds: int):
+        """
+        Suspendre les requêtes vers un hôte (Retry-After)
+        """
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._blocked_until[host] = max(until, self._blocked_until.get(host, 0))
+            
+            # Oublier les pauses terminées
+            now = time.monotonic()
+            for expired in [h for h, t in self._blocked_until.items() if t <= now]:
+                del self._blocked_until[expired]
+
+
+def defer_host_sources(db: Session, host: str, retry_at: datetime) -> int:
+    """
+    Repousser la prochaine récupération de toutes les sources d'un hôte
+    """
+    return db.query(FeedSource).filter(
+        FeedSource.host == host.lower(),
+        or_(FeedSource.next_fetch_at.is_(None), FeedSource.next_fetch_at < retry_at)
+    ).update({FeedSource.next_fetch_at: retry_at}, synchronize_session=False)
+
+
+def interleave_by_host(jobs: List[Dict]) -> List[Dict]:
+    """
+    Alterner les hôtes dans la liste des récupérations : les sources d'un même
+    hôte ne monopolisent pas les threads pendant que son seau se remplit
+    """
+    by_host: Dict[str, List[Dict]] = {}
+    for job in jobs:
+        by_host.setdefault(host_of(job['url']), []).append(job)
+    
+    interleaved = []
+    pending = list(by_host.values())
+    while pending:
+        for host_jobs in pending:
+            interleaved.append(host_jobs.pop(0))
+        pending = [host_jobs for host_jobs in pending if host_jobs]
+    return interleaved
+
+
+host_limiter = HostRateLimiter(
+    settings.FETCH_HOST_RATE_PER_MINUTE,
+    settings.FETCH_HOST_BURST,
+    parse_host_rates(settings.FETCH_HOST_RATES)
+)
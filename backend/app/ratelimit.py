@@ -0,0 +1,60 @@
+# ratelimit.py - Limitation de débit en mémoire (seaux à jetons)
+from collections import OrderedDict
+from typing import Tuple
+import math
+import threading
+import time
+
+from fastapi import HTTPException, status
+
+
+class TokenBucketLimiter:
+    """
+    Un seau à jetons par clé (nom d'utilisateur, adresse IP...), borné en
+    nombre de clés : les seaux les moins récemment utilisés sont oubliés.
+    Propre à chaque processus.
+    """
+    
+    def __init__(self, capacity: int, refill_per_minute: float, max_keys: int = 10000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_minute / 60.0
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def consume(self, key: str) -> Tuple[bool, int]:
+        """
+        Consommer un jeton ; renvoie (autorisé, secondes avant le prochain jeton)
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.capacity), now]
+                self._buckets[key] = bucket
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                tokens, updated_at = bucket
+                bucket[0] = min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+                bucket[1] = now
+            
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0
+            
+            retry_after = math.ceil((1 - bucket[0]) / self.refill_per_second) if self.refill_per_second else 60
+            return False, retry_after
+    
+    def check(self, key: str):
+        """
+        Lever une erreur 429 si la clé a épuisé ses jetons
+        """
+        allowed, retry_after = self.consume(key)
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Trop de tentatives, réessayez plus tard",
+                headers={"Retry-After": str(retry_after)}
+            )
@@ -0,0 +1,267 @@
+# retention.py - Politique de rétention et purge des anciens articles
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, exists, func, or_
+import logging
+
+from .models import Article, ArticleBody, Collection, Comment, FeedSource, RSSFeed, UserArticle
+from .database import SessionLocal
+from .config import settings
+from . import cache
+
+logger = logging.getLogger(__name__)
+
+
+def get_effective_policy(feed: RSSFeed, collection: Optional[Collection]) -> Dict:
+    """
+    Calculer la politique de rétention d'un flux (flux > collection > défaut)
+    """
+    days = feed.retention_days
+    max_articles = feed.retention_max_articles
+    keep_favorites = True
+    keep_commented = True
+    
+    if collection is not None:
+        if days is None:
+            days = collection.retention_days
+        if max_articles is None:
+            max_articles = collection.retention_max_articles
+        keep_favorites = collection.retention_keep_favorites is not False
+        keep_commented = collection.retention_keep_commented is not False
+    
+    return {
+        'days': days or settings.RETENTION_DEFAULT_DAYS or None,
+        'max_articles': max_articles or settings.RETENTION_DEFAULT_MAX_ARTICLES or None,
+        'keep_favorites': keep_favorites,
+        'keep_commented': keep_commented
+    }
+
+
+def _most_permissive(values: List[Optional[int]]) -> Optional[int]:
+    """None (pas de limite) l'emporte, sinon la plus grande valeur"""
+    return None if any(value is None for value in values) else max(values)
+
+
+def get_source_policy(source: FeedSource) -> Dict:
+    """
+    Politique de rétention d'une source partagée : un article est conservé
+    tant qu'au moins un des abonnements le conserve
+    """
+    policies = [get_effective_policy(feed, feed.collection) for feed in source.subscriptions]
+    if not policies:
+        return get_effective_policy(RSSFeed(), None)
+    
+    return {
+        'days': _most_permissive([policy['days'] for policy in policies]),
+        'max_articles': _most_permissive([policy['max_articles'] for policy in policies]),
+        'keep_favorites': any(policy['keep_favorites'] for policy in policies),
+        'keep_commented': any(policy['keep_commented'] for policy in policies)
+    }
+
+
+def get_retention_cutoff(policy: Dict) -> Optional[datetime]:
+    """
+    Date en deçà de laquelle un article n'est plus conservé
+    """
+    if not policy['days']:
+        return None
+    return datetime.utcnow() - timedelta(days=policy['days'])
+
+
+def _expired_article_ids(db: Session, source_id: int, policy: Dict, batch_size: int) -> List[int]:
+    """
+    Sélectionner un lot d'articles expirés pour une source
+    """
+    conditions = []
+    
+    cutoff = get_retention_cutoff(policy)
+    if cutoff is not None:
+        # Même date que le filtre de l'ingestion (published_date), sinon un
+        # ancien article récupéré récemment survivrait à la purge
+        conditions.append(func.coalesce(Article.published_date, Article.fetched_at) < cutoff)
+    
+    if policy['max_articles']:
+        # Au-delà des N articles les plus récents
+        newest_ids = db.query(Article.id).filter(
+            Article.source_id == source_id
+        ).order_by(Article.id.desc()).limit(policy['max_articles'])
+        conditions.append(~Article.id.in_(newest_ids.scalar_subquery()))
+    
+    if not conditions:
+        return []
+    
+    query = db.query(Article.id).filter(
+        and_(Article.source_id == source_id, or_(*conditions))
+    )
+    
+    # Sous-requêtes corrélées : NOT IN serait indéterminé dès qu'un
+    # article_id est NULL, et parcourrait toute la table à chaque lot
+    if policy['keep_favorites']:
+        query = query.filter(
+            ~exists().where(and_(UserArticle.article_id == Article.id, UserArticle.is_favorite == True))
+        )
+    
+    if policy['keep_commented']:
+        query = query.filter(~exists().where(Comment.article_id == Article.id))
+    
+    return [row.id for row in query.order_by(Article.id).limit(batch_size).all()]
+
+
+def _delete_articles(db: Session, article_ids: List[int]):
+    """
+    Supprimer un lot d'articles et leurs lignes dépendantes
+    """
+    body_hashes = [
+        row.body_hash for row in db.query(Article.body_hash).filter(
+            and_(Article.id.in_(article_ids), Article.body_hash.isnot(None))
+        ).distinct()
+    ]
+    
+    db.query(UserArticle).filter(
+        UserArticle.article_id.in_(article_ids)
+    ).delete(synchronize_session=False)
+    db.query(Comment).filter(
+        Comment.article_id.in_(article_ids)
+    ).delete(synchronize_session=False)
+    db.query(Article).filter(
+        Article.id.in_(article_ids)
+    ).delete(synchronize_session=False)
+    
+    # Contenus qui ne sont plus référencés par aucun article
+    if body_hashes:
+        db.query(ArticleBody).filter(
+            and_(
+                ArticleBody.hash.in_(body_hashes),
+                ~ArticleBody.hash.in_(
+                    db.query(Article.body_hash).filter(Article.body_hash.in_(body_hashes))
+                )
+            )
+        ).delete(synchronize_session=False)
+    
+    db.commit()
+
+
+def prune_source(db: Session, source: FeedSource, batch_size: Optional[int] = None) -> int:
+    """
+    Purger les articles expirés d'une source, par lots
+    """
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    policy = get_source_policy(source)
+    deleted = 0
+    
+    while True:
+        article_ids = _expired_article_ids(db, source.id, policy, batch_size)
+        if not article_ids:
+            break
+        
+        _delete_articles(db, article_ids)
+        deleted += len(article_ids)
+        
+        if len(article_ids) < batch_size:
+            break
+    
+    if deleted:
+        cache.bump_source(db, source.id)
+        logger.info(f"Rétention: {deleted} articles supprimés pour {source.url}")
+    
+    return deleted
+
+
+def purge_orphan_sources(db: Session, batch_size: Optional[int] = None) -> int:
+    """
+    Supprimer par lots les sources qui n'ont plus aucun abonnement (laissées
+    par la suppression d'une collection ou de leur dernier abonnement) ;
+    leurs articles partent en cascade
+    """
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    deleted = 0
+    
+    while True:
+        source_ids = [
+            row.id for row in db.query(FeedSource.id).filter(
+                ~exists().where(RSSFeed.source_id == FeedSource.id)
+            ).limit(batch_size).all()
+        ]
+        if not source_ids:
+            break
+        
+        db.query(FeedSource).filter(
+            FeedSource.id.in_(source_ids)
+        ).delete(synchronize_session=False)
+        db.commit()
+        deleted += len(source_ids)
+        
+        if len(source_ids) < batch_size:
+            break
+    
+    return deleted
+
+
+def purge_orphan_bodies(db: Session, batch_size: Optional[int] = None) -> int:
+    """
+    Supprimer par lots les contenus qui ne sont plus référencés par aucun
+    article (laissés par les suppressions en cascade de sources et collections)
+    """
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    deleted = 0
+    
+    while True:
+        hashes = [
+            row.hash for row in db.query(ArticleBody.hash).filter(
+                ~exists().where(Article.body_hash == ArticleBody.hash)
+            ).limit(batch_size).all()
+        ]
+        if not hashes:
+            break
+        
+        db.query(ArticleBody).filter(
+            ArticleBody.hash.in_(hashes)
+        ).delete(synchronize_session=False)
+        db.commit()
+        deleted += len(hashes)
+        
+        if len(hashes) < batch_size:
+            break
+    
+    return deleted
+
+
+def prune_all_feeds() -> Dict:
+    """
+    Appliquer la politique de rétention à toutes les sources
+    """
+    db = SessionLocal()
+    try:
+        results = {
+            'total_sources': 0,
+            'deleted_articles': 0,
+            'errors': []
+        }
+        
+        results['deleted_sources'] = purge_orphan_sources(db)
+        
+        for source in db.query(FeedSource).all():
+            results['total_sources'] += 1
+            try:
+                results['deleted_articles'] += prune_source(db, source)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Erreur de rétention pour {source.url}: {str(e)}")
+                results['errors'].append({
+                    'source_id': source.id,
+                    'url': source.url,
+                    'error': str(e)
+                })
+        
+        results['deleted_bodies'] = purge_orphan_bodies(db)
+        
+        logger.info(
+            f"Rétention terminée: {results['deleted_articles']} articles, "
+            f"{results['deleted_sources']} sources et "
+            f"{results['deleted_bodies']} contenus orphelins supprimés"
+        )
+        
+        return results
+    finally:
+        db.close()
@@ -2,15 +2,82 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc, or_
+from sqlalchemy import and_, desc, func, or_
 from typing import List, Optional
-from .. import models, schemas, auth
+from .. import models, schemas, auth, cache
 from ..database import get_db
-from ..rss_parser import update_feed
+from ..serialization import TrustedJSONResponse
+from ..subscriptions import readable_subscription
 
 router = APIRouter(prefix="/articles", tags=["articles"])
 
-@router.get("/collection/{collection_id}", response_model=List[schemas.ArticleResponse])
+
+# Longueur maximale de la description renvoyée dans les listes
+LIST_DESCRIPTION_LENGTH = 300
+
+LIST_FIELDS = set(schemas.ArticleListItem.model_fields)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[set]:
+    """Valider le paramètre fields= (champs demandés, séparés par des virgules)"""
+    if not fields:
+        return None
+    
+    requested = {field.strip() for field in fields.split(',') if field.strip()}
+    unknown = requested - LIST_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Champs inconnus: {', '.join(sorted(unknown))}"
+        )
+    return requested | {"id"}
+
+
+def list_columns():
+    """Colonnes sélectionnées pour les listes d'articles (feed_id : abonnement joint)"""
+    return (
+        models.Article.id,
+        models.RSSFeed.id.label("feed_id"),
+        models.Article.title,
+        models.Article.link,
+        func.substr(models.Article.description, 1, LIST_DESCRIPTION_LENGTH + 1).label("description"),
+        models.Article.author,
+        models.Article.published_date,
+        models.Article.fetched_at,
+        models.UserArticle.is_read,
+        models.UserArticle.is_favorite
+    )
+
+
+def to_list_item(row, fields: Optional[set]) -> dict:
+    """Convertir une ligne de la projection en dictionnaire de réponse"""
+    description = row.description
+    if description and len(description) > LIST_DESCRIPTION_LENGTH:
+        description = description[:LIST_DESCRIPTION_LENGTH - 3] + '...'
+    
+    article_dict = {
+        "id": row.id,
+        "feed_id": row.feed_id,
+        "title": row.title,
+        "link": row.link,
+        "description": description,
+        "author": row.author,
+        "published_date": row.published_date,
+        "fetched_at": row.fetched_at,
+        "is_read": bool(row.is_read),
+        "is_favorite": bool(row.is_favorite)
+    }
+    
+    if fields is not None:
+        article_dict = {key: value for key, value in article_dict.items() if key in fields}
+    return article_dict
+
+
+@router.get(
+    "/collection/{collection_id}",
+    response_model=List[schemas.ArticleListItem],
+    response_model_exclude_unset=True
+)
 def get_collection_articles(
     collection_id: int,
     current_user: models.User = Depends(auth.get_current_user),
@@ -20,10 +87,13 @@ def get_collection_articles(
     feed_id: Optional[int] = Query(None),
     is_read: Optional[bool] = Query(None),
     is_favorite: Optional[bool] = Query(None),
-    search: Optional[str] = Query(None)
+    search: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None)
 ):
     """Obtenir les articles d'une collection avec filtres et recherche plein texte"""
     
+    requested_fields = parse_fields(fields)
+    
     
     collection = db.query(models.Collection).filter(models.Collection.id == collection_id).first()
     if not collection:
@@ -42,22 +112,25 @@ def get_collection_articles(
             raise HTTPException(status_code=403, detail="Accès refusé")
     
     
-    query = db.query(models.Article).join(models.RSSFeed).filter(
+    # Articles des sources auxquelles la collection est abonnée
+    query = db.query(*list_columns()).select_from(models.Article).join(
+        models.RSSFeed, models.RSSFeed.source_id == models.Article.source_id
+    ).filter(
         models.RSSFeed.collection_id == collection_id
     )
     
     
     if feed_id:
-        query = query.filter(models.Article.feed_id == feed_id)
+        query = query.filter(models.RSSFeed.id == feed_id)
     
     
     if search and search.strip():
         search_term = f"%{search.strip()}%"
-        query = query.filter(
+        query = query.outerjoin(models.ArticleBody).filter(
             or_(
                 models.Article.title.ilike(search_term),
                 models.Article.description.ilike(search_term),
-                models.Article.content.ilike(search_term),
+                models.ArticleBody.content.ilike(search_term),
                 models.Article.author.ilike(search_term),
                 models.RSSFeed.title.ilike(search_term)
             )
@@ -100,35 +173,11 @@ def get_collection_articles(
     query = query.order_by(desc(models.Article.published_date))
     
     
-    articles = query.offset(offset).limit(limit).all()
-    
+    rows = query.offset(offset).limit(limit).all()
     
-    result = []
-    for article in articles:
-        user_article = db.query(models.UserArticle).filter(
-            and_(
-                models.UserArticle.article_id == article.id,
-                models.UserArticle.user_id == current_user.id
-            )
-        ).first()
-        
-        article_dict = {
-            "id": article.id,
-            "feed_id": article.feed_id,
-            "title": article.title,
-            "link": article.link,
-            "description": article.description,
-            "content": article.content,
-            "author": article.author,
-            "published_date": article.published_date,
-            "guid": article.guid,
-            "fetched_at": article.fetched_at,
-            "is_read": user_article.is_read if user_article else False,
-            "is_favorite": user_article.is_favorite if user_article else False
-        }
-        result.append(article_dict)
-    
-    return result
+    # Projection construite ici : pas de revalidation par response_model
+    return TrustedJSONResponse([to_list_item(row, requested_fields) for row in rows])
+
 
 @router.put("/{article_id}/status")
 def update_article_status(
@@ -145,20 +194,10 @@ def update_article_status(
         raise HTTPException(status_code=404, detail="Article non trouvé")
     
     
-    collection = db.query(models.Collection).join(models.RSSFeed).filter(
-        models.RSSFeed.id == article.feed_id
-    ).first()
-    
-    if collection.owner_id != current_user.id:
-        user_collection = db.query(models.UserCollection).filter(
-            and_(
-                models.UserCollection.user_id == current_user.id,
-                models.UserCollection.collection_id == collection.id,
-                models.UserCollection.can_read == True
-            )
-        ).first()
-        if not user_collection:
-            raise HTTPException(status_code=403, detail="Accès refusé")
+    # L'article est lisible si une collection accessible est abonnée à sa source
+    subscription = readable_subscription(db, current_user.id, article.source_id)
+    if not subscription:
+        raise HTTPException(status_code=403, detail="Accès refusé")
     
     
     user_article = db.query(models.UserArticle).filter(
@@ -188,19 +227,27 @@ def update_article_status(
     
     db.commit()
     db.refresh(user_article)
+    cache.bump_user(current_user.id)
     
     return {"message": "Statut mis à jour avec succès"}
 
-@router.get("/search", response_model=List[schemas.ArticleResponse])
+@router.get(
+    "/search",
+    response_model=List[schemas.ArticleListItem],
+    response_model_exclude_unset=True
+)
 def search_articles_global(
     search: str = Query(..., min_length=2),
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db),
     limit: int = Query(20, le=100),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None)
 ):
     """Recherche globale dans tous les articles accessibles par l'utilisateur"""
     
+    requested_fields = parse_fields(fields)
+    
     
     owned_collections = db.query(models.Collection.id).filter(
         models.Collection.owner_id == current_user.id
@@ -216,47 +263,82 @@ def search_articles_global(
     
     search_term = f"%{search.strip()}%"
     
-    query = db.query(models.Article).join(models.RSSFeed).join(models.Collection).filter(
+    # Un seul abonnement par source, même si plusieurs collections accessibles y sont abonnées
+    subscriptions = db.query(
+        models.RSSFeed.source_id.label("source_id"),
+        func.min(models.RSSFeed.id).label("feed_id")
+    ).filter(
         or_(
-            models.Collection.id.in_(owned_collections),
-            models.Collection.id.in_(shared_collections)
+            models.RSSFeed.collection_id.in_(owned_collections),
+            models.RSSFeed.collection_id.in_(shared_collections)
+        )
+    ).group_by(models.RSSFeed.source_id).subquery()
+    
+    query = db.query(*list_columns()).select_from(models.Article).join(
+        subscriptions, subscriptions.c.source_id == models.Article.source_id
+    ).join(
+        models.RSSFeed, models.RSSFeed.id == subscriptions.c.feed_id
+    ).outerjoin(
+        models.ArticleBody
+    ).outerjoin(
+        models.UserArticle,
+        and_(
+            models.UserArticle.article_id == models.Article.id,
+            models.UserArticle.user_id == current_user.id
         )
     ).filter(
         or_(
             models.Article.title.ilike(search_term),
             models.Article.description.ilike(search_term),
-            models.Article.content.ilike(search_term),
+            models.ArticleBody.content.ilike(search_term),
             models.Article.author.ilike(search_term),
             models.RSSFeed.title.ilike(search_term)
         )
     ).order_by(desc(models.Article.published_date))
     
-    articles = query.offset(offset).limit(limit).all()
+    rows = query.offset(offset).limit(limit).all()
     
+    # Projection construite ici : pas de revalidation par response_model
+    return TrustedJSONResponse([to_list_item(row, requested_fields) for row in rows])
+
+@router.get("/{article_id}", response_model=schemas.ArticleResponse)
+def get_article(
+    article_id: int,
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Obtenir un article avec son contenu complet"""
     
-    result = []
-    for article in articles:
-        user_article = db.query(models.UserArticle).filter(
-            and_(
-                models.UserArticle.article_id == article.id,
-                models.UserArticle.user_id == current_user.id
-            )
-        ).first()
-        
-        article_dict = {
-            "id": article.id,
-            "feed_id": article.feed_id,
-            "title": article.title,
-            "link": article.link,
-            "description": article.description,
-            "content": article.content,
-            "author": article.author,
-            "published_date": article.published_date,
-            "guid": article.guid,
-            "fetched_at": article.fetched_at,
-            "is_read": user_article.is_read if user_article else False,
-            "is_favorite": user_article.is_favorite if user_article else False
-        }
-        result.append(article_dict)
-    
-    return result
\ No newline at end of file
+    
+    article = db.query(models.Article).filter(models.Article.id == article_id).first()
+    if not article:
+        raise HTTPException(status_code=404, detail="Article non trouvé")
+    
+    
+    # L'article est lisible si une collection accessible est abonnée à sa source
+    subscription = readable_subscription(db, current_user.id, article.source_id)
+    if not subscription:
+        raise HTTPException(status_code=403, detail="Accès refusé")
+    
+    
+    user_article = db.query(models.UserArticle).filter(
+        and_(
+            models.UserArticle.article_id == article.id,
+            models.UserArticle.user_id == current_user.id
+        )
+    ).first()
+    
+    return {
+        "id": article.id,
+        "feed_id": subscription.id,
+        "title": article.title,
+        "link": article.link,
+        "description": article.description,
+        "content": article.content,
+        "author": article.author,
+        "published_date": article.published_date,
+        "guid": article.guid,
+        "fetched_at": article.fetched_at,
+        "is_read": user_article.is_read if user_article else False,
+        "is_favorite": user_article.is_favorite if user_article else False
+    }
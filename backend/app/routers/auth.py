@@ -1,5 +1,5 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -7,14 +7,30 @@ from .. import models, schemas, auth
 from ..database import get_db
 from ..oauth import oauth2_service
 from ..config import settings
+from ..ratelimit import TokenBucketLimiter
 import secrets
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+
+login_user_limiter = TokenBucketLimiter(
+    settings.LOGIN_RATE_LIMIT_USER_ATTEMPTS, settings.LOGIN_RATE_LIMIT_USER_PER_MINUTE
+)
+login_ip_limiter = TokenBucketLimiter(
+    settings.LOGIN_RATE_LIMIT_IP_ATTEMPTS, settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE
+)
+
+
+def client_ip(request: Request) -> str:
+    """Adresse du client pour la limitation de débit"""
+    return request.client.host if request.client else "unknown"
+
+
 @router.post("/register", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: schemas.UserCreate, db: Session = Depends(get_db)):
+def register(request: Request, user_data: schemas.UserCreate, db: Session = Depends(get_db)):
     """Créer un nouveau compte utilisateur"""
     
+    login_ip_limiter.check(client_ip(request))
     
     if db.query(models.User).filter(models.User.email == user_data.email).first():
         raise HTTPException(
@@ -44,10 +60,13 @@ def register(user_data: schemas.UserCreate, db: Session = Depends(get_db)):
     return db_user
 
 @router.post("/login", response_model=schemas.Token)
-def login(user_credentials: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(request: Request, user_credentials: schemas.UserLogin, db: Session = Depends(get_db)):
     """Connexion utilisateur"""
     
-    user = auth.authenticate_user(db, user_credentials.username, user_credentials.password)
+    login_ip_limiter.check(client_ip(request))
+    login_user_limiter.check(user_credentials.username.lower())
+    
+    user = await auth.authenticate_user_async(db, user_credentials.username, user_credentials.password)
     
     if not user:
         raise HTTPException(
@@ -1,34 +1,84 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, func, or_
 from typing import List
-from .. import models, schemas, auth
+from .. import models, schemas, auth, cache
 from ..database import get_db
 
 router = APIRouter(prefix="/collections", tags=["collections"])
 
-@router.get("/", response_model=List[schemas.CollectionResponse])
+@router.get("/", response_model=List[schemas.CollectionWithStats])
 def get_user_collections(
+    request: Request,
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Obtenir toutes les collections de l'utilisateur"""
+    """Obtenir toutes les collections de l'utilisateur, avec leurs compteurs"""
     
-    owned_collections = db.query(models.Collection).filter(
-        models.Collection.owner_id == current_user.id
-    ).all()
-    
-    
-    shared_collections = db.query(models.Collection).join(models.UserCollection).filter(
-        and_(
-            models.UserCollection.user_id == current_user.id,
-            models.UserCollection.can_read == True,
-            models.Collection.owner_id != current_user.id
+    def build():
+        shared_ids = db.query(models.UserCollection.collection_id).filter(
+            and_(
+                models.UserCollection.user_id == current_user.id,
+                models.UserCollection.can_read == True
+            )
         )
-    ).all()
-    
-    return owned_collections + shared_collections
+        accessible = or_(
+            models.Collection.owner_id == current_user.id,
+            models.Collection.id.in_(shared_ids)
+        )
+        accessible_ids = db.query(models.Collection.id).filter(accessible)
+        
+        
+        feed_counts = db.query(
+            models.RSSFeed.collection_id.label("collection_id"),
+            func.count(models.RSSFeed.id).label("feeds_count")
+        ).filter(
+            models.RSSFeed.collection_id.in_(accessible_ids)
+        ).group_by(models.RSSFeed.collection_id).subquery()
+        
+        # Articles lus par l'utilisateur : jointure externe limitée à is_read
+        article_counts = db.query(
+            models.RSSFeed.collection_id.label("collection_id"),
+            func.count(models.Article.id).label("articles_count"),
+            func.count(models.UserArticle.article_id).label("read_count")
+        ).select_from(models.Article).join(models.RSSFeed, models.RSSFeed.source_id == models.Article.source_id).outerjoin(
+            models.UserArticle,
+            and_(
+                models.UserArticle.article_id == models.Article.id,
+                models.UserArticle.user_id == current_user.id,
+                models.UserArticle.is_read == True
+            )
+        ).filter(
+            models.RSSFeed.collection_id.in_(accessible_ids)
+        ).group_by(models.RSSFeed.collection_id).subquery()
+        
+        
+        rows = db.query(
+            models.Collection,
+            func.coalesce(feed_counts.c.feeds_count, 0),
+            func.coalesce(article_counts.c.articles_count, 0),
+            func.coalesce(article_counts.c.read_count, 0)
+        ).outerjoin(
+            feed_counts, feed_counts.c.collection_id == models.Collection.id
+        ).outerjoin(
+            article_counts, article_counts.c.collection_id == models.Collection.id
+        ).filter(accessible).order_by(
+            models.Collection.owner_id != current_user.id,
+            models.Collection.id
+        ).all()
+        
+        collections = []
+        for collection, feeds_count, articles_count, read_count in rows:
+            item = schemas.CollectionWithStats.model_validate(collection)
+            item.feeds_count = feeds_count
+            item.articles_count = articles_count
+            item.unread_count = articles_count - read_count
+            collections.append(item)
+        return collections
+    
+    key = cache.make_key("collections", current_user.id, cache.user_collection_ids(db, current_user.id))
+    return cache.cached_response(request, key, build)
 
 @router.post("/", response_model=schemas.CollectionResponse, status_code=status.HTTP_201_CREATED)
 def create_collection(
@@ -47,6 +97,7 @@ def create_collection(
     db.add(db_collection)
     db.commit()
     db.refresh(db_collection)
+    cache.bump_user(current_user.id)
     
     return db_collection
 
@@ -99,6 +150,7 @@ def update_collection(
     
     db.commit()
     db.refresh(collection)
+    cache.bump_collection(collection.id)
     
     return collection
 
@@ -120,6 +172,7 @@ def delete_collection(
     
     db.delete(collection)
     db.commit()
+    cache.bump_collection(collection_id)
     
     return None
 
@@ -143,7 +196,16 @@ def get_collection_members(
         raise HTTPException(status_code=403, detail="Seul le propriétaire peut voir les membres")
     
     
-    members = db.query(models.UserCollection).filter(
+    # Utilisateurs chargés dans la même requête (colonnes affichées uniquement)
+    members = db.query(models.UserCollection).options(
+        joinedload(models.UserCollection.user).load_only(
+            models.User.id,
+            models.User.username,
+            models.User.email,
+            models.User.first_name,
+            models.User.last_name
+        )
+    ).filter(
         models.UserCollection.collection_id == collection_id
     ).all()
     
@@ -233,6 +295,7 @@ def invite_user_to_collection(
     db.add(new_member)
     db.commit()
     db.refresh(new_member)
+    cache.bump_collection(collection_id)
     
     return {
         "message": f"Utilisateur {username} invité avec succès",
@@ -281,6 +344,7 @@ def remove_member_from_collection(
     
     db.delete(member)
     db.commit()
+    cache.bump_collection(collection_id)
     
     return {"message": "Membre retiré avec succès"}
 
@@ -324,6 +388,7 @@ def update_member_permissions(
     
     db.commit()
     db.refresh(member)
+    cache.bump_collection(collection_id)
     
     return {
         "message": "Permissions mises à jour",
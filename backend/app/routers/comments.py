@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, desc
 from typing import List
-from .. import models, schemas, auth
+from .. import models, schemas, auth, cache
 from ..database import get_db
+from ..subscriptions import find_subscription, readable_subscription
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
@@ -18,36 +19,31 @@ def get_article_comments(
     """Obtenir les commentaires d'un article"""
     
     
-    article = db.query(models.Article).join(models.RSSFeed).filter(
+    article = db.query(models.Article).filter(
         models.Article.id == article_id
     ).first()
     
     if not article:
         raise HTTPException(status_code=404, detail="Article non trouvé")
     
-    collection = article.feed.collection
     
-    
-    has_access = False
-    if collection.owner_id == current_user.id:
-        has_access = True
-    else:
-        user_collection = db.query(models.UserCollection).filter(
-            and_(
-                models.UserCollection.user_id == current_user.id,
-                models.UserCollection.collection_id == collection.id,
-                models.UserCollection.can_read == True
-            )
-        ).first()
-        if user_collection:
-            has_access = True
-    
-    if not has_access:
+    if not readable_subscription(db, current_user.id, article.source_id):
         raise HTTPException(status_code=403, detail="Accès refusé")
     
     
-    comments = db.query(models.Comment).filter(
-        models.Comment.article_id == article_id
+    # Article partagé entre collections : seuls les commentaires des collections accessibles
+    collection_ids = cache.user_collection_ids(db, current_user.id)
+    
+    # Auteurs chargés dans la même requête (colonnes affichées uniquement)
+    comments = db.query(models.Comment).options(
+        joinedload(models.Comment.user).load_only(
+            models.User.id, models.User.username, models.User.first_name, models.User.last_name
+        )
+    ).filter(
+        and_(
+            models.Comment.article_id == article_id,
+            models.Comment.collection_id.in_(collection_ids)
+        )
     ).order_by(desc(models.Comment.created_at)).offset(offset).limit(limit).all()
     
     
@@ -87,7 +83,7 @@ def create_comment(
         raise HTTPException(status_code=400, detail="article_id, collection_id et content requis")
     
     
-    article = db.query(models.Article).join(models.RSSFeed).filter(
+    article = db.query(models.Article).filter(
         models.Article.id == article_id
     ).first()
     
@@ -95,7 +91,7 @@ def create_comment(
         raise HTTPException(status_code=404, detail="Article non trouvé")
     
     
-    if article.feed.collection_id != collection_id:
+    if not find_subscription(db, collection_id, article.source_id):
         raise HTTPException(status_code=400, detail="L'article n'appartient pas à cette collection")
     
     
@@ -147,6 +143,7 @@ def create_comment(
     db.add(db_comment)
     db.commit()
     db.refresh(db_comment)
+    cache.bump_collection(collection_id)
     
     
     return {
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile ,File
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import List
 from datetime import datetime
 import json
-import csv
 import xml.etree.ElementTree as ET
-from io import StringIO
-from .. import models, auth
+from .. import models, auth, cache
 from ..database import get_db
+from ..serialization import dumps
+from ..subscriptions import find_subscription, get_or_create_source, reschedule_source
 
 router = APIRouter(prefix="/export", tags=["export"])
 
@@ -20,7 +20,7 @@ def export_opml(
     """Exporter les flux RSS au format OPML"""
     
     
-    query = db.query(models.RSSFeed).join(models.Collection)
+    query = db.query(models.RSSFeed).options(joinedload(models.RSSFeed.source)).join(models.Collection)
     
     if collection_ids:
         collection_id_list = [int(id.strip()) for id in collection_ids.split(',')]
@@ -97,7 +97,7 @@ def export_json(
     """Exporter les flux RSS au format JSON"""
     
     
-    query = db.query(models.RSSFeed).join(models.Collection)
+    query = db.query(models.RSSFeed).options(joinedload(models.RSSFeed.source)).join(models.Collection)
     
     if collection_ids:
         collection_id_list = [int(id.strip()) for id in collection_ids.split(',')]
@@ -151,10 +151,8 @@ def export_json(
     export_data['collections'] = list(collections_data.values())
     
     
-    json_str = json.dumps(export_data, indent=2, ensure_ascii=False)
-    
     return Response(
-        content=json_str,
+        content=dumps(export_data, indent=True),
         media_type="application/json",
         headers={"Content-Disposition": "attachment; filename=rss_feeds.json"}
     )
@@ -168,7 +166,7 @@ def export_csv(
     """Exporter les flux RSS au format CSV"""
     
     
-    query = db.query(models.RSSFeed).join(models.Collection)
+    query = db.query(models.RSSFeed).options(joinedload(models.RSSFeed.source)).join(models.Collection)
     
     if collection_ids:
         collection_id_list = [int(id.strip()) for id in collection_ids.split(',')]
@@ -257,11 +255,14 @@ async def import_opml(
                 xml_url = outline.get('xmlUrl')
                 if xml_url:
                     
-                    existing_feed = db.query(models.RSSFeed).filter(
-                        models.RSSFeed.url == xml_url
-                    ).first()
+                    source = get_or_create_source(
+                        db, xml_url,
+                        title=outline.get('text'),
+                        description=outline.get('description'),
+                        site_url=outline.get('htmlUrl')
+                    )
                     
-                    if existing_feed:
+                    if find_subscription(db, collection_id, source.id):
                         skipped_feeds.append({
                             'url': xml_url,
                             'reason': 'Flux déjà existant'
@@ -271,20 +272,24 @@ async def import_opml(
                     
                     new_feed = models.RSSFeed(
                         collection_id=collection_id,
+                        source_id=source.id,
                         title=outline.get('text', 'Flux sans titre'),
-                        url=xml_url,
                         description=outline.get('description', ''),
                         site_url=outline.get('htmlUrl', ''),
                         added_by_user_id=current_user.id
                     )
                     
                     db.add(new_feed)
+                    db.flush()
+                    reschedule_source(db, source)
                     imported_feeds.append({
                         'title': new_feed.title,
-                        'url': new_feed.url
+                        'url': xml_url
                     })
         
         db.commit()
+        cache.bump_collection(collection_id)
+        cache.bump_user(current_user.id)
         
         return {
             "message": f"Import terminé: {len(imported_feeds)} flux importés, {len(skipped_feeds)} ignorés",
@@ -344,11 +349,14 @@ async def import_json(
                     continue
                 
                 
-                existing_feed = db.query(models.RSSFeed).filter(
-                    models.RSSFeed.url == feed_url
-                ).first()
+                source = get_or_create_source(
+                    db, feed_url,
+                    title=feed_data.get('title'),
+                    description=feed_data.get('description'),
+                    site_url=feed_data.get('site_url')
+                )
                 
-                if existing_feed:
+                if find_subscription(db, target_collection_id, source.id):
                     skipped_feeds.append({
                         'url': feed_url,
                         'reason': 'Flux déjà existant'
@@ -358,8 +366,8 @@ async def import_json(
                 
                 new_feed = models.RSSFeed(
                     collection_id=target_collection_id,
+                    source_id=source.id,
                     title=feed_data.get('title', 'Flux sans titre'),
-                    url=feed_url,
                     description=feed_data.get('description', ''),
                     site_url=feed_data.get('site_url', ''),
                     update_frequency=feed_data.get('update_frequency', 60),
@@ -368,12 +376,17 @@ async def import_json(
                 )
                 
                 db.add(new_feed)
+                db.flush()
+                reschedule_source(db, source)
                 imported_feeds.append({
                     'title': new_feed.title,
-                    'url': new_feed.url
+                    'url': feed_url
                 })
         
         db.commit()
+        if collection_id:
+            cache.bump_collection(collection_id)
+        cache.bump_user(current_user.id)
         
         return {
             "message": f"Import terminé: {len(imported_feeds)} flux importés, {len(skipped_feeds)} ignorés",
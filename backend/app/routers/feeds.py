@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_
 from typing import List
-from .. import models, schemas, auth
+from datetime import datetime
+from .. import models, schemas, auth, cache
 from ..database import get_db
+from ..subscriptions import delete_subscription, find_subscription, get_or_create_source, reschedule_source
+from ..feed_health import record_event
+
+# Nombre d'événements de santé renvoyés par flux
+HEALTH_EVENTS_PER_FEED = 10
 
 router = APIRouter(prefix="/feeds", tags=["feeds"])
 
 @router.get("/collection/{collection_id}", response_model=List[schemas.RSSFeedResponse])
 def get_collection_feeds(
     collection_id: int,
+    request: Request,
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -31,8 +38,72 @@ def get_collection_feeds(
         if not user_collection:
             raise HTTPException(status_code=403, detail="Accès refusé")
     
-    feeds = db.query(models.RSSFeed).filter(models.RSSFeed.collection_id == collection_id).all()
-    return feeds
+    def build():
+        feeds = db.query(models.RSSFeed).options(joinedload(models.RSSFeed.source)).filter(
+            models.RSSFeed.collection_id == collection_id
+        ).all()
+        return [schemas.RSSFeedResponse.model_validate(feed) for feed in feeds]
+    
+    key = cache.make_key("feeds", current_user.id, [collection_id])
+    return cache.cached_response(request, key, build)
+
+@router.get("/collection/{collection_id}/health", response_model=List[schemas.FeedHealthResponse])
+def get_collection_feeds_health(
+    collection_id: int,
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Santé des flux d'une collection : échecs, désactivations, redirections permanentes"""
+    
+    collection = db.query(models.Collection).filter(models.Collection.id == collection_id).first()
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection non trouvée")
+    
+    
+    if collection.owner_id != current_user.id:
+        user_collection = db.query(models.UserCollection).filter(
+            and_(
+                models.UserCollection.user_id == current_user.id,
+                models.UserCollection.collection_id == collection_id,
+                models.UserCollection.can_read == True
+            )
+        ).first()
+        if not user_collection:
+            raise HTTPException(status_code=403, detail="Accès refusé")
+    
+    feeds = db.query(models.RSSFeed).options(joinedload(models.RSSFeed.source)).filter(
+        models.RSSFeed.collection_id == collection_id
+    ).order_by(models.RSSFeed.id).all()
+    
+    # Historique de toutes les sources en une requête, le plus récent d'abord
+    events_by_source = {}
+    if feeds:
+        events = db.query(models.FeedHealthEvent).filter(
+            models.FeedHealthEvent.source_id.in_([feed.source_id for feed in feeds])
+        ).order_by(models.FeedHealthEvent.created_at.desc(), models.FeedHealthEvent.id.desc()).all()
+        for event in events:
+            source_events = events_by_source.setdefault(event.source_id, [])
+            if len(source_events) < HEALTH_EVENTS_PER_FEED:
+                source_events.append(event)
+    
+    return [
+        schemas.FeedHealthResponse(
+            feed_id=feed.id,
+            title=feed.title,
+            url=feed.url,
+            is_active=feed.is_active,
+            last_fetch_status=feed.last_fetch_status or "pending",
+            error_message=feed.error_message,
+            consecutive_failures=feed.source.consecutive_failures or 0,
+            last_updated=feed.last_updated,
+            next_fetch_at=feed.source.next_fetch_at,
+            events=[
+                schemas.FeedHealthEventResponse.model_validate(event)
+                for event in events_by_source.get(feed.source_id, [])
+            ]
+        )
+        for feed in feeds
+    ]
 
 @router.post("/", response_model=schemas.RSSFeedResponse, status_code=status.HTTP_201_CREATED)
 def create_feed(
@@ -40,11 +111,7 @@ def create_feed(
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Ajouter un flux RSS à une collection"""
-    
-    if db.query(models.RSSFeed).filter(models.RSSFeed.url == feed_data.url).first():
-        raise HTTPException(status_code=400, detail="Ce flux RSS existe déjà")
-    
+    """Abonner une collection à un flux RSS (la source est partagée entre collections)"""
     
     collection = db.query(models.Collection).filter(models.Collection.id == feed_data.collection_id).first()
     if not collection:
@@ -63,10 +130,19 @@ def create_feed(
             raise HTTPException(status_code=403, detail="Pas d'autorisation pour ajouter des flux")
     
     
+    source = get_or_create_source(
+        db, feed_data.url,
+        title=feed_data.title,
+        description=feed_data.description,
+        site_url=feed_data.site_url
+    )
+    if find_subscription(db, feed_data.collection_id, source.id):
+        raise HTTPException(status_code=400, detail="Ce flux RSS existe déjà dans cette collection")
+    
     db_feed = models.RSSFeed(
         collection_id=feed_data.collection_id,
+        source_id=source.id,
         title=feed_data.title,
-        url=feed_data.url,
         description=feed_data.description,
         site_url=feed_data.site_url,
         update_frequency=feed_data.update_frequency,
@@ -75,8 +151,12 @@ def create_feed(
     )
     
     db.add(db_feed)
+    db.flush()
+    # La fréquence du nouvel abonnement peut avancer la prochaine récupération
+    reschedule_source(db, source)
     db.commit()
     db.refresh(db_feed)
+    cache.bump_collection(db_feed.collection_id)
     
     return db_feed
 
@@ -107,11 +187,23 @@ def update_feed_settings(
             raise HTTPException(status_code=403, detail="Pas d'autorisation pour modifier ce flux")
     
     
-    for field, value in feed_update.dict(exclude_unset=True).items():
+    changes = feed_update.dict(exclude_unset=True)
+    was_active = feed.is_active
+    for field, value in changes.items():
         setattr(feed, field, value)
     
+    # Réactivation d'un flux désactivé : le compteur d'échecs repart de zéro
+    if changes.get('is_active') and not was_active and feed.source.consecutive_failures:
+        feed.source.consecutive_failures = 0
+        record_event(db, feed.source_id, 'reactivated', f"Réactivé par {current_user.username}")
+    
+    if 'update_frequency' in changes or 'is_active' in changes:
+        db.flush()
+        reschedule_source(db, feed.source)
+    
     db.commit()
     db.refresh(feed)
+    cache.bump_collection(feed.collection_id)
     
     return feed
 
@@ -141,99 +233,30 @@ def update_feed_content(
         if not user_collection:
             raise HTTPException(status_code=403, detail="Pas d'autorisation pour mettre à jour ce flux")
     
-    try:
-        
-        import feedparser
-        import requests
-        from datetime import datetime
-        from sqlalchemy.sql import func
-        
-        
-        response = requests.get(feed.url, timeout=30)
-        response.raise_for_status()
-        
-        
-        parsed_feed = feedparser.parse(response.content)
-        
-        if parsed_feed.bozo:
-            raise HTTPException(status_code=400, detail=f"Flux RSS invalide: {parsed_feed.bozo_exception}")
-        
-        
-        new_articles_count = 0
-        
-        
-        for entry in parsed_feed.entries:
-            
-            article_guid = getattr(entry, 'id', entry.link)
-            
-            
-            existing_article = db.query(models.Article).filter(
-                and_(
-                    models.Article.feed_id == feed.id,
-                    models.Article.guid == article_guid
-                )
-            ).first()
-            
-            if existing_article:
-                continue  
-            
-            
-            title = getattr(entry, 'title', 'Sans titre')
-            link = getattr(entry, 'link', '')
-            description = getattr(entry, 'description', '') or getattr(entry, 'summary', '')
-            author = getattr(entry, 'author', None)
-            
-            
-            published_date = None
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                try:
-                    published_date = datetime(*entry.published_parsed[:6])
-                except (TypeError, ValueError):
-                    pass
-            
-            
-            new_article = models.Article(
-                feed_id=feed.id,
-                title=title[:300],  
-                link=link[:500],    
-                description=description,
-                author=author[:100] if author else None,  
-                published_date=published_date,
-                guid=article_guid[:500],  
-                fetched_at=func.now()
-            )
-            
-            db.add(new_article)
-            new_articles_count += 1
-        
-        
-        feed.last_updated = func.now()
-        feed.last_fetch_status = 'success'
-        feed.error_message = None
-        
-        db.commit()
-        
-        return {
-            "message": f"Flux mis à jour avec succès",
-            "new_articles_count": new_articles_count,
-            "total_entries": len(parsed_feed.entries),
-            "feed_title": feed.title,
-            "last_updated": datetime.now().isoformat()
-        }
-        
-    except requests.RequestException as e:
-        
-        feed.last_fetch_status = 'error'
-        feed.error_message = f"Erreur de récupération: {str(e)}"
-        db.commit()
-        raise HTTPException(status_code=400, detail=f"Impossible de récupérer le flux: {str(e)}")
-    
-    except Exception as e:
-        
-        feed.last_fetch_status = 'error' 
-        feed.error_message = f"Erreur de parsing: {str(e)}"
-        db.commit()
-        raise HTTPException(status_code=500, detail=f"Erreur lors de la mise à jour: {str(e)}")
+    # Même chemin que les workers : bail sur la source, politesse par hôte,
+    # rétention, déduplication et stockage des corps d'articles
+    from ..rss_parser import RSSParser
+    
+    result = RSSParser(inline_parse=True).fetch_feed(feed.id)
+    
+    if result['status'] == 'busy':
+        raise HTTPException(status_code=409, detail="Flux en cours de récupération, réessayez plus tard")
+    if result['status'] in ('throttled', 'deferred'):
+        raise HTTPException(
+            status_code=429,
+            detail="Serveur du flux momentanément limité, mise à jour reportée",
+            headers={"Retry-After": str(result['retry_after'])}
+        )
+    if result['status'] != 'success':
+        raise HTTPException(status_code=400, detail=f"Impossible de mettre à jour le flux: {result['error']}")
+    
+    return {
+        "message": "Flux mis à jour avec succès",
+        "new_articles_count": result.get('new_articles_count', 0),
+        "total_entries": result.get('total_articles', 0),
+        "feed_title": feed.title,
+        "last_updated": datetime.now().isoformat()
+    }
 
 @router.delete("/{feed_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_feed(
@@ -241,7 +264,7 @@ def delete_feed(
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Supprimer un flux RSS"""
+    """Supprimer un flux RSS (désabonner la collection)"""
     feed = db.query(models.RSSFeed).filter(models.RSSFeed.id == feed_id).first()
     
     if not feed:
@@ -260,7 +283,9 @@ def delete_feed(
         if not user_collection:
             raise HTTPException(status_code=403, detail="Pas d'autorisation pour supprimer ce flux")
     
-    db.delete(feed)
+    collection_id = feed.collection_id
+    delete_subscription(db, feed)
     db.commit()
+    cache.bump_collection(collection_id)
     
     return None
\ No newline at end of file
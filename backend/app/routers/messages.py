@@ -1,9 +1,9 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, desc
 from typing import List
-from .. import models, schemas, auth
+from .. import models, schemas, auth, cache
 from ..database import get_db
 
 router = APIRouter(prefix="/messages", tags=["messages"])
@@ -46,7 +46,12 @@ def get_collection_messages(
         raise HTTPException(status_code=403, detail="Accès refusé")
     
     
-    messages = db.query(models.Message).filter(
+    # Auteurs chargés dans la même requête (colonnes affichées uniquement)
+    messages = db.query(models.Message).options(
+        joinedload(models.Message.user).load_only(
+            models.User.id, models.User.username, models.User.first_name, models.User.last_name
+        )
+    ).filter(
         models.Message.collection_id == collection_id
     ).order_by(desc(models.Message.created_at)).offset(offset).limit(limit).all()
     
@@ -131,6 +136,7 @@ def create_message(
     db.add(db_message)
     db.commit()
     db.refresh(db_message)
+    cache.bump_collection(collection_id)
     
     
     return {
@@ -172,7 +178,9 @@ def delete_message(
             detail="Vous ne pouvez supprimer que vos propres messages"
         )
     
+    collection_id = message.collection_id
     db.delete(message)
     db.commit()
+    cache.bump_collection(collection_id)
     
     return None
@@ -1,20 +1,27 @@
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, distinct
 from typing import Dict
-from .. import models, auth
+from .. import models, auth, cache
 from ..database import get_db
 
 router = APIRouter(prefix="/stats", tags=["statistics"])
 
 @router.get("/dashboard")
 def get_dashboard_stats(
+    request: Request,
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
-) -> Dict:
+) -> Response:
     """Obtenir les statistiques pour le dashboard"""
     
+    key = cache.make_key("dashboard", current_user.id, cache.user_collection_ids(db, current_user.id))
+    return cache.cached_response(request, key, lambda: build_dashboard_stats(db, current_user))
+
+def build_dashboard_stats(db: Session, current_user: models.User) -> Dict:
+    """Calculer les statistiques du dashboard"""
+    
     
     owned_collections_count = db.query(models.Collection).filter(
         models.Collection.owner_id == current_user.id
@@ -47,19 +54,18 @@ def get_dashboard_stats(
     total_feeds = owned_feeds.count() + shared_feeds.count()
     
     
-    owned_articles = db.query(models.Article).join(models.RSSFeed).join(models.Collection).filter(
-        models.Collection.owner_id == current_user.id
-    )
+    # Un seul abonnement par source, même si plusieurs collections accessibles y sont abonnées
+    subscriptions = db.query(
+        models.RSSFeed.source_id.label("source_id"),
+        func.min(models.RSSFeed.id).label("feed_id")
+    ).filter(
+        models.RSSFeed.collection_id.in_(cache.user_collection_ids(db, current_user.id))
+    ).group_by(models.RSSFeed.source_id).subquery()
     
-    shared_articles = db.query(models.Article).join(models.RSSFeed).join(models.Collection).join(models.UserCollection).filter(
-        and_(
-            models.UserCollection.user_id == current_user.id,
-            models.UserCollection.can_read == True,
-            models.Collection.owner_id != current_user.id
-        )
-    )
-    
-    total_articles = owned_articles.count() + shared_articles.count()
+    # Une source suivie par plusieurs collections ne compte ses articles qu'une fois
+    total_articles = db.query(func.count(distinct(models.Article.id))).select_from(models.Article).join(
+        subscriptions, subscriptions.c.source_id == models.Article.source_id
+    ).scalar()
     
     
     read_articles = db.query(models.UserArticle).filter(
@@ -84,36 +90,39 @@ def get_dashboard_stats(
                   shared_feeds.filter(models.RSSFeed.is_active == True).count()
     
     
-    recent_articles_query = db.query(models.Article).join(models.RSSFeed).join(models.Collection).filter(
-        models.Collection.owner_id == current_user.id
-    ).union(
-        db.query(models.Article).join(models.RSSFeed).join(models.Collection).join(models.UserCollection).filter(
-            and_(
-                models.UserCollection.user_id == current_user.id,
-                models.UserCollection.can_read == True,
-                models.Collection.owner_id != current_user.id
-            )
+    # Titre de l'abonnement de l'utilisateur et statut de lecture dans la même requête
+    recent_rows = db.query(
+        models.Article.id,
+        models.Article.title,
+        models.Article.link,
+        models.Article.published_date,
+        models.RSSFeed.title.label("feed_title"),
+        models.UserArticle.is_read,
+        models.UserArticle.is_favorite
+    ).join(
+        subscriptions, subscriptions.c.source_id == models.Article.source_id
+    ).join(
+        models.RSSFeed, models.RSSFeed.id == subscriptions.c.feed_id
+    ).outerjoin(
+        models.UserArticle,
+        and_(
+            models.UserArticle.article_id == models.Article.id,
+            models.UserArticle.user_id == current_user.id
         )
-    ).order_by(models.Article.published_date.desc()).limit(5)
-    
-    recent_articles = []
-    for article in recent_articles_query:
-        user_article = db.query(models.UserArticle).filter(
-            and_(
-                models.UserArticle.article_id == article.id,
-                models.UserArticle.user_id == current_user.id
-            )
-        ).first()
-        
-        recent_articles.append({
-            "id": article.id,
-            "title": article.title,
-            "link": article.link,
-            "published_date": article.published_date,
-            "feed_title": article.feed.title,
-            "is_read": user_article.is_read if user_article else False,
-            "is_favorite": user_article.is_favorite if user_article else False
-        })
+    ).order_by(models.Article.published_date.desc()).limit(5).all()
+    
+    recent_articles = [
+        {
+            "id": row.id,
+            "title": row.title,
+            "link": row.link,
+            "published_date": row.published_date,
+            "feed_title": row.feed_title,
+            "is_read": bool(row.is_read),
+            "is_favorite": bool(row.is_favorite)
+        }
+        for row in recent_rows
+    ]
     
     return {
         "collections": {
@@ -138,9 +147,10 @@ def get_dashboard_stats(
 @router.get("/collection/{collection_id}")
 def get_collection_stats(
     collection_id: int,
+    request: Request,
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
-) -> Dict:
+) -> Response:
     """Obtenir les statistiques d'une collection spécifique"""
     
     
@@ -160,6 +170,15 @@ def get_collection_stats(
         if not user_collection:
             raise HTTPException(status_code=403, detail="Accès refusé")
     
+    key = cache.make_key("collection-stats", current_user.id, [collection_id])
+    return cache.cached_response(
+        request, key, lambda: build_collection_stats(db, collection, current_user)
+    )
+
+def build_collection_stats(db: Session, collection: models.Collection, current_user: models.User) -> Dict:
+    """Calculer les statistiques d'une collection"""
+    
+    collection_id = collection.id
     
     feeds_count = db.query(models.RSSFeed).filter(models.RSSFeed.collection_id == collection_id).count()
     active_feeds_count = db.query(models.RSSFeed).filter(
@@ -169,12 +188,12 @@ def get_collection_stats(
         )
     ).count()
     
-    articles_count = db.query(models.Article).join(models.RSSFeed).filter(
+    articles_count = db.query(models.Article).join(models.RSSFeed, models.RSSFeed.source_id == models.Article.source_id).filter(
         models.RSSFeed.collection_id == collection_id
     ).count()
     
     
-    read_articles_count = db.query(models.UserArticle).join(models.Article).join(models.RSSFeed).filter(
+    read_articles_count = db.query(models.UserArticle).join(models.Article).join(models.RSSFeed, models.RSSFeed.source_id == models.Article.source_id).filter(
         and_(
             models.RSSFeed.collection_id == collection_id,
             models.UserArticle.user_id == current_user.id,
@@ -185,7 +204,7 @@ def get_collection_stats(
     unread_articles_count = articles_count - read_articles_count
     
     
-    favorite_articles_count = db.query(models.UserArticle).join(models.Article).join(models.RSSFeed).filter(
+    favorite_articles_count = db.query(models.UserArticle).join(models.Article).join(models.RSSFeed, models.RSSFeed.source_id == models.Article.source_id).filter(
         and_(
             models.RSSFeed.collection_id == collection_id,
             models.UserArticle.user_id == current_user.id,
@@ -198,11 +217,11 @@ def get_collection_stats(
     feeds = db.query(models.RSSFeed).filter(models.RSSFeed.collection_id == collection_id).all()
     
     for feed in feeds:
-        feed_articles_count = db.query(models.Article).filter(models.Article.feed_id == feed.id).count()
+        feed_articles_count = db.query(models.Article).filter(models.Article.source_id == feed.source_id).count()
         
         feed_read_articles = db.query(models.UserArticle).join(models.Article).filter(
             and_(
-                models.Article.feed_id == feed.id,
+                models.Article.source_id == feed.source_id,
                 models.UserArticle.user_id == current_user.id,
                 models.UserArticle.is_read == True
             )
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import Optional
+from .. import websub
+from ..config import settings
+from ..database import get_db
+
+router = APIRouter(prefix="/websub", tags=["websub"])
+
+@router.get("/callback/{source_id}", response_class=PlainTextResponse)
+def verify_subscription(
+    source_id: int,
+    mode: str = Query(..., alias="hub.mode"),
+    topic: str = Query(..., alias="hub.topic"),
+    challenge: Optional[str] = Query(None, alias="hub.challenge"),
+    lease_seconds: Optional[int] = Query(None, alias="hub.lease_seconds"),
+    reason: Optional[str] = Query(None, alias="hub.reason"),
+    db: Session = Depends(get_db)
+):
+    """Vérification d'intention envoyée par le hub (écho du challenge si la demande vient de nous)"""
+    
+    if not websub.confirm_intent(db, source_id, mode, topic, lease_seconds, reason):
+        raise HTTPException(status_code=404, detail="Abonnement inconnu")
+    
+    return PlainTextResponse(challenge or "")
+
+@router.post("/callback/{source_id}", status_code=status.HTTP_202_ACCEPTED)
+async def receive_content(source_id: int, request: Request):
+    """Contenu poussé par le hub : traité comme une récupération du flux"""
+    
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.WEBSUB_MAX_CONTENT_BYTES:
+        raise HTTPException(status_code=413, detail="Contenu trop volumineux")
+    
+    content = await request.body()
+    if len(content) > settings.WEBSUB_MAX_CONTENT_BYTES:
+        raise HTTPException(status_code=413, detail="Contenu trop volumineux")
+    
+    # Parsing et écriture en base hors de la boucle d'événements
+    outcome = await run_in_threadpool(
+        websub.ingest_pushed_content, source_id, request.headers.get("X-Hub-Signature"), content
+    )
+    
+    if outcome == websub.UNKNOWN_SOURCE:
+        # 410 : le hub peut supprimer l'abonnement d'une source supprimée
+        raise HTTPException(status_code=410, detail="Source inconnue")
+    if outcome == websub.SOURCE_BUSY:
+        raise HTTPException(
+            status_code=503,
+            detail="Source en cours de récupération, réessayez plus tard",
+            headers={"Retry-After": "60"}
+        )
+    
+    return Response(status_code=status.HTTP_202_ACCEPTED)
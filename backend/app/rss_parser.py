@@ -1,178 +1,617 @@
 # rss_parser.py - Parseur de flux RSS opérationnel
 import feedparser
 import requests
-from datetime import datetime
-from typing import List, Dict, Optional
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import hashlib
+import html
 import logging
+import queue
 import re
+import threading
+import time
+from collections import OrderedDict
 
-from .models import RSSFeed, Article
+from .models import FeedSource, RSSFeed, Article, ArticleBody
 from .database import SessionLocal
+from .config import settings
+from .retention import get_source_policy, get_retention_cutoff
+from .leases import LeaseHeartbeat, claim_due_sources, claim_source, release_leases, worker_identity
+from .subscriptions import reschedule_source
+from .feed_health import (
+    apply_permanent_redirect, hard_failure_status, permanent_redirect_target, register_failure
+)
+from .politeness import (
+    FetchThrottled, defer_host_sources, host_limiter, host_of, interleave_by_host, parse_retry_after
+)
+from . import cache, lxml_parser, metrics
 
 logger = logging.getLogger(__name__)
 
+# Expressions précompilées pour le nettoyage HTML (plus rapides qu'un arbre
+# lxml.html pour le même texte : voir benchmarks/clean_html.py)
+_BR_RE = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Marqueur de fin de flux entre les étapes du pipeline
+_END_OF_STREAM = object()
+
+_parser_pool: Optional[ProcessPoolExecutor] = None
+_parser_pool_lock = threading.Lock()
+
+
+def get_parser_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Obtenir le pool de processus dédié au parsing (None si désactivé)
+    """
+    global _parser_pool
+    if settings.FEED_PARSER_PROCESSES <= 0:
+        return None
+    with _parser_pool_lock:
+        if _parser_pool is None:
+            _parser_pool = ProcessPoolExecutor(max_workers=settings.FEED_PARSER_PROCESSES)
+    return _parser_pool
+
+
+def shutdown_parser_pool():
+    """
+    Arrêter le pool de processus de parsing
+    """
+    global _parser_pool
+    with _parser_pool_lock:
+        if _parser_pool is not None:
+            _parser_pool.shutdown(wait=True)
+            _parser_pool = None
+
+
+def parse_feed_content(content: bytes) -> Dict:
+    """
+    Parser le contenu brut d'un flux et extraire ses articles.
+    
+    Exécutée dans un processus du pool : ne manipule que des types simples
+    afin que le résultat soit sérialisable. Les flux RSS 2.0 / Atom bien
+    formés passent par le parseur lxml, les autres par feedparser.
+    """
+    start = time.perf_counter()
+    parser = 'lxml'
+    parsed_feed = lxml_parser.parse_feed(content) if settings.FEED_FAST_PARSER else None
+    if parsed_feed is None:
+        parser = 'feedparser'
+        parsed_feed = feedparser.parse(content)
+    parse_seconds = time.perf_counter() - start
+    
+    entries = []
+    for entry in parsed_feed.entries:
+        try:
+            entries.append(RSSParser._extract_article_data(entry))
+        except Exception as e:
+            logger.error(f"Erreur lors du traitement d'un article: {str(e)}")
+            continue
+    
+    entries_hash = hashlib.sha256(
+        '\n'.join(entry['guid'] for entry in entries).encode('utf-8')
+    ).hexdigest()
+    
+    bozo_exception = parsed_feed.get('bozo_exception')
+    return {
+        'bozo': bool(parsed_feed.bozo),
+        'bozo_exception': str(bozo_exception) if bozo_exception else None,
+        'feed_info': RSSParser._extract_feed_info(parsed_feed),
+        'entries': entries,
+        'entries_hash': entries_hash,
+        'total_entries': len(parsed_feed.entries),
+        'parser': parser,
+        'parse_seconds': parse_seconds
+    }
+
+
+def submit_parse(content: bytes, inline: bool = False) -> Future:
+    """
+    Soumettre le parsing d'un flux au pool de processus (ou l'exécuter sur
+    place : pool désactivé, ou appel depuis un worker de l'API)
+    """
+    pool = None if inline else get_parser_pool()
+    if pool is not None:
+        return pool.submit(parse_feed_content, content)
+    
+    future = Future()
+    try:
+        future.set_result(parse_feed_content(content))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
 class RSSParser:
     """Classe pour parser et stocker les flux RSS"""
     
-    def __init__(self):
+    def __init__(self, inline_parse: bool = False):
         self.headers = {
             'User-Agent': 'RSS-Aggregator/1.0 (https://example.com/contact)'
         }
+        # Workers de l'API : parsing sur place, sans pool de processus propre
+        self.inline_parse = inline_parse
     
-    def fetch_feed(self, feed_id: int) -> Dict:
+    def fetch_feed(self, feed_id: int, owner: Optional[str] = None) -> Dict:
         """
-        Récupérer et parser un flux RSS spécifique
+        Récupérer et parser la source d'un abonnement (flux RSS) spécifique.
+        
+        La source est réservée par un bail comme dans les workers : si l'un
+        d'eux la traite déjà, rien n'est fait (statut busy).
         """
+        owner = owner or worker_identity("manual")
         db = SessionLocal()
         try:
             feed = db.query(RSSFeed).filter(RSSFeed.id == feed_id).first()
             if not feed:
                 return {'status': 'error', 'error': 'Flux non trouvé'}
             
-            return self._process_feed(db, feed)
+            source_id = feed.source_id
+            if not claim_source(db, owner, source_id):
+                return {'status': 'busy', 'error': 'Flux en cours de récupération'}
+            
+            try:
+                return self._process_feed(db, feed.source)
+            finally:
+                db.rollback()
+                release_leases(db, owner, [source_id])
         finally:
             db.close()
     
-    def fetch_all_active_feeds(self) -> Dict:
+    def fetch_all_active_feeds(self, owner: Optional[str] = None, limit: Optional[int] = None) -> Dict:
         """
-        Récupérer tous les flux RSS actifs
+        Récupérer les sources arrivées à échéance, une seule fois par URL quel
+        que soit le nombre de collections abonnées.
+        
+        Les sources sont d'abord réservées par un bail en base (voir leases) :
+        plusieurs processus ou machines peuvent appeler cette méthode en même
+        temps sans récupérer deux fois la même source.
+        
+        Les flux traversent trois étapes reliées par des files bornées :
+        téléchargement (threads), parsing (pool de processus) puis écriture
+        en base (thread courant, seul à utiliser la session).
         """
+        owner = owner or worker_identity("scheduler")
+        heartbeat = LeaseHeartbeat(owner)
         db = SessionLocal()
         try:
-            active_feeds = db.query(RSSFeed).filter(RSSFeed.is_active == True).all()
+            sources = claim_due_sources(db, owner, limit)
+            sources_by_id = {source.id: source for source in sources}
             
             results = {
-                'total_feeds': len(active_feeds),
+                'total_feeds': len(sources),
                 'successful_feeds': 0,
                 'failed_feeds': 0,
+                'throttled_feeds': 0,
                 'total_new_articles': 0,
                 'errors': []
             }
+            if not sources:
+                return results
             
-            for feed in active_feeds:
+            fetched_queue = queue.Queue(maxsize=settings.FEED_PIPELINE_QUEUE_SIZE)
+            parsed_queue = queue.Queue(maxsize=settings.FEED_PIPELINE_QUEUE_SIZE)
+            
+            # Les étapes concurrentes ne reçoivent que des valeurs simples, jamais d'objets ORM
+            jobs = interleave_by_host([self._make_job(source) for source in sources])
+            
+            fetch_stage = threading.Thread(
+                target=self._fetch_stage, args=(jobs, fetched_queue), daemon=True
+            )
+            parse_stage = threading.Thread(
+                target=self._parse_stage, args=(fetched_queue, parsed_queue), daemon=True
+            )
+            heartbeat.start()
+            fetch_stage.start()
+            parse_stage.start()
+            
+            while True:
+                item = parsed_queue.get()
+                metrics.FEED_PIPELINE_QUEUE_DEPTH.labels('fetched').set(fetched_queue.qsize())
+                metrics.FEED_PIPELINE_QUEUE_DEPTH.labels('parsed').set(parsed_queue.qsize())
+                if item is _END_OF_STREAM:
+                    break
+                
+                source = sources_by_id[item['source_id']]
+                # Valeurs lues avant l'écriture : la source peut être fusionnée dans une autre
+                source_id, source_url = source.id, source.url
+                
                 try:
-                    result = self._process_feed(db, feed)
+                    result = self._store_feed_result(db, source, item)
+                    release_leases(db, owner, [source_id])
                     
                     if result['status'] == 'success':
                         results['successful_feeds'] += 1
                         results['total_new_articles'] += result.get('new_articles_count', 0)
+                    elif result['status'] in ('throttled', 'deferred'):
+                        results['throttled_feeds'] += 1
                     else:
                         results['failed_feeds'] += 1
                         results['errors'].append({
-                            'feed_id': feed.id,
-                            'feed_title': feed.title,
+                            'source_id': source_id,
+                            'url': source_url,
                             'error': result.get('error', 'Erreur inconnue')
                         })
                         
                 except Exception as e:
+                    db.rollback()
                     results['failed_feeds'] += 1
                     results['errors'].append({
-                        'feed_id': feed.id,
-                        'feed_title': feed.title,
+                        'source_id': source_id,
+                        'url': source_url,
                         'error': str(e)
                     })
             
+            fetch_stage.join()
+            parse_stage.join()
+            
             logger.info(f"Mise à jour terminée: {results['successful_feeds']} succès, "
                        f"{results['failed_feeds']} échecs, "
+                       f"{results['throttled_feeds']} reportés, "
                        f"{results['total_new_articles']} nouveaux articles")
             
             return results
         finally:
-            db.close()
+            heartbeat.stop()
+            metrics.FEED_PIPELINE_QUEUE_DEPTH.labels('fetched').set(0)
+            metrics.FEED_PIPELINE_QUEUE_DEPTH.labels('parsed').set(0)
+            
+            # Baux restants (erreurs) : libérés pour que d'autres workers reprennent ces sources
+            try:
+                db.rollback()
+                release_leases(db, owner)
+            finally:
+                db.close()
     
-    def _process_feed(self, db: Session, feed: RSSFeed) -> Dict:
+    def _fetch_stage(self, jobs: List, fetched_queue: queue.Queue):
         """
-        Traiter un flux RSS spécifique
+        Étape 1 : télécharger les flux en parallèle
         """
+        def fetch_one(job):
+            fetched_queue.put(self._fetch(job))
+        
         try:
-            logger.info(f"Récupération du flux: {feed.url}")
+            with ThreadPoolExecutor(max_workers=max(1, settings.FEED_FETCH_WORKERS)) as executor:
+                list(executor.map(fetch_one, jobs))
+        finally:
+            fetched_queue.put(_END_OF_STREAM)
+    
+    def _parse_stage(self, fetched_queue: queue.Queue, parsed_queue: queue.Queue):
+        """
+        Étape 2 : confier le parsing au pool de processus
+        """
+        while True:
+            item = fetched_queue.get()
+            if item is _END_OF_STREAM:
+                parsed_queue.put(_END_OF_STREAM)
+                return
             
-            # Récupérer le flux avec timeout
-            response = requests.get(
-                feed.url,
-                headers=self.headers,
-                timeout=30,
-                allow_redirects=True
-            )
-            response.raise_for_status()
+            if item['content'] is not None:
+                item['parse_future'] = submit_parse(item.pop('content'))
+            parsed_queue.put(item)
+    
+    def _make_job(self, source: FeedSource) -> Dict:
+        """
+        Décrire une source à récupérer avec des valeurs simples (sans objet ORM)
+        """
+        return {
+            'source_id': source.id,
+            'url': source.url,
+            'content_hash': source.content_hash
+        }
+    
+    def _fetch(self, job: Dict) -> Dict:
+        """
+        Télécharger un flux et calculer l'empreinte de son contenu.
+        
+        Si l'empreinte est identique à celle de la dernière récupération, le
+        contenu est abandonné : ni parsing ni déduplication ne sont nécessaires.
+        
+        Les requêtes vers un même hôte sont limitées (seau à jetons par hôte) ;
+        une source dont l'hôte n'a plus de jeton à temps est reportée.
+        """
+        fetched = {
+            'source_id': job['source_id'],
+            'error': None,
+            'deferred': 0,
+            'content': None,
+            'content_hash': None,
+            'permanent_url': None,
+            'parse_future': None
+        }
+        
+        host = host_of(job['url'])
+        fetched['deferred'] = host_limiter.acquire(host, settings.FETCH_HOST_MAX_WAIT_SECONDS)
+        if fetched['deferred']:
+            return fetched
+        
+        start = time.perf_counter()
+        try:
+            response = self._download(job['url'])
+        except FetchThrottled as e:
+            metrics.observe_fetch(time.perf_counter() - start, e.status_code)
+            host_limiter.block(host, e.retry_after)
+            fetched['error'] = e
+            return fetched
+        except Exception as e:
+            status_code = getattr(getattr(e, 'response', None), 'status_code', None)
+            metrics.observe_fetch(time.perf_counter() - start, status_code)
+            fetched['error'] = e
+            return fetched
+        
+        content = response.content
+        metrics.observe_fetch(time.perf_counter() - start, response.status_code, len(content))
+        
+        # Redirection permanente : la nouvelle URL sera enregistrée sur la source
+        permanent_url = permanent_redirect_target(response)
+        if permanent_url and permanent_url != job['url']:
+            fetched['permanent_url'] = permanent_url
+        
+        fetched['content_hash'] = hashlib.sha256(content).hexdigest()
+        if fetched['content_hash'] != job['content_hash']:
+            fetched['content'] = content
+        return fetched
+    
+    def _download(self, url: str) -> requests.Response:
+        """
+        Télécharger un flux (la réponse garde l'historique des redirections)
+        """
+        logger.info(f"Récupération du flux: {url}")
+        
+        # Récupérer le flux avec timeout
+        response = requests.get(
+            url,
+            headers=self.headers,
+            timeout=30,
+            allow_redirects=True
+        )
+        
+        # 429/503 : le serveur demande de ralentir, Retry-After est respecté
+        if response.status_code in (429, 503):
+            raise FetchThrottled(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+        response.raise_for_status()
+        return response
+    
+    def _process_feed(self, db: Session, source: FeedSource) -> Dict:
+        """
+        Traiter une source spécifique
+        """
+        fetched = self._fetch(self._make_job(source))
+        if fetched['content'] is not None:
+            fetched['parse_future'] = submit_parse(fetched.pop('content'), inline=self.inline_parse)
+        
+        return self._store_feed_result(db, source, fetched)
+    
+    def process_pushed_content(self, db: Session, source: FeedSource, content: bytes) -> Dict:
+        """
+        Traiter un contenu poussé par un hub WebSub comme une récupération
+        (mêmes étapes de parsing, de déduplication et d'écriture)
+        """
+        fetched = {
+            'source_id': source.id,
+            'error': None,
+            'content_hash': hashlib.sha256(content).hexdigest(),
+            'parse_future': submit_parse(content, inline=self.inline_parse)
+        }
+        return self._store_feed_result(db, source, fetched)
+    
+    def _store_feed_result(self, db: Session, source: FeedSource, fetched: Dict) -> Dict:
+        """
+        Étape 3 : enregistrer le résultat d'une source (articles et statut)
+        """
+        # Hôte sans jeton disponible : la source est seulement replanifiée
+        if fetched.get('deferred'):
+            source.next_fetch_at = datetime.utcnow() + timedelta(seconds=fetched['deferred'])
+            db.commit()
+            return {'status': 'deferred', 'retry_after': fetched['deferred']}
+        
+        # Le serveur demande de ralentir : toutes les sources de l'hôte sont repoussées
+        if isinstance(fetched['error'], FetchThrottled):
+            retry_after = fetched['error'].retry_after
+            retry_at = datetime.utcnow() + timedelta(seconds=retry_after)
+            error_msg = f"Limitation par le serveur: {str(fetched['error'])}"
+            logger.warning(f"Récupération limitée pour {source.url}: {error_msg}")
+            defer_host_sources(db, host_of(source.url), retry_at)
+            self._update_feed_status(db, source, 'throttled', error_msg, retry_at)
+            return {'status': 'throttled', 'error': error_msg, 'retry_after': retry_after}
+        
+        if fetched['error'] is not None:
+            error_msg = f"Erreur réseau: {str(fetched['error'])}"
+            logger.error(f"Erreur lors de la récupération de {source.url}: {error_msg}")
             
-            # Parser le flux RSS
-            parsed_feed = feedparser.parse(response.content)
+            # 404, 410... : compté, le flux est désactivé s'il semble mort
+            status_code = hard_failure_status(fetched['error'])
+            if status_code:
+                register_failure(db, source, status_code)
+            self._update_feed_status(db, source, 'error', error_msg)
+            return {'status': 'error', 'error': error_msg}
+        
+        # Redirection permanente vers l'URL d'une autre source : fusion dans celle-ci
+        if fetched.get('permanent_url'):
+            target = apply_permanent_redirect(db, source, fetched['permanent_url'])
+            if target is not source:
+                db.commit()
+                guid_cache.invalidate(target.id)
+                cache.bump_source(db, target.id)
+                return {
+                    'status': 'success',
+                    'merged_into': target.id,
+                    'new_articles_count': 0
+                }
+        
+        # Contenu identique à la dernière récupération : rien à parser
+        if fetched['parse_future'] is None:
+            logger.debug(f"Flux inchangé: {source.url}")
+            self._update_feed_status(db, source, 'success', None)
+            return {
+                'status': 'success',
+                'unchanged': True,
+                'new_articles_count': 0
+            }
+        
+        try:
+            parsed = fetched['parse_future'].result()
+            metrics.FEED_PARSE_DURATION.labels(parsed['parser']).observe(parsed['parse_seconds'])
             
             # Vérifier si le parsing a réussi
-            if parsed_feed.bozo:
-                logger.warning(f"Flux RSS malformé: {feed.url}")
-                if hasattr(parsed_feed, 'bozo_exception'):
-                    logger.warning(f"Erreur: {parsed_feed.bozo_exception}")
+            if parsed['bozo']:
+                logger.warning(f"Flux RSS malformé: {source.url}")
+                if parsed['bozo_exception']:
+                    logger.warning(f"Erreur: {parsed['bozo_exception']}")
             
-            # Traiter les articles
-            new_articles = self._process_articles(db, feed, parsed_feed.entries)
+            # Traiter les articles, sauf si la liste des identifiants n'a pas changé
+            new_articles = []
+            failed_entries = parsed['total_entries'] - len(parsed['entries'])
+            if parsed['entries_hash'] != source.entries_hash:
+                new_articles, failed = self._process_articles(db, source, parsed['entries'])
+                failed_entries += failed
             
-            # Mettre à jour le statut du flux
-            self._update_feed_status(db, feed, 'success', None)
+            # Mettre à jour le statut, les métadonnées et les empreintes de la source.
+            # Empreintes enregistrées seulement si toutes les entrées ont été traitées :
+            # sinon le même contenu serait ignoré aux récupérations suivantes
+            self._update_source_info(source, parsed['feed_info'])
+            if failed_entries:
+                logger.warning(f"{failed_entries} entrées non traitées pour {source.url}, empreintes non enregistrées")
+            else:
+                source.content_hash = fetched['content_hash']
+                source.entries_hash = parsed['entries_hash']
+            self._update_feed_status(db, source, 'success', None)
+            metrics.FEED_NEW_ARTICLES.observe(len(new_articles))
             
             return {
                 'status': 'success',
-                'feed_info': self._extract_feed_info(parsed_feed),
+                'feed_info': parsed['feed_info'],
                 'new_articles_count': len(new_articles),
-                'total_articles': len(parsed_feed.entries)
+                'total_articles': parsed['total_entries']
             }
             
-        except requests.RequestException as e:
-            error_msg = f"Erreur réseau: {str(e)}"
-            logger.error(f"Erreur lors de la récupération de {feed.url}: {error_msg}")
-            self._update_feed_status(db, feed, 'error', error_msg)
-            return {'status': 'error', 'error': error_msg}
-            
         except Exception as e:
+            db.rollback()
             error_msg = f"Erreur de parsing: {str(e)}"
-            logger.error(f"Erreur lors du parsing de {feed.url}: {error_msg}")
-            self._update_feed_status(db, feed, 'error', error_msg)
+            logger.error(f"Erreur lors du parsing de {source.url}: {error_msg}")
+            self._update_feed_status(db, source, 'error', error_msg)
             return {'status': 'error', 'error': error_msg}
     
-    def _process_articles(self, db: Session, feed: RSSFeed, entries: List) -> List[Article]:
+    @staticmethod
+    def _is_newest_first(entries: List[Dict]) -> bool:
         """
-        Traiter les articles d'un flux RSS
+        Vrai si toutes les entrées sont datées, de la plus récente à la plus ancienne
+        """
+        dates = [entry['published_date'] for entry in entries]
+        if None in dates:
+            return False
+        return all(newer >= older for newer, older in zip(dates, dates[1:]))
+    
+    def _process_articles(self, db: Session, source: FeedSource, entries: List[Dict]) -> Tuple[List[Article], int]:
+        """
+        Traiter les articles d'une source (données déjà extraites), stockés
+        une seule fois pour toutes les collections abonnées. Renvoie les
+        nouveaux articles et le nombre d'entrées en erreur.
+        
+        Si FEED_EARLY_STOP_THRESHOLD est défini et que toutes les entrées sont
+        datées du plus récent au plus ancien, le reste du flux est ignoré dès
+        que ce nombre d'entrées consécutives est déjà connu. Les autres flux
+        (ordre chronologique, dates absentes) sont parcourus en entier : leurs
+        nouvelles entrées peuvent se trouver en fin de liste.
         """
         new_articles = []
+        failed = 0
+        known_guids = guid_cache.get(db, source.id)
+        seen_guids = []  # Du plus récent au plus ancien
+        pending_bodies = set()
+        threshold = settings.FEED_EARLY_STOP_THRESHOLD if self._is_newest_first(entries) else 0
+        consecutive_known = 0
+        
+        # Ne pas réimporter des articles déjà hors de la fenêtre de rétention
+        cutoff = get_retention_cutoff(get_source_policy(source))
         
-        for entry in entries:
+        for article_data in entries:
             try:
-                # Extraire les données de l'article
-                article_data = self._extract_article_data(entry)
+                guid = article_data['guid']
+                
+                known = guid in known_guids
+                if not known:
+                    # Le cache est borné : vérifier en base avant de créer l'article
+                    known = db.query(Article.id).filter(
+                        and_(
+                            Article.source_id == source.id,
+                            Article.guid == guid
+                        )
+                    ).first() is not None
+                    known_guids.add(guid)
+                    seen_guids.append(guid)
+                
+                if known:
+                    consecutive_known += 1
+                    if threshold and consecutive_known >= threshold:
+                        logger.debug(f"Arrêt anticipé après {consecutive_known} articles connus: {source.url}")
+                        break
+                    continue
+
+                consecutive_known = 0
+                
+                if cutoff and article_data['published_date'] and article_data['published_date'] < cutoff:
+                    continue
                 
-                # Vérifier si l'article existe déjà
-                existing_article = db.query(Article).filter(
-                    and_(
-                        Article.feed_id == feed.id,
-                        Article.guid == article_data['guid']
-                    )
-                ).first()
+                # Créer un nouvel article (le contenu complet est stocké à part, par empreinte)
+                fields = dict(article_data)
+                content = fields.pop('content', None)
+                if content:
+                    fields['body_hash'] = self._store_body(db, content, pending_bodies)
                 
-                if not existing_article:
-                    # Créer un nouvel article
-                    article = Article(
-                        feed_id=feed.id,
-                        **article_data
-                    )
-                    db.add(article)
-                    new_articles.append(article)
-                    logger.debug(f"Nouvel article ajouté: {article_data['title']}")
+                article = Article(
+                    source_id=source.id,
+                    **fields
+                )
+                db.add(article)
+                new_articles.append(article)
+                logger.debug(f"Nouvel article ajouté: {article_data['title']}")
                 
             except Exception as e:
                 logger.error(f"Erreur lors du traitement d'un article: {str(e)}")
+                failed += 1
                 continue
         
         # Sauvegarder tous les nouveaux articles
         if new_articles:
-            db.commit()
-            logger.info(f"Ajouté {len(new_articles)} nouveaux articles pour {feed.title}")
+            try:
+                db.commit()
+            except Exception:
+                guid_cache.invalidate(source.id)
+                raise
+            logger.info(f"Ajouté {len(new_articles)} nouveaux articles pour {source.url}")
+        
+        guid_cache.add(source.id, seen_guids[::-1])
         
-        return new_articles
+        return new_articles, failed
     
-    def _extract_article_data(self, entry) -> Dict:
+    def _store_body(self, db: Session, content: str, pending_bodies: set) -> str:
+        """
+        Enregistrer un contenu dans article_bodies s'il n'y est pas déjà et retourner son empreinte
+        """
+        body_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        
+        if body_hash not in pending_bodies:
+            dialect = db.get_bind().dialect.name
+            if dialect in ('postgresql', 'sqlite'):
+                # Plusieurs workers peuvent stocker le même contenu en même temps
+                insert = postgresql_insert if dialect == 'postgresql' else sqlite_insert
+                db.execute(
+                    insert(ArticleBody).values(hash=body_hash, content=content)
+                    .on_conflict_do_nothing(index_elements=['hash'])
+                )
+            elif db.get(ArticleBody, body_hash) is None:
+                db.add(ArticleBody(hash=body_hash, content=content))
+        pending_bodies.add(body_hash)
+        
+        return body_hash
+    
+    @staticmethod
+    def _extract_article_data(entry) -> Dict:
         """
         Extraire les données d'un article depuis une entrée RSS
         """
@@ -193,7 +632,7 @@ class RSSParser:
         
         # Nettoyer le HTML de base si présent
         if description:
-            description = self._clean_html(description)
+            description = RSSParser._clean_html(description)
             if len(description) > 1000:
                 description = description[:997] + '...'
         
@@ -201,7 +640,7 @@ class RSSParser:
         content = ''
         if hasattr(entry, 'content') and entry.content:
             content = entry.content[0].value if isinstance(entry.content, list) else entry.content
-            content = self._clean_html(content)
+            content = RSSParser._clean_html(content)
         
         # Auteur
         author = ''
@@ -233,39 +672,26 @@ class RSSParser:
             'guid': guid
         }
     
-    def _clean_html(self, text: str) -> str:
+    @staticmethod
+    def _clean_html(text: str) -> str:
         """
-        Nettoyer le HTML basique d'un texte
+        Convertir un fragment HTML en texte brut (balises retirées, entités décodées)
         """
         if not text:
             return ''
         
-        # Supprimer les balises HTML de base
-        # Remplacer les balises <br> par des retours à la ligne
-        text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
-        
-        # Supprimer toutes les autres balises HTML
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Décoder les entités HTML communes
-        html_entities = {
-            '&amp;': '&',
-            '&lt;': '<',
-            '&gt;': '>',
-            '&quot;': '"',
-            '&#39;': "'",
-            '&nbsp;': ' '
-        }
+        # Les <br> deviennent des espaces, les autres balises disparaissent
+        text = _TAG_RE.sub('', _BR_RE.sub(' ', text))
         
-        for entity, char in html_entities.items():
-            text = text.replace(entity, char)
+        # Décoder toutes les entités HTML (nommées et numériques)
+        if '&' in text:
+            text = html.unescape(text)
         
         # Nettoyer les espaces multiples
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        return ' '.join(text.split())
     
-    def _extract_feed_info(self, parsed_feed) -> Dict:
+    @staticmethod
+    def _extract_feed_info(parsed_feed) -> Dict:
         """
         Extraire les informations du flux RSS
         """
@@ -273,25 +699,124 @@ class RSSParser:
         
         if hasattr(parsed_feed, 'feed'):
             feed = parsed_feed.feed
+            
+            # Liens <link rel="hub"> et <link rel="self"> (découverte WebSub)
+            links = {}
+            for link in getattr(feed, 'links', []):
+                if link.get('href'):
+                    links.setdefault(link.get('rel'), link['href'])
+            
             feed_info = {
                 'title': getattr(feed, 'title', ''),
                 'description': getattr(feed, 'description', ''),
                 'link': getattr(feed, 'link', ''),
                 'language': getattr(feed, 'language', ''),
-                'last_build_date': getattr(feed, 'updated', '')
+                'last_build_date': getattr(feed, 'updated', ''),
+                'hub': links.get('hub', ''),
+                'self': links.get('self', '')
             }
         
         return feed_info
     
-    def _update_feed_status(self, db: Session, feed: RSSFeed, status: str, error_message: Optional[str]):
+    @staticmethod
+    def _update_source_info(source: FeedSource, feed_info: Dict):
+        """
+        Reporter sur la source les métadonnées annoncées par le flux
+        """
+        if feed_info.get('title'):
+            source.title = feed_info['title'][:200]
+        if feed_info.get('description'):
+            source.description = feed_info['description']
+        if feed_info.get('link'):
+            source.site_url = feed_info['link'][:500]
+        
+        # Nouveau hub WebSub (ou nouveau topic) : un abonnement sera demandé
+        if feed_info.get('hub'):
+            hub = feed_info['hub'][:500]
+            topic = (feed_info.get('self') or source.url)[:500]
+            if hub != source.websub_hub or topic != source.websub_topic:
+                source.websub_hub = hub
+                source.websub_topic = topic
+                source.websub_status = None
+                source.websub_expires_at = None
+    
+    def _update_feed_status(self, db: Session, source: FeedSource, status: str, error_message: Optional[str],
+                            retry_at: Optional[datetime] = None):
         """
-        Mettre à jour le statut d'un flux RSS
+        Mettre à jour le statut d'une source (visible par tous ses abonnements),
+        sans la récupérer avant retry_at si le serveur l'a demandé
         """
-        feed.last_updated = datetime.utcnow()
-        feed.last_fetch_status = status
-        feed.error_message = error_message
+        source.last_updated = datetime.utcnow()
+        source.last_fetch_status = status
+        source.error_message = error_message
+        if status == 'success':
+            source.consecutive_failures = 0
+        reschedule_source(db, source)
+        if retry_at and (source.next_fetch_at is None or source.next_fetch_at < retry_at):
+            source.next_fetch_at = retry_at
         
         db.commit()
+        cache.bump_source(db, source.id)
+
+class GuidCache:
+    """Cache LRU borné des GUID récemment vus, par source"""
+    
+    def __init__(self, max_feeds: int, max_guids_per_feed: int):
+        self.max_feeds = max_feeds
+        self.max_guids_per_feed = max_guids_per_feed
+        self._feeds: "OrderedDict[int, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, db: Session, source_id: int) -> set:
+        """
+        Obtenir les GUID connus d'une source (chargés depuis la base au premier accès)
+        """
+        with self._lock:
+            guids = self._feeds.get(source_id)
+            if guids is not None:
+                self._feeds.move_to_end(source_id)
+                return set(guids)
+        
+        rows = db.query(Article.guid).filter(
+            Article.source_id == source_id
+        ).order_by(Article.id.desc()).limit(self.max_guids_per_feed).all()
+        
+        guids = [row.guid for row in reversed(rows)]
+        with self._lock:
+            self._feeds[source_id] = guids
+            self._feeds.move_to_end(source_id)
+            self._evict()
+        return set(guids)
+    
+    def add(self, source_id: int, guids: List[str]):
+        """
+        Ajouter des GUID à une source en ne conservant que les plus récents
+        """
+        if not guids:
+            return
+        with self._lock:
+            current = self._feeds.get(source_id)
+            if current is None:
+                return
+            self._feeds[source_id] = (current + guids)[-self.max_guids_per_feed:]
+            self._feeds.move_to_end(source_id)
+    
+    def _evict(self):
+        """
+        Retirer les flux les moins récemment utilisés au-delà de la limite
+        """
+        while len(self._feeds) > self.max_feeds:
+            self._feeds.popitem(last=False)
+    
+    def invalidate(self, source_id: int):
+        """
+        Oublier les GUID d'une source
+        """
+        with self._lock:
+            self._feeds.pop(source_id, None)
+
+
+guid_cache = GuidCache(settings.FEED_GUID_CACHE_FEEDS, settings.FEED_GUID_CACHE_SIZE)
 
 # Fonctions utilitaires
 def update_feed(feed_id: int) -> Dict:
@@ -0,0 +1,128 @@
+# scheduler.py - Tâches de fond périodiques
+from typing import Callable, List
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Tâche exécutée à intervalle régulier dans un thread dédié"""
+    
+    def __init__(self, name: str, func: Callable, interval_seconds: int):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """
+        Démarrer la tâche (de nouveau possible après un arrêt)
+        """
+        # Événement propre à chaque démarrage : un thread précédent encore
+        # dans son exécution en cours ne reprend pas après son arrêt
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop_event,), name=self.name, daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 10):
+        """
+        Arrêter la tâche (attend la fin de l'exécution en cours)
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def _run(self, stop_event: threading.Event):
+        while not stop_event.wait(self.interval_seconds):
+            try:
+                self.func()
+            except Exception as e:
+                logger.error(f"Erreur dans la tâche {self.name}: {str(e)}")
+
+
+class Scheduler:
+    """
+    Ensemble de tâches périodiques démarrées avec l'application.
+    Avec un verrou, seul le worker qui le détient exécute les tâches ; les
+    autres retentent régulièrement pour prendre le relais si le leader disparaît.
+    Le leader vérifie aussi régulièrement qu'il détient toujours le verrou
+    (connexion perdue) et arrête ses tâches sinon.
+    """
+    
+    def __init__(self, lock=None, retry_seconds: int = 30):
+        self.jobs: List[PeriodicJob] = []
+        self.lock = lock
+        self.retry_seconds = retry_seconds
+        self._stop_event = threading.Event()
+        self._election_thread = None
+        self._running = False
+    
+    def add_job(self, name: str, func: Callable, interval_seconds: int):
+        """
+        Enregistrer une tâche périodique
+        """
+        self.jobs.append(PeriodicJob(name, func, interval_seconds))
+    
+    def start(self):
+        """
+        Démarrer toutes les tâches (ou l'élection du leader si un verrou est fourni)
+        """
+        if not self.jobs:
+            return
+        
+        if self.lock is None:
+            self._start_jobs()
+            return
+        
+        self._election_thread = threading.Thread(
+            target=self._run_election, name="scheduler-election", daemon=True
+        )
+        self._election_thread.start()
+    
+    def shutdown(self):
+        """
+        Arrêter toutes les tâches
+        """
+        self._stop_event.set()
+        if self._election_thread is not None:
+            self._election_thread.join(self.retry_seconds)
+        
+        self._stop_jobs()
+        
+        if self.lock is not None:
+            try:
+                self.lock.release()
+            except Exception as e:
+                logger.error(f"Erreur lors de la libération du verrou du planificateur: {str(e)}")
+    
+    def _start_jobs(self):
+        for job in self.jobs:
+            logger.info(f"Démarrage de la tâche {job.name} (toutes les {job.interval_seconds}s)")
+            job.start()
+        self._running = True
+    
+    def _stop_jobs(self):
+        if not self._running:
+            return
+        for job in self.jobs:
+            job.stop()
+        self._running = False
+    
+    def _run_election(self):
+        while not self._stop_event.is_set():
+            try:
+                if self._running:
+                    if not self.lock.is_held():
+                        logger.warning(f"Worker {os.getpid()}: verrou du planificateur perdu, arrêt des tâches de fond")
+                        self._stop_jobs()
+                        continue
+                elif self.lock.try_acquire():
+                    logger.info(f"Worker {os.getpid()} élu pour exécuter les tâches de fond")
+                    self._start_jobs()
+            except Exception as e:
+                logger.error(f"Erreur lors de l'acquisition du verrou du planificateur: {str(e)}")
+            
+            self._stop_event.wait(self.retry_seconds)
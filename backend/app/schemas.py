@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -72,10 +72,25 @@ class CollectionCreate(CollectionBase):
 class CollectionUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = None
+    retention_days: Optional[int] = Field(None, ge=1)
+    retention_max_articles: Optional[int] = Field(None, ge=1)
+    retention_keep_favorites: Optional[bool] = None
+    retention_keep_commented: Optional[bool] = None
+    
+    @validator('retention_keep_favorites', 'retention_keep_commented')
+    def validate_retention_flags(cls, v):
+        # Omis : inchangé ; null n'a pas de sens (colonnes NOT NULL)
+        if v is None:
+            raise ValueError('Valeur booléenne attendue')
+        return v
 
 class CollectionResponse(CollectionBase):
     id: int
     owner_id: int
+    retention_days: Optional[int] = None
+    retention_max_articles: Optional[int] = None
+    retention_keep_favorites: bool = True
+    retention_keep_commented: bool = True
     created_at: datetime
     updated_at: datetime
     
@@ -104,10 +119,14 @@ class RSSFeedUpdate(BaseModel):
     description: Optional[str] = None
     update_frequency: Optional[int] = Field(None, ge=15, le=1440)
     is_active: Optional[bool] = None
+    retention_days: Optional[int] = Field(None, ge=1)
+    retention_max_articles: Optional[int] = Field(None, ge=1)
 
 class RSSFeedResponse(RSSFeedBase):
     id: int
     collection_id: int
+    retention_days: Optional[int] = None
+    retention_max_articles: Optional[int] = None
     last_updated: Optional[datetime] = None
     last_fetch_status: str = "pending"
     error_message: Optional[str] = None
@@ -118,6 +137,26 @@ class RSSFeedResponse(RSSFeedBase):
     class Config:
         from_attributes = True    
         
+class FeedHealthEventResponse(BaseModel):
+    event: str
+    detail: Optional[str] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class FeedHealthResponse(BaseModel):
+    feed_id: int
+    title: str
+    url: str
+    is_active: bool
+    last_fetch_status: str = "pending"
+    error_message: Optional[str] = None
+    consecutive_failures: int = 0
+    last_updated: Optional[datetime] = None
+    next_fetch_at: Optional[datetime] = None
+    events: List[FeedHealthEventResponse] = []
+
 
 class ArticleBase(BaseModel):
     title: str = Field(..., max_length=300)
@@ -141,6 +180,20 @@ class ArticleResponse(ArticleBase):
         from_attributes = True
 
 
+class ArticleListItem(BaseModel):
+    """Projection légère utilisée par les listes d'articles (sans contenu complet)"""
+    id: int
+    feed_id: Optional[int] = None
+    title: Optional[str] = None
+    link: Optional[str] = None
+    description: Optional[str] = None
+    author: Optional[str] = None
+    published_date: Optional[datetime] = None
+    fetched_at: Optional[datetime] = None
+    is_read: Optional[bool] = None
+    is_favorite: Optional[bool] = None
+
+
 class UserArticleUpdate(BaseModel):
     is_read: Optional[bool] = None
     is_favorite: Optional[bool] = None
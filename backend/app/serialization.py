@@ -0,0 +1,33 @@
+# serialization.py - Sérialisation JSON rapide des réponses (orjson)
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+import orjson
+
+
+def _default(value: Any) -> Any:
+    """Types non gérés nativement par orjson"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type non sérialisable: {type(value).__name__}")
+
+
+def dumps(value: Any, indent: bool = False) -> bytes:
+    """
+    Sérialiser en JSON (UTF-8) sans passer par jsonable_encoder
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(value, default=_default, option=option)
+
+
+class TrustedJSONResponse(ORJSONResponse):
+    """
+    Réponse JSON pour des données déjà construites côté serveur (lignes ORM,
+    projections) : renvoyée telle quelle, sans revalidation par response_model
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
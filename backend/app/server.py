@@ -0,0 +1,61 @@
+# server.py - Lancement de l'API en production (python -m app.server)
+from importlib.util import find_spec
+import glob
+import logging
+import os
+
+import uvicorn
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_count() -> int:
+    """
+    Nombre de workers : un par CPU disponible pour ce processus
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    return max(1, cpus)
+
+
+def prepare_metrics_directory(path: str):
+    """
+    Vider le répertoire des métriques multiprocessus : les fichiers d'un
+    lancement précédent fausseraient les compteurs agrégés
+    """
+    os.makedirs(path, exist_ok=True)
+    for stale_file in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale_file)
+
+
+def main():
+    workers = settings.SERVER_WORKERS or default_worker_count()
+    
+    if settings.METRICS_ENABLED:
+        metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+        if metrics_dir:
+            prepare_metrics_directory(metrics_dir)
+        elif workers > 1:
+            # Chaque scrape de /metrics n'atteindrait qu'un worker
+            logger.warning("Métriques propres à chaque worker (définir PROMETHEUS_MULTIPROC_DIR pour les agréger)")
+    
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        reload=False
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
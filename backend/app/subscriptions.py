@@ -0,0 +1,110 @@
+# subscriptions.py - Sources de flux partagées et abonnements des collections
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, exists, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .models import FeedSource, RSSFeed
+from .config import settings
+from .politeness import host_of
+from . import cache
+
+
+# Fréquence par défaut d'un abonnement (minutes)
+DEFAULT_UPDATE_FREQUENCY = 60
+
+
+def get_or_create_source(db: Session, url: str, title: Optional[str] = None,
+                         description: Optional[str] = None, site_url: Optional[str] = None) -> FeedSource:
+    """
+    Obtenir la source d'une URL, en la créant au premier abonnement
+    """
+    source = db.query(FeedSource).filter(FeedSource.url == url).first()
+    if source is not None:
+        return source
+    
+    source = FeedSource(url=url, host=host_of(url), title=title, description=description, site_url=site_url)
+    try:
+        # Point de sauvegarde : un abonnement concurrent a pu créer la source entre-temps
+        with db.begin_nested():
+            db.add(source)
+    except IntegrityError:
+        source = db.query(FeedSource).filter(FeedSource.url == url).one()
+    return source
+
+
+def find_subscription(db: Session, collection_id: int, source_id: int) -> Optional[RSSFeed]:
+    """
+    Abonnement d'une collection à une source, s'il existe
+    """
+    return db.query(RSSFeed).filter(
+        RSSFeed.collection_id == collection_id,
+        RSSFeed.source_id == source_id
+    ).first()
+
+
+def readable_subscription(db: Session, user_id: int, source_id: int) -> Optional[RSSFeed]:
+    """
+    Un abonnement à la source dans une collection lisible par l'utilisateur
+    (None si aucune de ses collections n'y est abonnée)
+    """
+    collection_ids = cache.user_collection_ids(db, user_id)
+    if not collection_ids:
+        return None
+    
+    return db.query(RSSFeed).filter(
+        RSSFeed.source_id == source_id,
+        RSSFeed.collection_id.in_(collection_ids)
+    ).order_by(RSSFeed.id).first()
+
+
+def delete_subscription(db: Session, feed: RSSFeed):
+    """
+    Supprimer un abonnement. Une source laissée sans abonnement n'est plus
+    récupérée ; elle est supprimée avec ses articles, par lots, par
+    retention.purge_orphan_sources
+    """
+    db.delete(feed)
+    db.flush()
+
+
+def has_active_subscription():
+    """
+    Condition SQL : la source a au moins un abonnement actif
+    """
+    return exists().where(
+        and_(RSSFeed.source_id == FeedSource.id, RSSFeed.is_active == True)
+    )
+
+
+def fetch_interval_minutes(db: Session, source_id: int) -> int:
+    """
+    Intervalle de récupération d'une source : la plus courte update_frequency
+    de ses abonnements actifs
+    """
+    interval = db.query(func.min(RSSFeed.update_frequency)).filter(
+        RSSFeed.source_id == source_id,
+        RSSFeed.is_active == True
+    ).scalar()
+    return interval or DEFAULT_UPDATE_FREQUENCY
+
+
+def reschedule_source(db: Session, source: FeedSource):
+    """
+    Recalculer la prochaine récupération d'une source (après une récupération
+    ou un changement de fréquence de ses abonnements)
+    """
+    if source.last_updated is None:
+        source.next_fetch_at = None
+        return
+    
+    interval = fetch_interval_minutes(db, source.id)
+    
+    # Source poussée par un hub WebSub : l'interrogation ne sert plus que de filet de sécurité
+    if (source.websub_status == 'subscribed' and source.websub_expires_at
+            and source.websub_expires_at > datetime.utcnow()):
+        interval = max(interval, settings.WEBSUB_SAFETY_POLL_MINUTES)
+    
+    source.next_fetch_at = source.last_updated + timedelta(minutes=interval)
@@ -0,0 +1,224 @@
+# websub.py - Abonnements push WebSub (PubSubHubbub) aux hubs annoncés par les flux
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import hashlib
+import hmac
+import logging
+import secrets
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from .models import FeedSource
+from .database import SessionLocal
+from .config import settings
+from .leases import claim_source, release_leases, worker_identity
+from .subscriptions import has_active_subscription, reschedule_source
+
+logger = logging.getLogger(__name__)
+
+# Résultats de la réception d'un contenu poussé
+INGESTED = "ingested"
+IGNORED = "ignored"
+UNKNOWN_SOURCE = "unknown_source"
+SOURCE_BUSY = "source_busy"
+
+# Algorithmes acceptés dans X-Hub-Signature
+_SIGNATURE_METHODS = {
+    'sha1': hashlib.sha1,
+    'sha256': hashlib.sha256,
+    'sha384': hashlib.sha384,
+    'sha512': hashlib.sha512,
+}
+
+
+def is_enabled() -> bool:
+    return bool(settings.WEBSUB_CALLBACK_BASE_URL)
+
+
+def callback_url(source_id: int) -> str:
+    """
+    URL de callback donnée au hub pour une source
+    """
+    return f"{settings.WEBSUB_CALLBACK_BASE_URL.rstrip('/')}/websub/callback/{source_id}"
+
+
+def verify_signature(secret: str, content: bytes, signature: Optional[str]) -> bool:
+    """
+    Vérifier l'en-tête X-Hub-Signature (méthode=HMAC hexadécimal du contenu)
+    """
+    if not signature or '=' not in signature:
+        return False
+    
+    method, _, received = signature.partition('=')
+    digest = _SIGNATURE_METHODS.get(method.strip().lower())
+    if digest is None:
+        return False
+    
+    expected = hmac.new(secret.encode('utf-8'), content, digest).hexdigest()
+    return hmac.compare_digest(expected, received.strip().lower())
+
+
+def request_subscription(db: Session, source: FeedSource, mode: str = 'subscribe') -> bool:
+    """
+    Demander au hub un abonnement (ou un désabonnement) pour une source.
+    
+    Le hub confirme ensuite par une requête de vérification sur le callback :
+    l'état "pending" est enregistré avant l'appel, le hub pouvant vérifier
+    avant même de répondre.
+    """
+    # Import différé : les workers de l'API démarrent sans requests
+    import requests
+    
+    subscribing = mode == 'subscribe'
+    if subscribing and not source.websub_secret:
+        source.websub_secret = secrets.token_hex(32)
+    source.websub_status = 'pending' if subscribing else 'unsubscribing'
+    source.websub_expires_at = datetime.utcnow() + timedelta(minutes=settings.WEBSUB_RETRY_MINUTES)
+    db.commit()
+    
+    data = {
+        'hub.mode': mode,
+        'hub.topic': source.websub_topic,
+        'hub.callback': callback_url(source.id),
+    }
+    if subscribing:
+        data['hub.secret'] = source.websub_secret
+        data['hub.lease_seconds'] = str(settings.WEBSUB_LEASE_SECONDS)
+    
+    try:
+        response = requests.post(source.websub_hub, data=data, timeout=30)
+        response.raise_for_status()
+    except Exception as e:
+        logger.warning(f"Requête WebSub refusée par {source.websub_hub} ({source.url}): {str(e)}")
+        db.refresh(source)
+        source.websub_status = 'error'
+        reschedule_source(db, source)
+        db.commit()
+        return False
+    
+    logger.info(f"Requête WebSub {mode} envoyée à {source.websub_hub} pour {source.url}")
+    return True
+
+
+def renew_subscriptions() -> Dict:
+    """
+    Tâche de fond : s'abonner aux hubs découverts, renouveler les baux qui
+    arrivent à échéance et se désabonner des sources sans abonnement actif
+    """
+    results = {'subscribed': 0, 'unsubscribed': 0, 'failed': 0}
+    if not is_enabled():
+        return results
+    
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        renew_before = now + timedelta(seconds=settings.WEBSUB_RENEW_MARGIN_SECONDS)
+        
+        to_subscribe = db.query(FeedSource).filter(
+            FeedSource.websub_hub.isnot(None),
+            has_active_subscription(),
+            or_(
+                FeedSource.websub_status.is_(None),
+                FeedSource.websub_status == 'unsubscribed',
+                and_(FeedSource.websub_status == 'subscribed', FeedSource.websub_expires_at < renew_before),
+                and_(
+                    FeedSource.websub_status.in_(['pending', 'denied', 'error', 'unsubscribing']),
+                    FeedSource.websub_expires_at < now
+                )
+            )
+        ).all()
+        to_unsubscribe = db.query(FeedSource).filter(
+            FeedSource.websub_hub.isnot(None),
+            ~has_active_subscription(),
+            FeedSource.websub_status.in_(['subscribed', 'pending'])
+        ).all()
+        
+        for source in to_subscribe:
+            if request_subscription(db, source, 'subscribe'):
+                results['subscribed'] += 1
+            else:
+                results['failed'] += 1
+        for source in to_unsubscribe:
+            if request_subscription(db, source, 'unsubscribe'):
+                results['unsubscribed'] += 1
+            else:
+                results['failed'] += 1
+        
+        return results
+    finally:
+        db.close()
+
+
+def confirm_intent(db: Session, source_id: int, mode: str, topic: str,
+                   lease_seconds: Optional[int] = None, reason: Optional[str] = None) -> bool:
+    """
+    Répondre à une vérification du hub : True si la demande vient bien de nous
+    (le hub attend alors l'écho du challenge), False sinon
+    """
+    source = db.query(FeedSource).filter(FeedSource.id == source_id).first()
+    if source is None or topic != source.websub_topic:
+        return False
+    
+    if mode == 'denied':
+        logger.warning(f"Abonnement WebSub refusé pour {source.url}: {reason or 'sans motif'}")
+        source.websub_status = 'denied'
+        source.websub_expires_at = datetime.utcnow() + timedelta(minutes=settings.WEBSUB_RETRY_MINUTES)
+        reschedule_source(db, source)
+        db.commit()
+        return True
+    
+    # Seule une demande en cours est confirmée : une vérification rejouée ou
+    # spontanée prolongerait le bail (et suspendrait l'interrogation) à volonté
+    if mode == 'subscribe' and source.websub_status == 'pending':
+        source.websub_status = 'subscribed'
+        source.websub_expires_at = datetime.utcnow() + timedelta(
+            seconds=lease_seconds or settings.WEBSUB_LEASE_SECONDS
+        )
+        reschedule_source(db, source)
+        db.commit()
+        logger.info(f"Abonnement WebSub confirmé pour {source.url}")
+        return True
+    
+    if mode == 'unsubscribe' and source.websub_status == 'unsubscribing':
+        source.websub_status = 'unsubscribed'
+        source.websub_expires_at = None
+        reschedule_source(db, source)
+        db.commit()
+        return True
+    
+    return False
+
+
+def ingest_pushed_content(source_id: int, signature: Optional[str], content: bytes) -> str:
+    """
+    Enregistrer un contenu poussé par le hub, après vérification de sa
+    signature. Les contenus mal signés sont ignorés sans le signaler au hub.
+    """
+    # Import différé : l'API ne charge le parseur qu'à la première réception
+    from .rss_parser import RSSParser
+    
+    db = SessionLocal()
+    try:
+        source = db.query(FeedSource).filter(FeedSource.id == source_id).first()
+        if source is None:
+            return UNKNOWN_SOURCE
+        
+        if not source.websub_secret or not verify_signature(source.websub_secret, content, signature):
+            logger.warning(f"Contenu WebSub à signature invalide ignoré: {source.url}")
+            return IGNORED
+        
+        # Source en cours de récupération par un worker : le hub renverra le contenu
+        owner = worker_identity("websub")
+        if not claim_source(db, owner, source_id):
+            return SOURCE_BUSY
+        
+        try:
+            # Parsing sur place : pas de pool de processus dans les workers de l'API
+            RSSParser(inline_parse=True).process_pushed_content(db, source, content)
+        finally:
+            db.rollback()
+            release_leases(db, owner, [source_id])
+        return INGESTED
+    finally:
+        db.close()
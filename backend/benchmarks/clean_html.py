@@ -0,0 +1,131 @@
+# clean_html.py - Débit de RSSParser._clean_html sur les corps d'articles de vrais flux
+#
+# Usage (depuis backend/) : python -m benchmarks.clean_html [--size Mo] [flux.xml | répertoire ...]
+# Sans argument, les flux de tests/fixtures/feeds sont utilisés ; pour des
+# chiffres représentatifs, passer des flux enregistrés depuis la production.
+# Les corps de chaque flux sont répétés jusqu'à --size Mo (5 par défaut) :
+# débit mesuré flux par flux, sur un volume comparable à un cycle de
+# rafraîchissement.
+#
+# Trois implémentations sont comparées sur les mêmes corps (résumés et contenus) :
+# - "ancienne" : la version à expressions non précompilées et table d'entités ;
+# - "actuelle" : RSSParser._clean_html ;
+# - "lxml" : arbre lxml.html et text_content() (tests/html_reference.py).
+# Le nombre de résultats différents de l'implémentation actuelle est affiché.
+#
+# Mesuré sur les flux de tests/fixtures/feeds, 5 Mo par flux : l'actuelle
+# traite 24 à 39 Mo/s contre 12 à 19 Mo/s pour l'ancienne (1,3 à 3,2 fois
+# plus vite selon le flux) et 11 à 17 Mo/s pour lxml. Le gain attendu de plusieurs fois
+# n'est pas atteint : la construction d'un arbre coûte plus que les deux
+# expressions précompilées, et la réduction des espaces (split/join), que
+# tout parseur doit aussi faire, domine le temps sur les longs corps.
+from pathlib import Path
+import argparse
+import math
+import re
+import sys
+import time
+
+import feedparser
+
+from app.rss_parser import RSSParser
+from tests.html_reference import lxml_clean_html
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "feeds"
+
+
+def previous_clean_html(text: str) -> str:
+    """
+    Implémentation remplacée, conservée comme référence de débit
+    """
+    if not text:
+        return ''
+    text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
+    text = re.sub(r'<[^>]+>', '', text)
+    html_entities = {
+        '&amp;': '&', '&lt;': '<', '&gt;': '>', '&quot;': '"', '&#39;': "'", '&nbsp;': ' '
+    }
+    for entity, char in html_entities.items():
+        text = text.replace(entity, char)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def feed_files(paths) -> list:
+    """
+    Fichiers de flux indiqués, ou contenus dans les répertoires indiqués
+    """
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob("*.xml")) if path.is_dir() else [path])
+    return files
+
+
+def load_bodies(path: Path) -> list:
+    """
+    Résumés et contenus HTML des entrées d'un flux
+    """
+    bodies = []
+    for entry in feedparser.parse(path.read_bytes()).entries:
+        if entry.get('summary'):
+            bodies.append(entry.summary)
+        if entry.get('content'):
+            bodies.append(entry.content[0].value)
+    return bodies
+
+
+def corpus_size(bodies: list) -> float:
+    """
+    Taille des corps en Mo (UTF-8)
+    """
+    return sum(len(body.encode('utf-8')) for body in bodies) / 1e6
+
+
+def throughput(clean, bodies: list, repeat: int) -> float:
+    """
+    Meilleur débit (Mo/s) sur plusieurs passes
+    """
+    size = corpus_size(bodies)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for body in bodies:
+            clean(body)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None or elapsed < best else best
+    return size / best
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("paths", nargs="*", default=[str(DEFAULT_CORPUS)])
+    arg_parser.add_argument("--size", type=float, default=5.0, help="Mo de corps par flux")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv)
+    
+    implementations = [
+        ("ancienne", previous_clean_html),
+        ("actuelle", RSSParser._clean_html),
+        ("lxml", lxml_clean_html),
+    ]
+    measured = 0
+    for path in feed_files(args.paths):
+        bodies = load_bodies(path)
+        if not bodies:
+            continue
+        bodies = bodies * max(1, math.ceil(args.size / corpus_size(bodies)))
+        print(f"{path.name} : {len(bodies)} corps, {corpus_size(bodies):.1f} Mo")
+        
+        reference = [RSSParser._clean_html(body) for body in bodies]
+        for name, clean in implementations:
+            rate = throughput(clean, bodies, args.repeat)
+            differences = sum(clean(body) != expected for body, expected in zip(bodies, reference))
+            print(f"{name:>11} : {rate:6.1f} Mo/s, {differences} résultats différents")
+        measured += 1
+    
+    if not measured:
+        sys.exit("Aucun corps d'article trouvé")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# parse_feeds.py - Articles parsés par seconde, avec et sans le parseur lxml
+#
+# Usage (depuis backend/) : python -m benchmarks.parse_feeds [flux.xml | répertoire ...]
+# Sans argument, les flux de tests/fixtures/feeds sont utilisés ; pour des
+# chiffres représentatifs, passer des flux enregistrés depuis la production.
+#
+# Mesure parse_feed_content en entier (parsing et extraction des articles),
+# sur un seul cœur, avec FEED_FAST_PARSER désactivé puis activé. La part des
+# flux pris en charge par lxml est affichée : les autres repassent par feedparser.
+import argparse
+import sys
+import time
+
+from app import rss_parser
+from app.config import settings
+from benchmarks.clean_html import DEFAULT_CORPUS, feed_files
+
+
+def entries_per_second(contents: list, repeat: int) -> tuple:
+    """
+    Meilleur débit (articles/s) sur plusieurs passes, et nombre de flux
+    parsés par lxml
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [rss_parser.parse_feed_content(content) for content in contents]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None or elapsed < best else best
+    
+    total = sum(result['total_entries'] for result in results)
+    fast = sum(result['parser'] == 'lxml' for result in results)
+    return total / best, fast
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("paths", nargs="*", default=[str(DEFAULT_CORPUS)])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args(argv)
+    
+    contents = [path.read_bytes() for path in feed_files(args.paths)]
+    if not contents:
+        sys.exit("Aucun flux trouvé")
+    print(f"{len(contents)} flux")
+    
+    rates = {}
+    for enabled in (False, True):
+        settings.FEED_FAST_PARSER = enabled
+        rates[enabled], fast = entries_per_second(contents, args.repeat)
+        name = "lxml" if enabled else "feedparser"
+        print(f"{name:>10} : {rates[enabled]:8.0f} articles/s, {fast}/{len(contents)} flux parsés par lxml")
+    print(f"Gain : x{rates[True] / rates[False]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
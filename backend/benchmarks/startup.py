@@ -0,0 +1,68 @@
+# startup.py - Démarrage à froid d'un worker de l'API (import de app.main)
+#
+# Usage (depuis backend/) : python -m benchmarks.startup [--repeat N] [--budget secondes]
+#
+# Chaque mesure lance un interpréteur neuf (python -c "import app.main") et
+# retient le meilleur temps sur plusieurs lancements, diminué du temps d'un
+# interpréteur vide. Pour comparaison, le même import est mesuré avec les
+# dépendances de récupération que l'API ne charge qu'à la première
+# utilisation (voir tests/test_startup.py). Le script échoue si l'import de
+# app.main dépasse le budget.
+#
+# Mesuré ici (meilleur de 5) : 1,0 à 1,2 s pour app.main, 0,2 à 0,3 s de
+# plus avec les modules différés. L'essentiel vient de FastAPI et pydantic
+# (fastapi.openapi.models seul : 0,4 s, voir python -X importtime).
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget de l'import de app.main (secondes, hors démarrage de l'interpréteur)
+STARTUP_BUDGET_SECONDS = 1.5
+
+STATEMENTS = [
+    ("interpréteur", "pass"),
+    ("app.main", "import app.main"),
+    ("avec modules différés", "import app.main, app.rss_parser, authlib, httpx"),
+]
+
+
+def cold_start_seconds(statement: str, repeat: int) -> float:
+    """
+    Meilleur temps d'exécution de l'instruction dans un interpréteur neuf
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", statement], check=True,
+            cwd=BACKEND_DIR, env=dict(os.environ)
+        )
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None or elapsed < best else best
+    return best
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS)
+    args = arg_parser.parse_args(argv)
+    
+    timings = {name: cold_start_seconds(statement, args.repeat) for name, statement in STATEMENTS}
+    baseline = timings.pop("interpréteur")
+    print(f"{'interpréteur':>22} : {baseline:.3f} s")
+    for name, seconds in timings.items():
+        print(f"{name:>22} : +{seconds - baseline:.3f} s")
+    
+    import_seconds = timings["app.main"] - baseline
+    if import_seconds > args.budget:
+        sys.exit(f"Import de app.main : {import_seconds:.3f} s, au-delà du budget de {args.budget:.1f} s")
+    print(f"Budget respecté ({args.budget:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# env.py - Environnement d'exécution des migrations Alembic
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine, pool
+from alembic import context
+
+from app.database import DATABASE_URL, Base
+from app import models  # noqa: F401 - enregistre les tables dans Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Générer le SQL des migrations sans connexion à la base"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Appliquer les migrations sur la base configurée"""
+    connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+    
+    with connectable.connect() as connection:
+        # Une transaction par révision : une révision en échec n'annule pas
+        # les précédentes, déjà validées par les blocs autocommit
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+        )
+        
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
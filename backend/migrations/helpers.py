@@ -0,0 +1,103 @@
+# helpers.py - Opérations de migration compatibles avec une base en production
+#
+# Règles pour les futures migrations :
+# - ajouter les colonnes en nullable (ou avec un server_default constant),
+#   remplir les données par lots, puis poser la contrainte NOT NULL ;
+# - créer et supprimer les index avec les fonctions ci-dessous, qui utilisent
+#   CONCURRENTLY sous PostgreSQL et ne verrouillent pas les écritures ;
+# - une révision par étape : DDL (dans la transaction de la révision),
+#   remplissage par lots, puis index concurrents. Les deux dernières étapes
+#   valident au fil de l'eau : elles doivent rester idempotentes pour que la
+#   révision puisse être relancée après un échec ;
+# - ajouter ou remplacer une clé étrangère avec add_foreign_key ou
+#   replace_foreign_key (NOT VALID puis VALIDATE sous PostgreSQL, sans
+#   parcours de table sous verrou exclusif).
+from typing import List, Optional
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def create_index_concurrently(name: str, table: str, columns: List, unique: bool = False,
+                              include: Optional[List[str]] = None, where: Optional[str] = None) -> None:
+    """Créer un index sans bloquer les écritures (idempotent)"""
+    options = {}
+    if include:
+        options['postgresql_include'] = include
+    if where:
+        options['postgresql_where'] = sa.text(where)
+    
+    with op.get_context().autocommit_block():
+        op.create_index(
+            name, table, columns, unique=unique,
+            postgresql_concurrently=True, if_not_exists=True, **options
+        )
+
+
+def drop_index_concurrently(name: str, table: str) -> None:
+    """Supprimer un index sans bloquer les écritures (idempotent)"""
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def backfill_in_batches(table: str, set_clause: str, where: str, batch_size: int = 1000) -> None:
+    """
+    Mettre à jour une grosse table par lots courts, chacun validé aussitôt
+    (hors transaction) pour ne pas garder les verrous jusqu'à la fin.
+    La condition where doit exclure les lignes déjà traitées.
+    """
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        while True:
+            result = connection.execute(sa.text(
+                f"UPDATE {table} SET {set_clause} WHERE id IN "
+                f"(SELECT id FROM {table} WHERE {where} LIMIT :batch_size)"
+            ), {"batch_size": batch_size})
+            if result.rowcount < batch_size:
+                break
+
+
+def _add_foreign_key_not_valid(table: str, column: str, referred_table: str, ondelete: Optional[str],
+                               referred_column: str = 'id') -> None:
+    """PostgreSQL : contrainte posée NOT VALID puis validée sans verrou exclusif"""
+    name = f"{table}_{column}_fkey"
+    on_delete = f" ON DELETE {ondelete}" if ondelete else ""
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+        f"REFERENCES {referred_table} ({referred_column}){on_delete} NOT VALID"
+    )
+    op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def add_foreign_key(table: str, column: str, referred_table: str, ondelete: Optional[str] = None,
+                    referred_column: str = 'id') -> None:
+    """
+    Ajouter la clé étrangère <table>_<column>_fkey sur une colonne existante
+    """
+    if op.get_bind().dialect.name == 'postgresql':
+        _add_foreign_key_not_valid(table, column, referred_table, ondelete, referred_column)
+        return
+    
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.create_foreign_key(
+            f"{table}_{column}_fkey", referred_table, [column], [referred_column], ondelete=ondelete
+        )
+
+
+def replace_foreign_key(table: str, column: str, referred_table: str, ondelete: Optional[str] = None) -> None:
+    """
+    Recréer la clé étrangère <table>_<column>_fkey (nom par défaut de
+    PostgreSQL) avec une nouvelle clause ON DELETE
+    """
+    name = f"{table}_{column}_fkey"
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        _add_foreign_key_not_valid(table, column, referred_table, ondelete)
+        return
+    
+    # Autres bases (SQLite en développement) : table recréée par Alembic ;
+    # la convention de nommage donne un nom aux clés étrangères anonymes
+    with op.batch_alter_table(table, naming_convention={"fk": "%(table_name)s_%(column_0_name)s_fkey"}) as batch_op:
+        batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(name, referred_table, [column], ['id'], ondelete=ondelete)
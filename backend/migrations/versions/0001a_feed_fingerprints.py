@@ -0,0 +1,32 @@
+"""feed fingerprints
+
+Empreintes SHA-256 du dernier contenu récupéré et de la liste des
+identifiants d'articles de chaque flux : un flux inchangé n'est ni parsé
+ni dédupliqué.
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-19 09:04:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001a'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rss_feeds', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('rss_feeds', sa.Column('entries_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('rss_feeds', 'entries_hash')
+    op.drop_column('rss_feeds', 'content_hash')
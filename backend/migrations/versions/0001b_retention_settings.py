@@ -0,0 +1,45 @@
+"""retention settings
+
+Paramètres de rétention des articles par collection et par flux (durée,
+nombre maximal, conservation des favoris et des articles commentés).
+
+Revision ID: 0001b
+Revises: 0001a
+Create Date: 2026-10-19 09:07:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001b'
+down_revision: Union[str, None] = '0001a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rss_feeds', sa.Column('retention_days', sa.Integer(), nullable=True))
+    op.add_column('rss_feeds', sa.Column('retention_max_articles', sa.Integer(), nullable=True))
+    
+    op.add_column('collections', sa.Column('retention_days', sa.Integer(), nullable=True))
+    op.add_column('collections', sa.Column('retention_max_articles', sa.Integer(), nullable=True))
+    op.add_column('collections', sa.Column(
+        'retention_keep_favorites', sa.Boolean(), server_default=sa.true(), nullable=True
+    ))
+    op.add_column('collections', sa.Column(
+        'retention_keep_commented', sa.Boolean(), server_default=sa.true(), nullable=True
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column('collections', 'retention_keep_commented')
+    op.drop_column('collections', 'retention_keep_favorites')
+    op.drop_column('collections', 'retention_max_articles')
+    op.drop_column('collections', 'retention_days')
+    
+    op.drop_column('rss_feeds', 'retention_max_articles')
+    op.drop_column('rss_feeds', 'retention_days')
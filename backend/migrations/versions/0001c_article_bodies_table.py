@@ -0,0 +1,39 @@
+"""article bodies: table
+
+Déplacement du contenu complet des articles vers la table article_bodies
+(adressée par empreinte SHA-256) : un même texte n'est stocké qu'une fois.
+Première étape (DDL) : table et colonne articles.body_hash encore vide ; le
+contenu est copié par 0001d, l'ancienne colonne retirée par 0002.
+
+Revision ID: 0001c
+Revises: 0001b
+Create Date: 2026-10-19 09:08:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001c'
+down_revision: Union[str, None] = '0001b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('article_bodies',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('hash')
+    )
+    op.add_column('articles', sa.Column('body_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('articles') as batch_op:
+        batch_op.drop_column('body_hash')
+    op.drop_table('article_bodies')
@@ -0,0 +1,89 @@
+"""article bodies: copy
+
+Copie du contenu des articles dans article_bodies, par lots validés un à un
+(hors transaction) : pas de verrou tenu sur toute la table articles.
+Relançable : seuls les articles sans empreinte sont traités.
+
+Revision ID: 0001d
+Revises: 0001c
+Create Date: 2026-10-19 09:09:00.000000
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001d'
+down_revision: Union[str, None] = '0001c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 1000
+
+
+def _copy_bodies_in_postgresql(connection) -> None:
+    """
+    Remplir article_bodies par tranches d'identifiants : empreinte calculée
+    en SQL, chaque instruction ne touche que BATCH_SIZE articles
+    """
+    max_id = connection.execute(sa.text("SELECT max(id) FROM articles")).scalar() or 0
+    for first_id in range(1, max_id + 1, BATCH_SIZE):
+        connection.execute(sa.text(
+            "WITH batch AS ("
+            "  UPDATE articles SET body_hash = encode(sha256(convert_to(content, 'UTF8')), 'hex') "
+            "  WHERE id BETWEEN :first_id AND :last_id AND body_hash IS NULL "
+            "  AND content IS NOT NULL AND content != '' "
+            "  RETURNING body_hash, content"
+            ") "
+            "INSERT INTO article_bodies (hash, content, created_at) "
+            "SELECT DISTINCT ON (body_hash) body_hash, content, now() FROM batch "
+            "ON CONFLICT (hash) DO NOTHING"
+        ), {"first_id": first_id, "last_id": first_id + BATCH_SIZE - 1})
+
+
+def _copy_bodies_in_python(connection) -> None:
+    """Remplir article_bodies par lots (bases sans fonction sha256 en SQL)"""
+    last_id = 0
+    while True:
+        rows = connection.execute(sa.text(
+            "SELECT id, content FROM articles "
+            "WHERE id > :last_id AND body_hash IS NULL AND content IS NOT NULL AND content != '' "
+            "ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        
+        for article_id, content in rows:
+            body_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            exists = connection.execute(sa.text(
+                "SELECT 1 FROM article_bodies WHERE hash = :hash"
+            ), {"hash": body_hash}).first()
+            if not exists:
+                connection.execute(sa.text(
+                    "INSERT INTO article_bodies (hash, content, created_at) "
+                    "VALUES (:hash, :content, CURRENT_TIMESTAMP)"
+                ), {"hash": body_hash, "content": content})
+            connection.execute(sa.text(
+                "UPDATE articles SET body_hash = :hash WHERE id = :id"
+            ), {"hash": body_hash, "id": article_id})
+        
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        if connection.dialect.name == 'postgresql':
+            _copy_bodies_in_postgresql(connection)
+        else:
+            _copy_bodies_in_python(connection)
+
+
+def downgrade() -> None:
+    # Empreintes et table retirées par la descente de 0001c
+    pass
@@ -0,0 +1,41 @@
+"""article bodies
+
+Dernière étape du déplacement du contenu des articles vers article_bodies
+(voir 0001c) : clé étrangère sur l'empreinte, ancienne colonne
+articles.content retirée.
+
+Revision ID: 0002
+Revises: 0001d
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_foreign_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NOT VALID puis VALIDATE sous PostgreSQL : pas de parcours sous verrou exclusif
+    add_foreign_key('articles', 'body_hash', 'article_bodies', referred_column='hash')
+    with op.batch_alter_table('articles') as batch_op:
+        batch_op.drop_column('content')
+
+
+def downgrade() -> None:
+    op.add_column('articles', sa.Column('content', sa.Text(), nullable=True))
+    op.execute(
+        "UPDATE articles SET content = "
+        "(SELECT content FROM article_bodies WHERE article_bodies.hash = articles.body_hash)"
+    )
+    with op.batch_alter_table('articles') as batch_op:
+        batch_op.drop_constraint('articles_body_hash_fkey', type_='foreignkey')
@@ -0,0 +1,44 @@
+"""query indexes
+
+Index composites alignés sur les requêtes des routers et de l'import RSS.
+Sous PostgreSQL, ils sont créés avec CREATE INDEX CONCURRENTLY (hors
+transaction) pour ne pas bloquer les écritures sur les grosses tables.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_articles_feed_published', 'articles', ['feed_id', sa.text('published_date DESC')], None),
+    ('ix_articles_feed_guid', 'articles', ['feed_id', 'guid'], None),
+    ('ix_user_articles_user_article', 'user_articles', ['user_id', 'article_id'], ['is_read', 'is_favorite']),
+    ('ix_user_collections_user_collection', 'user_collections', ['user_id', 'collection_id'], None),
+    ('ix_rss_feeds_collection_id', 'rss_feeds', ['collection_id'], None),
+    ('ix_messages_collection_created', 'messages', ['collection_id', sa.text('created_at DESC')], None),
+    ('ix_comments_article_created', 'comments', ['article_id', sa.text('created_at DESC')], None),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, include in INDEXES:
+        create_index_concurrently(name, table, columns, include=include)
+
+
+def downgrade() -> None:
+    for name, table, columns, include in reversed(INDEXES):
+        drop_index_concurrently(name, table)
@@ -0,0 +1,43 @@
+"""cascade deletes
+
+Clés étrangères ON DELETE CASCADE entre collections, flux, articles et
+leurs lignes dépendantes : la suppression d'un flux ou d'une collection est
+faite par la base en une instruction, sans charger les enfants dans l'ORM.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from migrations.helpers import replace_foreign_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CASCADE_FOREIGN_KEYS = [
+    ('rss_feeds', 'collection_id', 'collections'),
+    ('user_collections', 'collection_id', 'collections'),
+    ('messages', 'collection_id', 'collections'),
+    ('comments', 'collection_id', 'collections'),
+    ('comments', 'article_id', 'articles'),
+    ('articles', 'feed_id', 'rss_feeds'),
+    ('feed_categories', 'feed_id', 'rss_feeds'),
+    ('user_articles', 'article_id', 'articles'),
+]
+
+
+def upgrade() -> None:
+    for table, column, referred_table in CASCADE_FOREIGN_KEYS:
+        replace_foreign_key(table, column, referred_table, ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    for table, column, referred_table in reversed(CASCADE_FOREIGN_KEYS):
+        replace_foreign_key(table, column, referred_table)
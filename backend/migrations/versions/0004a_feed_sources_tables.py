@@ -0,0 +1,75 @@
+"""feed sources: tables
+
+Séparation entre les sources (feed_sources : une ligne par URL, récupérée
+une seule fois, articles stockés une seule fois) et les abonnements des
+collections (rss_feeds : titre, fréquence, rétention, auteur de l'ajout).
+
+Première étape (DDL, dans la transaction de la révision) : table des
+sources, une source par flux existant avec le même identifiant, et colonnes
+source_id encore vides. Les étapes suivantes (0004b à 0005) remplissent ces
+colonnes par lots, posent les contraintes, créent les index puis retirent
+l'ancienne colonne articles.feed_id.
+
+Revision ID: 0004a
+Revises: 0004
+Create Date: 2026-10-19 19:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004a'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('feed_sources',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('site_url', sa.String(length=500), nullable=True),
+    sa.Column('last_updated', sa.DateTime(), nullable=True),
+    sa.Column('last_fetch_status', sa.String(length=20), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('content_hash', sa.String(length=64), nullable=True),
+    sa.Column('entries_hash', sa.String(length=64), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('url')
+    )
+    op.create_index(op.f('ix_feed_sources_id'), 'feed_sources', ['id'], unique=False)
+    
+    # Les URL étaient uniques : une source par flux, avec le même identifiant
+    # (rss_feeds reste petite : copie directe)
+    op.execute(
+        "INSERT INTO feed_sources (id, url, title, description, site_url, last_updated, "
+        "last_fetch_status, error_message, content_hash, entries_hash, created_at, updated_at) "
+        "SELECT id, url, title, description, site_url, last_updated, last_fetch_status, "
+        "error_message, content_hash, entries_hash, created_at, updated_at FROM rss_feeds"
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "SELECT setval(pg_get_serial_sequence('feed_sources', 'id'), "
+            "COALESCE((SELECT MAX(id) FROM feed_sources), 0) + 1, false)"
+        )
+    
+    op.add_column('rss_feeds', sa.Column('source_id', sa.Integer(), nullable=True))
+    op.add_column('articles', sa.Column('source_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('articles') as batch_op:
+        batch_op.drop_column('source_id')
+    with op.batch_alter_table('rss_feeds') as batch_op:
+        batch_op.drop_column('source_id')
+    
+    op.drop_index(op.f('ix_feed_sources_id'), table_name='feed_sources')
+    op.drop_table('feed_sources')
@@ -0,0 +1,31 @@
+"""feed sources: backfill
+
+Remplissage de rss_feeds.source_id et articles.source_id par lots validés
+un à un (hors transaction) : pas de verrou tenu sur toute la table
+articles. Relançable : seules les lignes encore vides sont traitées.
+
+Revision ID: 0004b
+Revises: 0004a
+Create Date: 2026-10-19 19:31:00.000000
+
+"""
+from typing import Sequence, Union
+
+from migrations.helpers import backfill_in_batches
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004b'
+down_revision: Union[str, None] = '0004a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    backfill_in_batches('rss_feeds', 'source_id = id', 'source_id IS NULL')
+    backfill_in_batches('articles', 'source_id = feed_id', 'source_id IS NULL AND feed_id IS NOT NULL')
+
+
+def downgrade() -> None:
+    # Colonnes retirées par la descente de 0004a
+    pass
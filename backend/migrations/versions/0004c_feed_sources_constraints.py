@@ -0,0 +1,83 @@
+"""feed sources: constraints
+
+Contraintes des sources et retrait des colonnes déplacées de rss_feeds
+vers feed_sources (DDL, dans la transaction de la révision).
+
+Revision ID: 0004c
+Revises: 0004b
+Create Date: 2026-10-19 19:32:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_foreign_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004c'
+down_revision: Union[str, None] = '0004b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Colonnes déplacées de rss_feeds vers feed_sources
+SOURCE_COLUMNS = [
+    ('url', sa.String(length=500)),
+    ('last_updated', sa.DateTime()),
+    ('last_fetch_status', sa.String(length=20)),
+    ('error_message', sa.Text()),
+    ('content_hash', sa.String(length=64)),
+    ('entries_hash', sa.String(length=64)),
+]
+
+# Noms par défaut de PostgreSQL, donnés aussi aux contraintes anonymes sous SQLite
+NAMING_CONVENTION = {
+    "fk": "%(table_name)s_%(column_0_name)s_fkey",
+    "uq": "%(table_name)s_%(column_0_name)s_key",
+}
+
+
+def upgrade() -> None:
+    # rss_feeds reste petite : contraintes posées directement
+    with op.batch_alter_table('rss_feeds', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.alter_column('source_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key(
+            'rss_feeds_source_id_fkey', 'feed_sources', ['source_id'], ['id'], ondelete='CASCADE'
+        )
+        batch_op.create_unique_constraint('uq_rss_feeds_collection_source', ['collection_id', 'source_id'])
+        batch_op.drop_constraint('rss_feeds_url_key', type_='unique')
+        for column, _ in SOURCE_COLUMNS:
+            batch_op.drop_column(column)
+    
+    add_foreign_key('articles', 'source_id', 'feed_sources', ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    # Une URL ne peut revenir dans rss_feeds qu'une fois (contrainte unique)
+    shared = op.get_bind().execute(sa.text(
+        "SELECT source_id FROM rss_feeds GROUP BY source_id HAVING COUNT(*) > 1"
+    )).first()
+    if shared is not None:
+        raise RuntimeError(
+            "Redescente impossible : des sources sont partagées par plusieurs collections"
+        )
+    
+    with op.batch_alter_table('articles', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint('articles_source_id_fkey', type_='foreignkey')
+    
+    for column, column_type in SOURCE_COLUMNS:
+        op.add_column('rss_feeds', sa.Column(column, column_type, nullable=True))
+        op.execute(
+            f"UPDATE rss_feeds SET {column} = "
+            f"(SELECT {column} FROM feed_sources WHERE feed_sources.id = rss_feeds.source_id)"
+        )
+    
+    with op.batch_alter_table('rss_feeds', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.alter_column('url', existing_type=sa.String(length=500), nullable=False)
+        batch_op.create_unique_constraint('rss_feeds_url_key', ['url'])
+        batch_op.drop_constraint('uq_rss_feeds_collection_source', type_='unique')
+        batch_op.drop_constraint('rss_feeds_source_id_fkey', type_='foreignkey')
+        batch_op.alter_column('source_id', existing_type=sa.Integer(), nullable=True)
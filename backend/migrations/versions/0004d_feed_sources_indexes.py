@@ -0,0 +1,39 @@
+"""feed sources: indexes
+
+Index des sources créés, et anciens index par flux supprimés, avec
+CONCURRENTLY sous PostgreSQL (hors transaction, idempotent : la révision
+peut être relancée après un échec).
+
+Revision ID: 0004d
+Revises: 0004c
+Create Date: 2026-10-19 19:33:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004d'
+down_revision: Union[str, None] = '0004c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently('ix_rss_feeds_source_id', 'rss_feeds', ['source_id'])
+    create_index_concurrently('ix_articles_source_published', 'articles', ['source_id', sa.text('published_date DESC')])
+    create_index_concurrently('ix_articles_source_guid', 'articles', ['source_id', 'guid'])
+    drop_index_concurrently('ix_articles_feed_published', 'articles')
+    drop_index_concurrently('ix_articles_feed_guid', 'articles')
+
+
+def downgrade() -> None:
+    create_index_concurrently('ix_articles_feed_published', 'articles', ['feed_id', sa.text('published_date DESC')])
+    create_index_concurrently('ix_articles_feed_guid', 'articles', ['feed_id', 'guid'])
+    drop_index_concurrently('ix_articles_source_published', 'articles')
+    drop_index_concurrently('ix_articles_source_guid', 'articles')
+    drop_index_concurrently('ix_rss_feeds_source_id', 'rss_feeds')
@@ -0,0 +1,45 @@
+"""feed sources
+
+Dernière étape de la séparation entre sources et abonnements (voir
+0004a) : les articles sont rattachés aux sources, l'ancienne colonne
+articles.feed_id est retirée.
+
+Revision ID: 0005
+Revises: 0004d
+Create Date: 2026-10-19 19:34:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_foreign_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Noms par défaut de PostgreSQL, donnés aussi aux contraintes anonymes sous SQLite
+NAMING_CONVENTION = {
+    "fk": "%(table_name)s_%(column_0_name)s_fkey",
+}
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('articles', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint('articles_feed_id_fkey', type_='foreignkey')
+        batch_op.drop_column('feed_id')
+
+
+def downgrade() -> None:
+    op.add_column('articles', sa.Column('feed_id', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE articles SET feed_id = "
+        "(SELECT id FROM rss_feeds WHERE rss_feeds.source_id = articles.source_id)"
+    )
+    add_foreign_key('articles', 'feed_id', 'rss_feeds', ondelete='CASCADE')
@@ -0,0 +1,34 @@
+"""fetch leases
+
+Planification (next_fetch_at) et baux de récupération des sources : les
+workers de récupération se partagent les sources à échéance sans doublon.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 20:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # next_fetch_at vide : chaque source est due une fois, puis replanifiée après récupération
+    op.add_column('feed_sources', sa.Column('next_fetch_at', sa.DateTime(), nullable=True))
+    op.add_column('feed_sources', sa.Column('lease_owner', sa.String(length=100), nullable=True))
+    op.add_column('feed_sources', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('feed_sources', 'lease_expires_at')
+    op.drop_column('feed_sources', 'lease_owner')
+    op.drop_column('feed_sources', 'next_fetch_at')
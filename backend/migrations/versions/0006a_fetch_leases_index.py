@@ -0,0 +1,28 @@
+"""fetch leases: index
+
+Index des sources à échéance, créé avec CONCURRENTLY sous PostgreSQL (hors
+transaction, idempotent).
+
+Revision ID: 0006a
+Revises: 0006
+Create Date: 2026-10-19 20:16:00.000000
+
+"""
+from typing import Sequence, Union
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006a'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently('ix_feed_sources_next_fetch_at', 'feed_sources', ['next_fetch_at'])
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_feed_sources_next_fetch_at', 'feed_sources')
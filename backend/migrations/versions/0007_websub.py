@@ -0,0 +1,37 @@
+"""websub
+
+Abonnements push WebSub : hub et topic découverts dans le flux, secret de
+signature, état et fin du bail de l'abonnement auprès du hub.
+
+Revision ID: 0007
+Revises: 0006a
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feed_sources', sa.Column('websub_hub', sa.String(length=500), nullable=True))
+    op.add_column('feed_sources', sa.Column('websub_topic', sa.String(length=500), nullable=True))
+    op.add_column('feed_sources', sa.Column('websub_secret', sa.String(length=64), nullable=True))
+    op.add_column('feed_sources', sa.Column('websub_status', sa.String(length=20), nullable=True))
+    op.add_column('feed_sources', sa.Column('websub_expires_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('feed_sources', 'websub_expires_at')
+    op.drop_column('feed_sources', 'websub_status')
+    op.drop_column('feed_sources', 'websub_secret')
+    op.drop_column('feed_sources', 'websub_topic')
+    op.drop_column('feed_sources', 'websub_hub')
@@ -0,0 +1,50 @@
+"""feed health
+
+Compteur d'échecs définitifs consécutifs des sources (désactivation
+automatique des flux morts) et historique de leurs changements d'état
+(redirection permanente, fusion, désactivation, réactivation).
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 21:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feed_sources', sa.Column(
+        'consecutive_failures', sa.Integer(), nullable=False, server_default='0'
+    ))
+    
+    op.create_table('feed_health_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('event', sa.String(length=20), nullable=False),
+    sa.Column('detail', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['source_id'], ['feed_sources.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_feed_health_events_id'), 'feed_health_events', ['id'], unique=False)
+    op.create_index(
+        'ix_feed_health_events_source_created', 'feed_health_events',
+        ['source_id', sa.text('created_at DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_feed_health_events_source_created', table_name='feed_health_events')
+    op.drop_index(op.f('ix_feed_health_events_id'), table_name='feed_health_events')
+    op.drop_table('feed_health_events')
+    op.drop_column('feed_sources', 'consecutive_failures')
@@ -0,0 +1,34 @@
+"""cache versions
+
+Compteurs de version du cache de réponses, en base : les invalidations
+faites par un worker de récupération ou un autre worker de l'API sont vues
+par tous les processus, quel que soit le backend de cache.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-20 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cache_versions',
+    sa.Column('key', sa.String(length=100), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('cache_versions')
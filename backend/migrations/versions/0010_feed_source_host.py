@@ -0,0 +1,31 @@
+"""feed source host
+
+Hôte normalisé des sources (minuscules, port compris) : les sources d'un
+serveur qui demande de ralentir sont retrouvées par égalité sur une colonne
+indexée, sans motif LIKE sur l'URL. Colonne remplie par 0010a, indexée par
+0010b.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-20 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feed_sources', sa.Column('host', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('feed_sources', 'host')
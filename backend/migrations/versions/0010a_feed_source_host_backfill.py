@@ -0,0 +1,50 @@
+"""feed source host: backfill
+
+Hôte des sources existantes, calculé en Python par lots validés un à un
+(hors transaction). Relançable : seules les sources sans hôte sont traitées.
+
+Revision ID: 0010a
+Revises: 0010
+Create Date: 2026-10-20 10:16:00.000000
+
+"""
+from typing import Sequence, Union
+from urllib.parse import urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010a'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    # Même règle que politeness.host_of
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        last_id = 0
+        while True:
+            rows = connection.execute(sa.text(
+                "SELECT id, url FROM feed_sources WHERE host IS NULL AND id > :last_id "
+                "ORDER BY id LIMIT :limit"
+            ), {"last_id": last_id, "limit": BATCH_SIZE}).fetchall()
+            if not rows:
+                break
+            
+            connection.execute(
+                sa.text("UPDATE feed_sources SET host = :host WHERE id = :id"),
+                [{"id": source_id, "host": urlsplit(url).netloc.lower()} for source_id, url in rows]
+            )
+            last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    # Colonne retirée par la descente de 0010
+    pass
@@ -0,0 +1,28 @@
+"""feed source host: index
+
+Index sur l'hôte des sources, créé avec CONCURRENTLY sous PostgreSQL (hors
+transaction, idempotent).
+
+Revision ID: 0010b
+Revises: 0010a
+Create Date: 2026-10-20 10:17:00.000000
+
+"""
+from typing import Sequence, Union
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010b'
+down_revision: Union[str, None] = '0010a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently('ix_feed_sources_host', 'feed_sources', ['host'])
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_feed_sources_host', 'feed_sources')
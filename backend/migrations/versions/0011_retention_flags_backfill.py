@@ -0,0 +1,35 @@
+"""retention flags backfill
+
+Conservation des favoris et des articles commentés : les collections
+antérieures à la valeur par défaut (NULL) conservent, comme les nouvelles,
+leurs favoris et leurs articles commentés. Lots validés un à un, relançable ;
+les colonnes deviennent NOT NULL dans 0012.
+
+Revision ID: 0011
+Revises: 0010b
+Create Date: 2026-10-20 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from migrations.helpers import backfill_in_batches
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FLAGS = ['retention_keep_favorites', 'retention_keep_commented']
+
+
+def upgrade() -> None:
+    for column in FLAGS:
+        backfill_in_batches('collections', f"{column} = true", f"{column} IS NULL")
+
+
+def downgrade() -> None:
+    # Les valeurs remplies restent valables
+    pass
@@ -0,0 +1,38 @@
+"""retention flags not null
+
+Conservation des favoris et des articles commentés : colonnes NOT NULL, avec
+true pour valeur par défaut (remplies par 0011).
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-20 11:01:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FLAGS = ['retention_keep_favorites', 'retention_keep_commented']
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('collections') as batch_op:
+        for column in FLAGS:
+            batch_op.alter_column(
+                column, existing_type=sa.Boolean(), nullable=False, server_default=sa.true()
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('collections') as batch_op:
+        for column in FLAGS:
+            batch_op.alter_column(column, existing_type=sa.Boolean(), nullable=True)
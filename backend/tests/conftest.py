@@ -0,0 +1,123 @@
+# conftest.py - Base SQLite jetable, client de test et compteur de requêtes SQL
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+# Configuration lue à l'import de l'application : à fixer avant tout import de app
+_DATABASE_FILE = os.path.join(tempfile.mkdtemp(prefix="rss-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DATABASE_FILE}"
+os.environ["CACHE_ENABLED"] = "false"
+os.environ["FEED_PARSER_PROCESSES"] = "0"
+os.environ["FEED_REFRESH_INTERVAL_MINUTES"] = "0"
+os.environ["RETENTION_INTERVAL_MINUTES"] = "0"
+os.environ["METRICS_ENABLED"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models
+from app.auth import create_access_token
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.rss_parser import guid_cache
+
+ENTRY_DATE = datetime(2026, 10, 1, 12, 0)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        # Chaque test repart d'une base vide
+        with engine.begin() as connection:
+            for table in reversed(Base.metadata.sorted_tables):
+                connection.execute(table.delete())
+
+
+@pytest.fixture
+def client():
+    # Sans bloc with : les événements de démarrage (planificateur) ne sont pas lancés
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_user(db):
+    def make(username: str) -> models.User:
+        user = models.User(username=username, email=f"{username}@example.com", password_hash="x")
+        db.add(user)
+        db.commit()
+        return user
+    return make
+
+
+def auth_headers(user: models.User) -> dict:
+    return {"Authorization": "Bearer " + create_access_token({"user_id": user.id})}
+
+
+def feed_entry(number: int, dated: bool = True) -> dict:
+    """Entrée telle que produite par le parseur ; les numéros élevés sont les plus récents"""
+    return {
+        'title': f"Article {number}",
+        'link': f"https://example.com/{number}",
+        'description': '',
+        'content': None,
+        'author': None,
+        'published_date': ENTRY_DATE + timedelta(hours=number) if dated else None,
+        'guid': f"https://example.com/{number}",
+    }
+
+
+@pytest.fixture
+def source(db, make_user):
+    """Source suivie par une collection, cache des GUID vide"""
+    owner = make_user("owner")
+    collection = models.Collection(name="Veille", owner_id=owner.id)
+    db.add(collection)
+    db.flush()
+    source = models.FeedSource(url="https://example.com/feed.xml")
+    db.add(source)
+    db.flush()
+    db.add(models.RSSFeed(
+        title="Exemple", source_id=source.id, collection_id=collection.id, added_by_user_id=owner.id
+    ))
+    db.commit()
+    source_id = source.id
+    guid_cache.invalidate(source_id)
+    yield source
+    guid_cache.invalidate(source_id)
+
+
+class QueryCounter:
+    """Nombre de requêtes SQL exécutées par le moteur pendant le bloc"""
+    
+    def __init__(self):
+        self.count = 0
+    
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@pytest.fixture
+def count_queries():
+    @contextmanager
+    def counting():
+        counter = QueryCounter()
+        event.listen(engine, "before_cursor_execute", counter._before_cursor_execute)
+        try:
+            yield counter
+        finally:
+            event.remove(engine, "before_cursor_execute", counter._before_cursor_execute)
+    return counting
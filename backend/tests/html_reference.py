@@ -0,0 +1,18 @@
+# html_reference.py - Conversion HTML -> texte de référence, par le parseur HTML de lxml
+import html
+
+
+def lxml_clean_html(text: str) -> str:
+    """
+    Même conversion que RSSParser._clean_html avec lxml.html (arbre complet)
+    """
+    import lxml.html
+    
+    if not text:
+        return ''
+    if '<' not in text:
+        return ' '.join(html.unescape(text).split())
+    root = lxml.html.fragment_fromstring(text, create_parent='div')
+    for br in root.iter('br'):
+        br.tail = ' ' + br.tail if br.tail else ' '
+    return ' '.join(root.text_content().split())
@@ -0,0 +1,33 @@
+# Conversion HTML -> texte des résumés et contenus d'articles
+from pathlib import Path
+
+import feedparser
+import pytest
+
+from app.rss_parser import RSSParser
+from tests.html_reference import lxml_clean_html
+
+FEEDS = Path(__file__).parent / "fixtures" / "feeds"
+
+
+@pytest.mark.parametrize("fragment, expected", [
+    ("", ""),
+    ("Texte brut", "Texte brut"),
+    ("<p>Un<br>deux<BR/>trois<br />quatre</p>", "Un deux trois quatre"),
+    ("<p>Premier</p>\n\n<p>  Second  </p>", "Premier Second"),
+    ("<a href=\"https://example.com/?a=1&amp;b=2\">lien</a>", "lien"),
+    ("L&#8217;&eacute;t&eacute;&nbsp;&hellip; &amp; &lt;b&gt;", "L’été … & <b>"),
+    ("&amp;lt;b&amp;gt;", "&lt;b&gt;"),
+])
+def test_clean_html(fragment, expected):
+    assert RSSParser._clean_html(fragment) == expected
+
+
+def test_same_text_as_an_html_parser():
+    pytest.importorskip("lxml")
+    
+    for path in sorted(FEEDS.glob("*.xml")):
+        for entry in feedparser.parse(path.read_bytes()).entries:
+            bodies = [entry.get("summary")] + [content.value for content in entry.get("content", [])]
+            for body in filter(None, bodies):
+                assert RSSParser._clean_html(body) == lxml_clean_html(body), path.name
@@ -0,0 +1,69 @@
+# Déduplication : l'arrêt anticipé ne s'applique qu'aux flux datés du plus récent au plus ancien
+import pytest
+
+from app import models
+from app.config import settings
+from app.rss_parser import RSSParser, guid_cache
+from tests.conftest import feed_entry
+
+
+@pytest.fixture
+def source(source, db):
+    # Entrées 1 à 6 déjà importées
+    for number in range(1, 7):
+        data = feed_entry(number)
+        data.pop('content')
+        db.add(models.Article(source_id=source.id, **data))
+    db.commit()
+    guid_cache.invalidate(source.id)
+    return source
+
+
+def _import(db, source, entries):
+    RSSParser()._process_articles(db, source, entries)
+    db.commit()
+    return {guid for (guid,) in db.query(models.Article.guid)}
+
+
+def test_newest_first_feed_is_scanned_to_the_end_by_default(db, source, monkeypatch):
+    # Cache réduit au dernier GUID : les autres entrées connues sont vérifiées en base
+    monkeypatch.setattr(guid_cache, "max_guids_per_feed", 1)
+    
+    entries = [feed_entry(number) for number in range(7, 0, -1)] + [feed_entry(0)]
+    guids = _import(db, source, entries)
+    assert {"https://example.com/7", "https://example.com/0"} <= guids
+
+
+def test_entries_known_from_the_database_count_towards_early_stop(db, source, monkeypatch):
+    monkeypatch.setattr(settings, "FEED_EARLY_STOP_THRESHOLD", 3)
+    monkeypatch.setattr(guid_cache, "max_guids_per_feed", 1)
+    
+    entries = [feed_entry(number) for number in range(7, 0, -1)] + [feed_entry(0)]
+    guids = _import(db, source, entries)
+    assert "https://example.com/7" in guids
+    assert "https://example.com/0" not in guids
+
+
+def test_oldest_first_feed_is_scanned_to_the_end(db, source, monkeypatch):
+    monkeypatch.setattr(settings, "FEED_EARLY_STOP_THRESHOLD", 3)
+    
+    guids = _import(db, source, [feed_entry(number) for number in range(1, 8)])
+    assert "https://example.com/7" in guids
+
+
+def test_undated_feed_is_scanned_to_the_end(db, source, monkeypatch):
+    monkeypatch.setattr(settings, "FEED_EARLY_STOP_THRESHOLD", 3)
+    
+    entries = [feed_entry(number, dated=False) for number in range(6, 0, -1)] + [feed_entry(0, dated=False)]
+    guids = _import(db, source, entries)
+    assert "https://example.com/0" in guids
+
+
+def test_newest_first_feed_stops_after_known_entries(db, source, monkeypatch):
+    monkeypatch.setattr(settings, "FEED_EARLY_STOP_THRESHOLD", 3)
+    
+    entries = [feed_entry(number) for number in range(7, 0, -1)] + [feed_entry(0)]
+    guids = _import(db, source, entries)
+    assert "https://example.com/7" in guids
+    # Au-delà de trois entrées connues consécutives, le reste du flux est ignoré
+    assert "https://example.com/0" not in guids
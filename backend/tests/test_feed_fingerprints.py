@@ -0,0 +1,47 @@
+# Empreintes de contenu : enregistrées seulement quand toutes les entrées ont été traitées
+from concurrent.futures import Future
+
+from app.rss_parser import RSSParser
+from tests.conftest import feed_entry
+
+
+def _fetched(entries: list, total_entries: int) -> dict:
+    future = Future()
+    future.set_result({
+        'bozo': False,
+        'bozo_exception': None,
+        'feed_info': {'title': 'Exemple', 'description': '', 'link': 'https://example.com/'},
+        'entries': entries,
+        'entries_hash': 'e' * 64,
+        'total_entries': total_entries,
+        'parser': 'lxml',
+        'parse_seconds': 0.0,
+    })
+    return {'error': None, 'parse_future': future, 'content_hash': 'c' * 64}
+
+
+def test_hashes_are_stored_when_every_entry_is_processed(db, source):
+    result = RSSParser()._store_feed_result(db, source, _fetched([feed_entry(1), feed_entry(2)], 2))
+    
+    assert result['new_articles_count'] == 2
+    assert source.content_hash == 'c' * 64
+    assert source.entries_hash == 'e' * 64
+
+
+def test_hashes_are_not_stored_when_an_entry_fails(db, source):
+    broken = feed_entry(2)
+    del broken['guid']
+    
+    result = RSSParser()._store_feed_result(db, source, _fetched([feed_entry(1), broken], 2))
+    
+    assert result['status'] == 'success'
+    assert result['new_articles_count'] == 1
+    assert source.content_hash is None
+    assert source.entries_hash is None
+
+
+def test_hashes_are_not_stored_when_an_entry_could_not_be_extracted(db, source):
+    RSSParser()._store_feed_result(db, source, _fetched([feed_entry(1)], 2))
+    
+    assert source.content_hash is None
+    assert source.entries_hash is None
@@ -0,0 +1,57 @@
+# Fusion d'une source redirigée dans celle qui suit déjà la nouvelle URL
+from app import models
+from app.feed_health import apply_permanent_redirect
+from app.subscriptions import get_or_create_source
+
+
+def _article(db, source, guid, title="Article"):
+    article = models.Article(source_id=source.id, guid=guid, title=title, link=f"https://example.com/{title}")
+    db.add(article)
+    db.flush()
+    return article
+
+
+def test_redirect_merge_keeps_user_state_of_duplicates(db, make_user):
+    reader = make_user("reader")
+    other = make_user("other")
+    collection = models.Collection(name="Veille", owner_id=reader.id)
+    db.add(collection)
+    db.flush()
+    
+    old = get_or_create_source(db, "https://old.example.com/feed.xml")
+    new = get_or_create_source(db, "https://new.example.com/feed.xml")
+    db.add(models.RSSFeed(collection_id=collection.id, source_id=old.id, title="Blog", added_by_user_id=reader.id))
+    
+    duplicate = _article(db, old, "g1", "duplicate")
+    kept = _article(db, new, "g1", "kept")
+    without_guid = _article(db, old, None, "without-guid")
+    only_old = _article(db, old, "g2", "only-old")
+    db.add_all([
+        models.UserArticle(user_id=reader.id, article_id=duplicate.id, is_read=True, is_favorite=True),
+        models.UserArticle(user_id=other.id, article_id=duplicate.id, is_favorite=True),
+        models.UserArticle(user_id=other.id, article_id=kept.id, is_read=True),
+        models.UserArticle(user_id=reader.id, article_id=without_guid.id, is_favorite=True),
+        models.Comment(article_id=duplicate.id, user_id=reader.id, collection_id=collection.id, content="À lire"),
+    ])
+    db.commit()
+    old_id, duplicate_id, kept_id = old.id, duplicate.id, kept.id
+    without_guid_id, only_old_id = without_guid.id, only_old.id
+    
+    assert apply_permanent_redirect(db, old, new.url) == new
+    db.commit()
+    db.expire_all()
+    
+    assert db.get(models.FeedSource, old_id) is None
+    assert db.get(models.Article, duplicate_id) is None
+    assert {article.id for article in new.articles} == {kept_id, without_guid_id, only_old_id}
+    
+    states = {
+        (state.user_id, state.article_id): (state.is_read, state.is_favorite)
+        for state in db.query(models.UserArticle)
+    }
+    assert states == {
+        (reader.id, kept_id): (True, True),
+        (other.id, kept_id): (True, True),
+        (reader.id, without_guid_id): (False, True),
+    }
+    assert [comment.article_id for comment in db.query(models.Comment)] == [kept_id]
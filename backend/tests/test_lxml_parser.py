@@ -0,0 +1,79 @@
+# Parseur lxml : mêmes articles et informations de flux que feedparser
+from pathlib import Path
+
+import pytest
+
+from app import lxml_parser, rss_parser
+from app.config import settings
+
+pytest.importorskip("lxml")
+
+FEEDS = Path(__file__).parent / "fixtures" / "feeds"
+FIXTURES = sorted(FEEDS.glob("*.xml"), key=lambda path: path.name)
+
+# Variantes du flux WordPress : cas limites que le parseur rapide doit
+# reproduire à l'identique ou renvoyer vers feedparser
+SUMMARY = "Voici l&#8217;itinéraire que nous avons suivi"
+VARIANTS = {
+    "entité inconnue": ("l&#8217;itinéraire", "l&itineraire;"),
+    "entité sans point-virgule": ("l&#8217;itinéraire", "l&eacute itinéraire"),
+    "br avec attribut": ("l&#8217;itinéraire", "l<br class=\"x\">itinéraire"),
+    "commentaire HTML": ("l&#8217;itinéraire", "l<!-- note -->itinéraire"),
+    "script": ("l&#8217;itinéraire", "l<script>alert(1)</script>itinéraire"),
+    "caractère de contrôle C1": ("l&#8217;itinéraire", "l\u0092itinéraire"),
+    "titre HTML": ("<title>Lire une carte", "<title>Lire une &lt;b&gt;carte"),
+    "xml:base": ("<channel>", "<channel xml:base=\"https://carnet.example.org/\">"),
+    "date invalide": ("Thu, 08 Oct 2026 17:02:10 +0000", "jeudi 8 octobre"),
+    "élément inconnu": ("<slash:comments>4</slash:comments>", "<slash:comments>4</slash:comments><x>1</x>"),
+}
+
+
+def _parse(content: bytes, fast: bool) -> dict:
+    original = settings.FEED_FAST_PARSER
+    settings.FEED_FAST_PARSER = fast
+    try:
+        result = rss_parser.parse_feed_content(content)
+    finally:
+        settings.FEED_FAST_PARSER = original
+    result.pop("parse_seconds")
+    return result
+
+
+def _assert_same_result(content: bytes) -> str:
+    """Comparer les deux parseurs ; renvoie celui qui a servi en mode rapide"""
+    fast = _parse(content, fast=True)
+    reference = _parse(content, fast=False)
+    used = fast.pop("parser")
+    assert reference.pop("parser") == "feedparser"
+    assert fast == reference
+    return used
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda path: path.name)
+def test_fixture_feeds_take_the_fast_path(path):
+    assert _assert_same_result(path.read_bytes()) == "lxml"
+
+
+@pytest.mark.parametrize("old, new", VARIANTS.values(), ids=list(VARIANTS))
+def test_variants_match_feedparser(old, new):
+    content = (FEEDS / "wordpress.xml").read_text(encoding="utf-8")
+    assert old in content
+    _assert_same_result(content.replace(old, new, 1).encode("utf-8"))
+
+
+@pytest.mark.parametrize("content", [
+    b'<?xml version="1.0" encoding="ISO-8859-1"?><rss version="2.0"><channel><title>\xe9t\xe9</title></channel></rss>',
+    b'<?xml version="1.0"?><!DOCTYPE rss><rss version="2.0"><channel><title>t</title></channel></rss>',
+    b'<rss version="2.0"><channel><title>t</title><item><title>a</item></channel></rss>',
+    b'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"></rdf:RDF>',
+], ids=["latin-1", "doctype", "mal formé", "rss 1.0"])
+def test_unsupported_documents_fall_back_to_feedparser(content):
+    assert _assert_same_result(content) == "feedparser"
+
+
+def test_missing_feedparser_internals_fall_back_to_feedparser(monkeypatch):
+    # Version de feedparser sans _parse_date ni _cp1252 (import échoué)
+    monkeypatch.setattr(lxml_parser, "_parse_date", None)
+    monkeypatch.setattr(lxml_parser, "_cp1252", None)
+    
+    assert _assert_same_result((FEEDS / "wordpress.xml").read_bytes()) == "feedparser"
@@ -0,0 +1,125 @@
+# Migrations Alembic appliquées à une base qui contient déjà des données
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class MigratedDatabase:
+    """Base SQLite jetable, migrée par la commande alembic dans un processus séparé"""
+    
+    def __init__(self, path):
+        self.url = f"sqlite:///{path}"
+        self.engine = create_engine(self.url)
+    
+    def alembic(self, *args: str):
+        subprocess.run(
+            [sys.executable, "-m", "alembic", *args], capture_output=True, text=True, check=True,
+            cwd=BACKEND_DIR, env={**os.environ, "DATABASE_URL": self.url}
+        )
+    
+    def execute(self, statement: str, **params):
+        with self.engine.begin() as connection:
+            connection.execute(text(statement), params)
+    
+    def fetch(self, statement: str, **params) -> list:
+        with self.engine.connect() as connection:
+            return [tuple(row) for row in connection.execute(text(statement), params)]
+
+
+@pytest.fixture
+def migrated(tmp_path):
+    database = MigratedDatabase(tmp_path / "migrations.db")
+    yield database
+    database.engine.dispose()
+
+
+def test_retention_flags_of_existing_collections(migrated):
+    migrated.alembic("upgrade", "0001")
+    migrated.execute("INSERT INTO users (id, username, email, password_hash) VALUES (1, 'u', 'u@example.com', 'x')")
+    migrated.execute(
+        "INSERT INTO collections (id, name, owner_id, is_shared, created_at, updated_at) "
+        "VALUES (1, 'Veille', 1, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+    )
+    
+    migrated.alembic("upgrade", "head")
+    
+    columns = {column["name"]: column for column in inspect(migrated.engine).get_columns("collections")}
+    assert not columns["retention_keep_favorites"]["nullable"]
+    assert not columns["retention_keep_commented"]["nullable"]
+    with Session(migrated.engine) as session:
+        collection = session.get(models.Collection, 1)
+        response = schemas.CollectionResponse.model_validate(collection)
+    assert response.retention_keep_favorites is True
+    assert response.retention_keep_commented is True
+    
+    # Nouvelle collection créée hors de l'ORM : valeur par défaut de la base
+    migrated.execute("INSERT INTO collections (id, name, owner_id) VALUES (2, 'Archives', 1)")
+    assert migrated.fetch(
+        "SELECT retention_keep_favorites, retention_keep_commented FROM collections WHERE id = 2"
+    ) == [(1, 1)]
+
+
+def test_feed_sources_split_resumes_after_interrupted_backfill(migrated):
+    migrated.alembic("upgrade", "0004")
+    migrated.execute("INSERT INTO users (id, username, email, password_hash) VALUES (1, 'u', 'u@example.com', 'x')")
+    migrated.execute("INSERT INTO collections (id, name, owner_id) VALUES (1, 'Veille', 1)")
+    migrated.execute("INSERT INTO rss_feeds (id, collection_id, title, url) VALUES (1, 1, 'A', 'http://a.example/rss')")
+    for article_id in (1, 2, 3):
+        migrated.execute(
+            "INSERT INTO articles (id, feed_id, title, link, guid) VALUES (:id, 1, 't', 'l', :guid)",
+            id=article_id, guid=f"g{article_id}"
+        )
+    
+    # Chaque révision est validée seule : le remplissage reste acquis
+    migrated.alembic("upgrade", "0004b")
+    assert migrated.fetch("SELECT version_num FROM alembic_version") == [("0004b",)]
+    assert migrated.fetch("SELECT source_id FROM articles ORDER BY id") == [(1,), (1,), (1,)]
+    
+    # Remplissage interrompu en cours de route : la révision est rejouée
+    migrated.execute("UPDATE articles SET source_id = NULL WHERE id = 3")
+    migrated.alembic("stamp", "0004a")
+    migrated.alembic("upgrade", "head")
+    
+    assert migrated.fetch("SELECT id, source_id FROM articles ORDER BY id") == [(1, 1), (2, 1), (3, 1)]
+    assert migrated.fetch("SELECT id, url FROM feed_sources") == [(1, "http://a.example/rss")]
+    indexes = {index["name"] for index in inspect(migrated.engine).get_indexes("articles")}
+    assert {"ix_articles_source_published", "ix_articles_source_guid"} <= indexes
+    assert not {"ix_articles_feed_published", "ix_articles_feed_guid"} & indexes
+
+
+def test_article_bodies_copy_resumes_and_downgrades(migrated):
+    migrated.alembic("upgrade", "0001")
+    migrated.execute("INSERT INTO users (id, username, email, password_hash) VALUES (1, 'u', 'u@example.com', 'x')")
+    migrated.execute("INSERT INTO collections (id, name, owner_id) VALUES (1, 'Veille', 1)")
+    migrated.execute("INSERT INTO rss_feeds (id, collection_id, title, url) VALUES (1, 1, 'A', 'http://a.example/rss')")
+    for article_id, content in ((1, "Même texte"), (2, "Même texte"), (3, "Autre texte"), (4, None)):
+        migrated.execute(
+            "INSERT INTO articles (id, feed_id, title, link, content) VALUES (:id, 1, 't', 'l', :content)",
+            id=article_id, content=content
+        )
+    
+    # Copie interrompue après le premier article : la révision est rejouée
+    migrated.alembic("upgrade", "0001d")
+    migrated.execute("UPDATE articles SET body_hash = NULL WHERE id > 1")
+    migrated.execute("DELETE FROM article_bodies WHERE content = 'Autre texte'")
+    migrated.alembic("stamp", "0001c")
+    migrated.alembic("upgrade", "0002")
+    
+    assert sorted(content for (content,) in migrated.fetch("SELECT content FROM article_bodies")) == [
+        "Autre texte", "Même texte"
+    ]
+    hashes = dict(migrated.fetch("SELECT id, body_hash FROM articles"))
+    assert hashes[1] == hashes[2] and hashes[3] and hashes[4] is None
+    
+    migrated.alembic("downgrade", "0001")
+    assert migrated.fetch("SELECT id, content FROM articles ORDER BY id") == [
+        (1, "Même texte"), (2, "Même texte"), (3, "Autre texte"), (4, None)
+    ]
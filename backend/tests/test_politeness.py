@@ -0,0 +1,55 @@
+# Sources d'un hôte repoussées après une demande de ralentissement
+from datetime import datetime, timedelta
+
+from app import models
+from app.feed_health import apply_permanent_redirect
+from app.politeness import defer_host_sources, host_of
+from app.subscriptions import get_or_create_source
+
+
+def test_defer_host_sources_matches_the_normalized_host(db):
+    urls = {
+        "https://example.com/feed.xml": True,
+        "HTTP://EXAMPLE.COM/autre.xml": True,
+        "https://example.com": True,
+        "https://example.com?format=rss": True,
+        "https://example.com:8443/feed.xml": False,
+        "https://exampleXcom/feed.xml": False,
+        "https://sub.example.com/feed.xml": False,
+        "https://other.org/example.com/feed.xml": False,
+    }
+    sources = {url: get_or_create_source(db, url) for url in urls}
+    db.commit()
+    
+    retry_at = datetime.utcnow() + timedelta(minutes=10)
+    assert defer_host_sources(db, host_of("https://Example.com/x"), retry_at) == 4
+    db.commit()
+    
+    for url, deferred in urls.items():
+        db.refresh(sources[url])
+        assert (sources[url].next_fetch_at == retry_at) == deferred, url
+
+
+def test_host_with_port_and_like_wildcards(db):
+    with_port = get_or_create_source(db, "https://example.com:8443/feed.xml")
+    lookalike = get_or_create_source(db, "https://example.com/feed.xml")
+    db.commit()
+    
+    retry_at = datetime.utcnow() + timedelta(minutes=10)
+    assert defer_host_sources(db, "example.com:8443", retry_at) == 1
+    assert defer_host_sources(db, "example_com", retry_at) == 0
+    assert defer_host_sources(db, "example%", retry_at) == 0
+    db.commit()
+    
+    db.refresh(lookalike)
+    assert lookalike.next_fetch_at is None
+
+
+def test_redirect_updates_the_host(db):
+    source = get_or_create_source(db, "https://old.example.com/feed.xml")
+    db.commit()
+    
+    source = apply_permanent_redirect(db, source, "https://New.example.org/feed.xml")
+    db.commit()
+    
+    assert db.query(models.FeedSource).filter(models.FeedSource.host == "new.example.org").one() == source
@@ -0,0 +1,81 @@
+# Listes avec auteurs : nombre de requêtes SQL constant quel que soit le nombre d'auteurs distincts
+from app import models
+from tests.conftest import auth_headers
+
+
+def _shared_collection(db, make_user, name: str, authors: int):
+    owner = make_user(f"{name}-owner")
+    collection = models.Collection(name=name, owner_id=owner.id, is_shared=True)
+    db.add(collection)
+    db.commit()
+    
+    members = [make_user(f"{name}-member{i}") for i in range(authors)]
+    for member in members:
+        db.add(models.UserCollection(user_id=member.id, collection_id=collection.id, can_read=True))
+    db.commit()
+    return owner, collection, members
+
+
+def _subscribed_article(db, owner, collection):
+    source = models.FeedSource(url=f"https://example.com/{collection.name}.xml")
+    db.add(source)
+    db.flush()
+    db.add(models.RSSFeed(
+        title="Exemple", source_id=source.id, collection_id=collection.id, added_by_user_id=owner.id
+    ))
+    article = models.Article(
+        source_id=source.id, guid=f"{collection.name}-1", title="Article", link="https://example.com/1"
+    )
+    db.add(article)
+    db.commit()
+    return article
+
+
+def _count_listing_queries(client, count_queries, url, user, expected_items) -> int:
+    with count_queries() as counter:
+        response = client.get(url, headers=auth_headers(user))
+    assert response.status_code == 200
+    assert len(response.json()) == expected_items
+    return counter.count
+
+
+def test_messages_query_count_is_constant(db, client, make_user, count_queries):
+    queries = []
+    for name, authors in (("few", 1), ("many", 8)):
+        owner, collection, members = _shared_collection(db, make_user, name, authors)
+        for member in members:
+            db.add(models.Message(collection_id=collection.id, user_id=member.id, content="Bonjour"))
+        db.commit()
+        queries.append(_count_listing_queries(
+            client, count_queries, f"/messages/collection/{collection.id}", owner, authors
+        ))
+    
+    assert queries[0] == queries[1]
+
+
+def test_comments_query_count_is_constant(db, client, make_user, count_queries):
+    queries = []
+    for name, authors in (("few", 1), ("many", 8)):
+        owner, collection, members = _shared_collection(db, make_user, name, authors)
+        article = _subscribed_article(db, owner, collection)
+        for member in members:
+            db.add(models.Comment(
+                article_id=article.id, user_id=member.id, collection_id=collection.id, content="Intéressant"
+            ))
+        db.commit()
+        queries.append(_count_listing_queries(
+            client, count_queries, f"/comments/article/{article.id}", owner, authors
+        ))
+    
+    assert queries[0] == queries[1]
+
+
+def test_members_query_count_is_constant(db, client, make_user, count_queries):
+    queries = []
+    for name, authors in (("few", 1), ("many", 8)):
+        owner, collection, members = _shared_collection(db, make_user, name, authors)
+        queries.append(_count_listing_queries(
+            client, count_queries, f"/collections/{collection.id}/members", owner, authors
+        ))
+    
+    assert queries[0] == queries[1]
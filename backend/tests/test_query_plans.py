@@ -0,0 +1,138 @@
+# Plans d'exécution (EXPLAIN QUERY PLAN) des requêtes principales de chaque router :
+# aucune lecture séquentielle des grosses tables sur une base peuplée
+from datetime import datetime, timedelta
+import re
+
+import pytest
+from sqlalchemy import event, insert, text
+
+from app import models
+from app.database import engine
+from tests.conftest import auth_headers
+
+ARTICLES_PER_SOURCE = 500
+OTHER_READERS = 20
+# Tables qui grossissent avec l'usage ; les autres restent petites par utilisateur
+LARGE_TABLES = ("articles", "article_bodies", "user_articles", "comments", "messages")
+# "SCAN articles" ou "SCAN articles AS articles_1", mais pas "SCAN ... USING INDEX"
+_FULL_SCAN_RE = re.compile(
+    r"^SCAN (?:(?P<table>\w+)(?: AS \w+)?)(?! USING (?:COVERING )?INDEX)(?: |$)"
+)
+
+
+@pytest.fixture
+def seeded(db, make_user):
+    """Deux membres, une collection partagée de deux flux et leurs articles lus, commentés et discutés"""
+    owner = make_user("owner")
+    reader = make_user("reader")
+    collection = models.Collection(name="Veille", owner_id=owner.id, is_shared=True)
+    db.add(collection)
+    db.flush()
+    db.add(models.UserCollection(user_id=reader.id, collection_id=collection.id, can_read=True))
+    
+    now = datetime.utcnow()
+    article_ids = []
+    for index in range(2):
+        source = models.FeedSource(url=f"https://example.com/{index}.xml", last_updated=now)
+        db.add(source)
+        db.flush()
+        db.add(models.RSSFeed(
+            title=f"Flux {index}", source_id=source.id, collection_id=collection.id, added_by_user_id=owner.id
+        ))
+        result = db.execute(insert(models.Article).returning(models.Article.id), [
+            {
+                "source_id": source.id, "guid": f"{index}-{number}", "title": f"Article {number}",
+                "link": f"https://example.com/{index}/{number}", "description": "Résumé",
+                "published_date": now - timedelta(minutes=number), "fetched_at": now,
+            }
+            for number in range(ARTICLES_PER_SOURCE)
+        ])
+        article_ids.extend(result.scalars())
+    
+    db.execute(insert(models.UserArticle), [
+        {"user_id": owner.id, "article_id": article_id, "is_read": True, "is_favorite": number % 10 == 0}
+        for number, article_id in enumerate(article_ids[::2])
+    ])
+    # Lectures d'autres utilisateurs : la table n'appartient pas qu'au seul membre testé
+    others = [make_user(f"other{number}") for number in range(OTHER_READERS)]
+    db.execute(insert(models.UserArticle), [
+        {"user_id": other.id, "article_id": article_id, "is_read": True}
+        for other in others for article_id in article_ids[:ARTICLES_PER_SOURCE]
+    ])
+    db.execute(insert(models.Comment), [
+        {"article_id": article_ids[0], "user_id": reader.id, "collection_id": collection.id, "content": "Vu"}
+        for _ in range(50)
+    ] + [
+        {"article_id": article_id, "user_id": owner.id, "collection_id": collection.id, "content": "Lu"}
+        for article_id in article_ids[1::5]
+    ])
+    db.execute(insert(models.Message), [
+        {"collection_id": collection.id, "user_id": reader.id, "content": f"Message {number}"}
+        for number in range(200)
+    ])
+    db.commit()
+    
+    # Statistiques pour le planificateur, comme après un ANALYZE en production
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+    
+    return owner, collection, article_ids[0]
+
+
+def _routes(collection_id: int, article_id: int) -> list:
+    return [
+        "/collections/",
+        f"/collections/{collection_id}",
+        f"/collections/{collection_id}/members",
+        f"/feeds/collection/{collection_id}",
+        f"/feeds/collection/{collection_id}/health",
+        f"/articles/collection/{collection_id}",
+        f"/articles/collection/{collection_id}?is_read=false",
+        f"/articles/collection/{collection_id}?is_favorite=true",
+        f"/articles/{article_id}",
+        f"/comments/article/{article_id}",
+        f"/messages/collection/{collection_id}",
+        "/stats/dashboard",
+        f"/stats/collection/{collection_id}",
+    ]
+
+
+def _captured_queries(client, user, url: str) -> list:
+    """Requêtes SQL (texte et paramètres) exécutées pour servir une route"""
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+    
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.get(url, headers=auth_headers(user))
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert response.status_code == 200, (url, response.text)
+    return statements
+
+
+def _full_scans(statement: str, parameters) -> list:
+    """Lectures séquentielles de grosses tables dans le plan d'une requête"""
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    scans = []
+    for row in plan:
+        match = _FULL_SCAN_RE.match(row.detail)
+        if match and match.group("table") in LARGE_TABLES:
+            scans.append(row.detail)
+    return scans
+
+
+def test_main_queries_use_indexes(client, seeded):
+    owner, collection, article_id = seeded
+    
+    failures = []
+    for url in _routes(collection.id, article_id):
+        for statement, parameters in _captured_queries(client, owner, url):
+            for scan in _full_scans(statement, parameters):
+                failures.append(f"{url}: {scan}\n    {' '.join(statement.split())}")
+    
+    assert not failures, "Lectures séquentielles :\n" + "\n".join(failures)
@@ -0,0 +1,62 @@
+# Planificateur : un leader qui perd son verrou arrête ses tâches puis se représente
+import threading
+import time
+
+from app.scheduler import Scheduler
+
+
+class FakeLock:
+    """Verrou dont la détention est pilotée par le test"""
+    
+    def __init__(self):
+        self.available = True
+        self.held = False
+    
+    def try_acquire(self) -> bool:
+        if self.held:
+            return True
+        if self.available:
+            self.held = True
+        return self.held
+    
+    def is_held(self) -> bool:
+        return self.held
+    
+    def release(self):
+        self.held = False
+
+
+def _wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_leader_stops_jobs_when_lock_is_lost_and_resumes_when_reacquired():
+    lock = FakeLock()
+    runs = []
+    scheduler = Scheduler(lock=lock, retry_seconds=0.05)
+    scheduler.add_job("job", lambda: runs.append(threading.current_thread().name), 0.01)
+    scheduler.start()
+    try:
+        assert _wait_for(lambda: len(runs) > 0)
+        
+        # Connexion perdue : un autre worker a pris le verrou
+        lock.held = False
+        lock.available = False
+        assert _wait_for(lambda: not scheduler._running)
+        stopped_at = len(runs)
+        time.sleep(0.2)
+        assert len(runs) == stopped_at
+        
+        # Verrou de nouveau libre : le worker reprend les tâches
+        lock.available = True
+        assert _wait_for(lambda: len(runs) > stopped_at)
+    finally:
+        scheduler.shutdown()
+    
+    assert not scheduler._running
+    assert not lock.held
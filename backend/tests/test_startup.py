@@ -0,0 +1,19 @@
+# Démarrage des workers de l'API : modules lourds chargés seulement à la première utilisation
+import os
+import subprocess
+import sys
+
+DEFERRED_MODULES = ("requests", "feedparser", "lxml", "app.rss_parser", "authlib", "httpx")
+
+
+def test_api_import_does_not_load_fetch_dependencies():
+    # Interpréteur neuf : les tests eux-mêmes ont déjà chargé ces modules
+    code = (
+        "import sys, app.main; "
+        f"print(','.join(name for name in {DEFERRED_MODULES!r} if name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), env=dict(os.environ)
+    )
+    assert result.stdout.strip() == ""
@@ -0,0 +1,39 @@
+# Tableau de bord : articles comptés une fois, titre de l'abonnement de l'utilisateur
+from datetime import datetime, timedelta
+
+from app import models
+from tests.conftest import auth_headers
+
+
+def test_dashboard_counts_shared_source_once_and_uses_subscription_title(db, client, make_user):
+    user = make_user("reader")
+    friend = make_user("friend")
+    
+    owned = models.Collection(name="Perso", owner_id=user.id)
+    shared = models.Collection(name="Amis", owner_id=friend.id, is_shared=True)
+    db.add_all([owned, shared])
+    db.flush()
+    db.add(models.UserCollection(user_id=user.id, collection_id=shared.id, can_read=True))
+    
+    # Même source suivie dans une collection possédée et une collection partagée
+    source = models.FeedSource(url="https://example.com/feed.xml", title="Titre du flux")
+    db.add(source)
+    db.flush()
+    db.add(models.RSSFeed(title="Mon titre", source_id=source.id, collection_id=owned.id, added_by_user_id=user.id))
+    db.add(models.RSSFeed(title="Leur titre", source_id=source.id, collection_id=shared.id, added_by_user_id=friend.id))
+    
+    now = datetime.utcnow()
+    for number in range(3):
+        db.add(models.Article(
+            source_id=source.id, guid=f"article-{number}", title=f"Article {number}",
+            link=f"https://example.com/{number}", published_date=now - timedelta(hours=number)
+        ))
+    db.commit()
+    
+    response = client.get("/stats/dashboard", headers=auth_headers(user))
+    assert response.status_code == 200
+    stats = response.json()
+    
+    assert stats["articles"]["total"] == 3
+    assert stats["articles"]["unread"] == 3
+    assert [article["feed_title"] for article in stats["recent_articles"]] == ["Mon titre"] * 3
@@ -0,0 +1,26 @@
+# Suppression d'un abonnement : la source orpheline est laissée à la purge de rétention
+from app import models
+from app.leases import claim_due_sources
+from app.retention import purge_orphan_sources
+from tests.conftest import auth_headers
+
+
+def test_deleting_the_last_subscription_leaves_the_source_to_the_purge(db, client, source):
+    feed = db.query(models.RSSFeed).filter(models.RSSFeed.source_id == source.id).one()
+    owner = db.get(models.User, feed.added_by_user_id)
+    db.add(models.Article(source_id=source.id, guid="g1", title="Article", link="https://example.com/1"))
+    db.commit()
+    source_id = source.id
+    
+    response = client.delete(f"/feeds/{feed.id}", headers=auth_headers(owner))
+    assert response.status_code == 204
+    db.expire_all()
+    
+    # Source et articles restent en place, mais la source n'est plus récupérée
+    assert db.get(models.FeedSource, source_id) is not None
+    assert db.query(models.Article).filter(models.Article.source_id == source_id).count() == 1
+    assert claim_due_sources(db, "test", None) == []
+    
+    assert purge_orphan_sources(db) == 1
+    assert db.get(models.FeedSource, source_id) is None
+    assert db.query(models.Article).count() == 0
@@ -0,0 +1,188 @@
+# WebSub de bout en bout contre un hub local de substitution
+import hashlib
+import hmac
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app import models, websub
+from app.config import settings
+
+TOPIC = "https://example.com/feed.xml"
+
+PUSHED_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel>
+<title>Exemple</title><link>https://example.com/</link><description>Flux pousse</description>
+<item><title>Premier</title><link>https://example.com/1</link><guid>https://example.com/1</guid></item>
+<item><title>Second</title><link>https://example.com/2</link><guid>https://example.com/2</guid></item>
+</channel></rss>"""
+
+
+class StandInHub:
+    """Hub minimal : enregistre les demandes d'abonnement et répond 202"""
+    
+    def __init__(self):
+        self.requests = []
+        hub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                hub.requests.append({key: values[0] for key, values in parse_qs(body.decode()).items()})
+                self.send_response(202)
+                self.end_headers()
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    monkeypatch.setattr(settings, "WEBSUB_CALLBACK_BASE_URL", "http://testserver")
+    with StandInHub() as stand_in:
+        yield stand_in
+
+
+@pytest.fixture
+def hub_source(db, make_user, hub):
+    owner = make_user("owner")
+    collection = models.Collection(name="Veille", owner_id=owner.id)
+    db.add(collection)
+    db.flush()
+    # Hub découvert lors d'une première récupération
+    source = models.FeedSource(
+        url=TOPIC, websub_hub=hub.url, websub_topic=TOPIC, last_updated=datetime.utcnow()
+    )
+    db.add(source)
+    db.flush()
+    db.add(models.RSSFeed(
+        title="Exemple", source_id=source.id, collection_id=collection.id, added_by_user_id=owner.id
+    ))
+    db.commit()
+    return source
+
+
+def _sign(secret: str, content: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), content, hashlib.sha256).hexdigest()
+
+
+def _subscribe(client, hub, db) -> dict:
+    """Abonnement demandé au hub puis confirmé par sa vérification d'intention"""
+    assert websub.renew_subscriptions()["subscribed"] == 1
+    request = hub.requests[-1]
+    
+    response = client.get(urlsplit(request["hub.callback"]).path, params={
+        "hub.mode": "subscribe",
+        "hub.topic": request["hub.topic"],
+        "hub.challenge": "defi-123",
+        "hub.lease_seconds": "3600",
+    })
+    assert response.status_code == 200
+    assert response.text == "defi-123"
+    db.expire_all()
+    return request
+
+
+def _push(client, source, content: bytes, secret: str):
+    return client.post(
+        f"/websub/callback/{source.id}", content=content,
+        headers={"X-Hub-Signature": _sign(secret, content)}
+    )
+
+
+def test_subscription_is_requested_and_confirmed(db, client, hub, hub_source):
+    request = _subscribe(client, hub, db)
+    
+    assert request["hub.mode"] == "subscribe"
+    assert request["hub.topic"] == TOPIC
+    assert request["hub.callback"] == f"http://testserver/websub/callback/{hub_source.id}"
+    assert request["hub.secret"] == hub_source.websub_secret
+    assert hub_source.websub_status == "subscribed"
+    # Source suivie en push : interrogée seulement à l'intervalle de sécurité
+    assert hub_source.next_fetch_at > datetime.utcnow() + timedelta(hours=1)
+
+
+def test_verification_for_unknown_topic_is_rejected(db, client, hub, hub_source):
+    _subscribe(client, hub, db)
+    
+    response = client.get(f"/websub/callback/{hub_source.id}", params={
+        "hub.mode": "subscribe", "hub.topic": "https://evil.example/feed.xml", "hub.challenge": "x"
+    })
+    assert response.status_code == 404
+
+
+def test_replayed_or_unsolicited_verification_is_rejected(db, client, hub, hub_source):
+    request = _subscribe(client, hub, db)
+    expires_at = hub_source.websub_expires_at
+    
+    params = {
+        "hub.mode": "subscribe", "hub.topic": request["hub.topic"],
+        "hub.challenge": "rejeu", "hub.lease_seconds": "864000",
+    }
+    response = client.get(urlsplit(request["hub.callback"]).path, params=params)
+    assert response.status_code == 404
+    db.expire_all()
+    assert hub_source.websub_expires_at == expires_at
+    
+    # Source jamais abonnée : aucune demande en cours à confirmer
+    hub_source.websub_status = None
+    db.commit()
+    response = client.get(urlsplit(request["hub.callback"]).path, params=params)
+    assert response.status_code == 404
+    db.expire_all()
+    assert hub_source.websub_status is None
+
+
+def test_signed_push_is_ingested_once(db, client, hub, hub_source):
+    request = _subscribe(client, hub, db)
+    
+    for _ in range(2):
+        assert _push(client, hub_source, PUSHED_FEED, request["hub.secret"]).status_code == 202
+    
+    guids = sorted(
+        guid for (guid,) in db.query(models.Article.guid).filter(models.Article.source_id == hub_source.id)
+    )
+    assert guids == ["https://example.com/1", "https://example.com/2"]
+
+
+def test_forged_push_is_ignored(db, client, hub, hub_source):
+    _subscribe(client, hub, db)
+    
+    assert _push(client, hub_source, PUSHED_FEED, "mauvais-secret").status_code == 202
+    assert db.query(models.Article).count() == 0
+
+
+def test_push_for_leased_source_asks_hub_to_retry(db, client, hub, hub_source):
+    request = _subscribe(client, hub, db)
+    hub_source.lease_owner = "worker:autre"
+    hub_source.lease_expires_at = datetime.utcnow() + timedelta(minutes=5)
+    db.commit()
+    
+    response = _push(client, hub_source, PUSHED_FEED, request["hub.secret"])
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "60"
+
+
+def test_push_does_not_start_a_parser_pool(db, client, hub, hub_source, monkeypatch):
+    from app import rss_parser
+    
+    monkeypatch.setattr(settings, "FEED_PARSER_PROCESSES", 2)
+    request = _subscribe(client, hub, db)
+    
+    assert _push(client, hub_source, PUSHED_FEED, request["hub.secret"]).status_code == 202
+    assert rss_parser._parser_pool is None